@@ -1,42 +1,310 @@
-"""Prepare a change log for a release."""
+"""Prepare a change log for a release.
 
+The change log is indexed in one streaming pass over its raw bytes. The index records
+the byte offsets of each release section and its subsections, so inserting a release,
+extracting the notes of one release or validating the structure only reads the parts
+of the file involved. Indexes are cached and rebuilt when the file is modified.
+
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from packaging.version import Version
 
+from darkgray_dev_tools.span_diff import unified_span_diff
 
-def patch_changelog(next_version: Version, *, dry_run: bool) -> None:
-    """Insert the new version and create a new unreleased section in the change log.
+if TYPE_CHECKING:
+    from packaging.version import Version
+
+CHANGELOG_PATH = Path("CHANGES.rst")
+UNRELEASED = "Unreleased"
+SUBSECTION_TITLES = ("Added", "Removed", "Fixed", "Internal")
+RELEASE_TITLE_RE = re.compile(
+    r"(?P<version>[^_\s]+)_(?: - (?P<date>\d{4}-\d{2}-\d{2}))?\Z"
+)
+UNDERLINE_RE = re.compile(rb"(?P<char>[=-])(?P=char)*\r?\n?\Z")
+LINK_TARGET_PREFIX = b".. _"
+
+
+@dataclass(frozen=True)
+class Section:
+    """The title and byte offsets of a section in the change log."""
+
+    title: str
+    start: int
+    body_start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Release(Section):
+    """A release section, and the ``Added``, ``Fixed`` etc. subsections in it."""
+
+    subsections: tuple[Section, ...]
+
+    @property
+    def version(self) -> str | None:
+        """Return the version in the title, or ``Unreleased``."""
+        match = RELEASE_TITLE_RE.match(self.title)
+        return match["version"] if match else None
+
+    @property
+    def date(self) -> str | None:
+        """Return the release date in the title, or `None` if there isn't one."""
+        match = RELEASE_TITLE_RE.match(self.title)
+        return match["date"] if match else None
+
+
+@dataclass(frozen=True)
+class ChangelogIndex:
+    """Release sections of a change log, and the file state they were indexed from."""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    releases: tuple[Release, ...]
+
+    def release(self, version: str) -> Release:
+        """Return the release section for a version.
+
+        :param version: The version, or ``Unreleased``
+        :return: The release section
+        :raises KeyError: if there is no section for the version
+
+        """
+        for release in self.releases:
+            if release.version == version:
+                return release
+        raise KeyError(version)
+
+    def read(self, start: int, end: int) -> str:
+        """Read and decode a span of the change log without reading the rest of it."""
+        with self.path.open("rb") as file:
+            file.seek(start)
+            return file.read(end - start).decode("utf-8")
+
+
+_INDEX_CACHE: dict[Path, ChangelogIndex] = {}
+
+
+def _scan_titles(path: Path) -> tuple[list[tuple[bytes, str, int, int]], int]:
+    """Find section titles and the start of link targets in one pass over the file.
+
+    :param path: The change log file
+    :return: The underline character, title, start offset and body start offset of
+             each title, and the offset where the sections end
+
+    """
+    titles = []
+    links_start = None
+    offset = 0
+    previous_line = b""
+    previous_offset = 0
+    with path.open("rb") as file:
+        for line in file:
+            underline = UNDERLINE_RE.match(line)
+            title = previous_line.strip().decode("utf-8")
+            if underline and title and len(line.rstrip()) >= len(title):
+                titles.append(
+                    (underline["char"], title, previous_offset, offset + len(line))
+                )
+                links_start = None
+            elif links_start is None and line.startswith(LINK_TARGET_PREFIX):
+                links_start = offset
+            previous_line, previous_offset = line, offset
+            offset += len(line)
+    return titles, offset if links_start is None else links_start
+
+
+def build_changelog_index(path: Path) -> ChangelogIndex:
+    """Index the release sections and subsections of a change log.
+
+    Releases are titles underlined with ``=``, and subsections are titles underlined
+    with ``-``. Link targets at the end of the file aren't part of the last release.
+
+    :param path: The change log file
+    :return: The index of the change log
+
+    """
+    stat = path.stat()
+    titles, sections_end = _scan_titles(path)
+    release_titles = [i for i, (char, *_) in enumerate(titles) if char == b"="]
+    releases = []
+    for title_index, next_index in zip(release_titles, [*release_titles[1:], None]):
+        end = sections_end if next_index is None else titles[next_index][2]
+        subsection_titles = titles[title_index + 1 : next_index]
+        subsection_ends = [start for _, _, start, _ in subsection_titles[1:]] + [end]
+        subsections = tuple(
+            Section(title, start, body_start, subsection_end)
+            for (_, title, start, body_start), subsection_end in zip(
+                subsection_titles, subsection_ends
+            )
+        )
+        _, title, start, body_start = titles[title_index]
+        releases.append(Release(title, start, body_start, end, subsections))
+    return ChangelogIndex(path, stat.st_mtime_ns, stat.st_size, tuple(releases))
+
+
+def get_changelog_index(path: Path = CHANGELOG_PATH) -> ChangelogIndex:
+    """Return the cached index of a change log, rebuilding it if the file has changed.
 
+    :param path: The change log file
+    :return: The index of the change log
+
+    """
+    stat = path.stat()
+    key = path.resolve()
+    index = _INDEX_CACHE.get(key)
+    if index is None or (index.mtime_ns, index.size) != (
+        stat.st_mtime_ns,
+        stat.st_size,
+    ):
+        index = _INDEX_CACHE[key] = build_changelog_index(path)
+    return index
+
+
+def release_notes(version: str, path: Path = CHANGELOG_PATH) -> str:
+    """Return the notes of one release, without its title.
+
+    :param version: The version, or ``Unreleased``
+    :param path: The change log file
+    :return: The body of the release section, with surrounding blank lines removed
+
+    """
+    index = get_changelog_index(path)
+    release = index.release(version)
+    return index.read(release.body_start, release.end).strip("\n") + "\n"
+
+
+def _validate_subsections(release: Release) -> list[str]:
+    """Check for unknown and duplicate subsection titles in a release."""
+    titles = [subsection.title for subsection in release.subsections]
+    return [
+        f"Unknown subsection {title!r} in {release.title}"
+        for title in titles
+        if title not in SUBSECTION_TITLES
+    ] + [
+        f"Duplicate subsection {title!r} in {release.title}"
+        for title in sorted(set(titles))
+        if titles.count(title) > 1
+    ]
+
+
+def validate_changelog(index: ChangelogIndex) -> list[str]:
+    """Check the structure of an indexed change log.
+
+    :param index: The index of the change log
+    :return: A description of each problem found, or an empty list
+
+    """
+    problems = []
+    if not index.releases or index.releases[0].version != UNRELEASED:
+        problems.append(f"The first section isn't {UNRELEASED}_")
+    seen_versions = set()
+    previous_date = None
+    for release in index.releases:
+        if release.version is None:
+            problems.append(f"Invalid release title {release.title!r}")
+        elif release.version in seen_versions:
+            problems.append(f"Duplicate release {release.version}")
+        seen_versions.add(release.version)
+        if release.version not in (None, UNRELEASED) and release.date is None:
+            problems.append(f"Release {release.version} has no date")
+        if release.date:
+            if previous_date and release.date > previous_date:
+                problems.append(f"Release {release.version} is out of date order")
+            previous_date = release.date
+        problems.extend(_validate_subsections(release))
+    return problems
+
+
+def _insert_release(
+    index: ChangelogIndex, next_version: Version
+) -> tuple[Release, int, str]:
+    """Find where to insert the new version and what to insert into the change log.
+
+    :param index: The index of the change log
     :param next_version: The next version after the new version
-    :param dry_run: ``True`` to just print the result
+    :raises ValueError: if there is no ``Unreleased`` section
+    :return: The ``Unreleased`` section, the byte offset of the insertion point, and the
+             release title and empty subsections to insert
 
     """
-    path = Path("CHANGES.rst")
-    content = path.read_text(encoding="utf-8")
-    before_unreleased = "These features will be included in the next release:\n\n"
     try:
-        insert_point = content.index(before_unreleased) + len(before_unreleased)
-    except ValueError as exc:
-        msg = f"{exc} {before_unreleased!r}"
+        unreleased = index.release(UNRELEASED)
+    except KeyError as exc:
+        msg = f"No {UNRELEASED}_ section in {index.path}"
         raise ValueError(msg) from exc
-    before = content[:insert_point]
-    after = content[insert_point:]
-    title = f"{next_version}_ - {datetime.now(tz=timezone.utc).date()}"
-    new_content = (
-        f"{before}"
-        "Added\n"
-        "-----\n\n"
-        "Fixed\n"
-        "-----\n\n\n"
-        f"{title}\n"
-        f"{len(title) * '='}\n\n"
-        f"{after}"
+    insert_point = (
+        unreleased.subsections[0].start if unreleased.subsections else unreleased.end
     )
-    if dry_run:
-        click.echo("######## CHANGES.rst ########")
-        click.echo(new_content[:200])
+    title = f"{next_version}_ - {datetime.now(tz=timezone.utc).date()}"
+    inserted = f"Added\n-----\n\nFixed\n-----\n\n\n{title}\n{len(title) * '='}\n\n"
+    return unreleased, insert_point, inserted
+
+
+def render_changelog(
+    next_version: Version, path: Path = CHANGELOG_PATH
+) -> tuple[str, str]:
+    """Return the change log before and after inserting the new version.
+
+    :param next_version: The next version after the new version
+    :param path: The change log file
+    :raises ValueError: if there is no ``Unreleased`` section
+    :return: The original and the patched content of the change log
+
+    """
+    index = get_changelog_index(path)
+    _, insert_point, inserted = _insert_release(index, next_version)
+    before = index.read(0, insert_point)
+    after = index.read(insert_point, index.size)
+    return before + after, before + inserted + after
+
+
+def patch_changelog(
+    next_version: Version,
+    *,
+    dry_run: bool,
+    diff: bool = False,
+    path: Path = CHANGELOG_PATH,
+) -> None:
+    """Insert the new version and create a new unreleased section in the change log.
+
+    The new release title and empty subsections are inserted before the first
+    subsection of the ``Unreleased`` section. Only the part of the file after the
+    insertion point is rewritten.
+
+    :param next_version: The next version after the new version
+    :param dry_run: ``True`` to just print the result
+    :param diff: ``True`` to print a unified diff in dry-run mode, instead of the
+                 beginning of the change log
+    :param path: The change log file
+    :raises ValueError: if there is no ``Unreleased`` section
+
+    """
+    index = get_changelog_index(path)
+    unreleased, insert_point, inserted = _insert_release(index, next_version)
+    before = index.read(0, insert_point)
+    if dry_run and diff:
+        content = index.read(0, unreleased.end)
+        click.echo(
+            unified_span_diff(
+                str(path), content, [(len(before), len(before), inserted)]
+            )
+        )
+    elif dry_run:
+        click.echo(f"######## {path} ########")
+        after = index.read(insert_point, unreleased.end)
+        click.echo(f"{before}{inserted}{after}"[:200])
     else:
-        path.write_text(new_content, encoding="utf-8")
+        with path.open("r+b") as file:
+            file.seek(insert_point)
+            tail = file.read()
+            file.seek(insert_point)
+            file.write(inserted.encode("utf-8") + tail)
@@ -0,0 +1,108 @@
+"""The ``darkgray`` command which gives access to all tools as subcommands.
+
+Usage::
+
+    darkgray bump-version --dry-run
+    darkgray show-reviews --token=<ghp_your_github_token>
+    darkgray suggest-constraint --all
+
+The module of a subcommand is only imported when that subcommand is run, or when its
+help is shown. ``darkgray --help`` lists the subcommands without importing any of them.
+
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib import import_module
+from typing import cast
+
+import click
+
+from darkgray_dev_tools import __version__
+
+
+@dataclass(frozen=True)
+class LazyCommand:
+    """The location of a subcommand, and its short help for listing subcommands."""
+
+    module: str
+    attribute: str
+    short_help: str
+
+    def load(self) -> click.Command:
+        """Import the module of the subcommand and return the command."""
+        command = getattr(import_module(self.module), self.attribute)
+        return cast("click.Command", command)
+
+
+LAZY_COMMANDS = {
+    "bump-version": LazyCommand(
+        "darkgray_dev_tools.darkgray_bump_version",
+        "bump_version",
+        "Bump the version number in project files.",
+    ),
+    "collect-contributors": LazyCommand(
+        "darkgray_dev_tools.darkgray_collect_contributors",
+        "collect_contributors",
+        "Collect GitHub usernames of contributors.",
+    ),
+    "show-reviews": LazyCommand(
+        "darkgray_dev_tools.darkgray_show_reviews",
+        "show_reviews",
+        "Show recent approved reviews and reviewers.",
+    ),
+    "suggest-constraint": LazyCommand(
+        "darkgray_dev_tools.darkgray_suggest_constraint",
+        "suggest_constraint",
+        "Suggest an upper limit for a dependency.",
+    ),
+    "update-contributors": LazyCommand(
+        "darkgray_dev_tools.darkgray_update_contributors",
+        "update",
+        "Update contributor lists in README files.",
+    ),
+    "verify-contributors": LazyCommand(
+        "darkgray_dev_tools.darkgray_update_contributors",
+        "verify",
+        "Verify claimed contributions in contributors.yaml.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """Command group which imports subcommands only when they are needed."""
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """Return the names of all subcommands without importing them."""
+        return sorted({*super().list_commands(ctx), *LAZY_COMMANDS})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        """Import and return a subcommand."""
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in LAZY_COMMANDS:
+            command = LAZY_COMMANDS[cmd_name].load()
+            self.add_command(command, cmd_name)
+        return command
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        """List subcommands using their short help, without importing them."""
+        rows = [
+            (name, LAZY_COMMANDS[name].short_help)
+            for name in self.list_commands(ctx)
+            if name in LAZY_COMMANDS
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup)
+@click.version_option(__version__)
+def darkgray() -> None:
+    """Development tools for Darker, Graylint and Darkgraylib."""
+
+
+if __name__ == "__main__":
+    darkgray()
@@ -9,11 +9,23 @@ Usage::
 
     pip install \
       https://github.com/akaihola/darkgray-dev-tools/archive/refs/heads/main.zip
-    darkgray_bump_version {--major|--minor} [--dry-run]
+    darkgray_bump_version {--major|--minor} [--dry-run [--diff]] [--offline]
+                          [-C <checkout>...]
+    darkgray_bump_version refresh-milestones --token=<github_token>
 
 Increments the patch version by default unless `--major` or `--minor` is specified.
 With `--dry-run` will print out modified files on the terminal or crash with an
-exception and a non-zero return value.
+exception and a non-zero return value. Add `--diff` to only print a unified diff of the
+changes and the number of matches in each file.
+
+Milestone numbers are read from the GitHub API. With `--offline`, or with `--dry-run`
+if it exists, the ``release_tools/milestones.yaml`` snapshot is read instead. The
+snapshot is updated using the `refresh-milestones` subcommand, and can be committed to
+make dry runs fast and independent of the GitHub API.
+
+With one or more `-C`/`--checkout` options, the given repository checkouts are bumped
+instead of the current directory. Checkouts are processed concurrently sharing one
+GitHub API session, and files are only modified if all checkouts succeed.
 
 Use a ``.github/workflows/test-bump-version.yml`` workflow to run this with `--dry-run`
 to ensure all regular expressions match content of the files to modify::
@@ -39,6 +51,8 @@ to ensure all regular expressions match content of the files to modify::
             # in the GitHub repository with a future version number as its name.
             # This is used to update the call for reviewing pull requests
             # in `README.rst`.
+            # If `release_tools/milestones.yaml` is committed, it's used instead of
+            # the GitHub API, and the token isn't needed.
             run: |
               pip install https://github.com/akaihola/darkgray-dev-tools/archive/refs/heads/main.zip
               darkgray_bump_version \
@@ -50,38 +64,320 @@ to ensure all regular expressions match content of the files to modify::
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from ruamel.yaml import YAML
 
-from darkgray_dev_tools.changelog import patch_changelog
-from darkgray_dev_tools.version_replace import do_replacements, get_replacements
+from darkgray_dev_tools.changelog import (
+    CHANGELOG_PATH,
+    patch_changelog,
+    render_changelog,
+)
+from darkgray_dev_tools.metrics import metrics_option, phase
+from darkgray_dev_tools.milestones import (
+    MILESTONE_SNAPSHOT_PATH,
+    get_milestone_titles,
+    save_milestone_snapshot,
+)
+from darkgray_dev_tools.profiling import profile_option
+from darkgray_dev_tools.version_replace import (
+    StagedFile,
+    commit_staged_files,
+    get_replacements,
+    print_replacements,
+    stage_all_replacements,
+)
+
+if TYPE_CHECKING:
+    from packaging.version import Version
+
+    from darkgray_dev_tools.github_session import GitHubSession
+
+PATTERNS_PATH = Path("release_tools/bump-version-patterns.yaml")
+
+milestones_file_option = click.option(
+    "--milestones-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=MILESTONE_SNAPSHOT_PATH,
+    show_default=True,
+    help="Snapshot file of milestone titles and numbers",
+)
+
+
+def load_pattern_templates(root: Path) -> dict[str, list[str]]:
+    """Read the pattern templates of a repository checkout.
+
+    :param root: The root directory of the repository checkout
+    :return: The pattern templates, keyed by file paths or globs prefixed with `root`
+
+    """
+    from ruamel.yaml import YAML  # noqa: PLC0415
+
+    with (root / PATTERNS_PATH).open() as pattern_file:
+        yaml = YAML(typ="safe", pure=True)
+        pattern_templates_for_files: dict[str, list[str]] = yaml.load(pattern_file)
+    return {
+        (root / path).as_posix(): pattern_templates
+        for path, pattern_templates in pattern_templates_for_files.items()
+    }
+
+
+@dataclass
+class CheckoutBump:
+    """The new version of a repository checkout, and replacements staged for it."""
+
+    root: Path
+    new_version: Version
+    templates_for_files: dict[str, dict[str, str | None]]
+    staged_files: dict[str, StagedFile]
+    staged_changelog: StagedFile
+
+    def discard(self) -> None:
+        """Remove all staged temporary files of the checkout."""
+        for staged in [*self.staged_files.values(), self.staged_changelog]:
+            staged.discard()
+
+
+def stage_changelog(root: Path, new_version: Version, *, dry_run: bool) -> StagedFile:
+    """Insert the new version into the change log of a checkout, and stage the result.
+
+    :param root: The root directory of the repository checkout
+    :param new_version: The version to insert a release section for
+    :param dry_run: ``True`` to not write a staged temporary file
+    :raises ValueError: if there is no ``Unreleased`` section in the change log
+    :return: The original and patched change log
+
+    """
+    path = root / CHANGELOG_PATH
+    original, content = render_changelog(new_version, path)
+    staged = StagedFile(path, original, content)
+    if not dry_run:
+        staged.stage()
+    return staged
+
 
+def prepare_bump(  # noqa: PLR0913
+    root: Path,
+    *,
+    increment_major: bool,
+    increment_minor: bool,
+    token: str | None,
+    dry_run: bool,
+    milestones_file: Path | None,
+    session: GitHubSession | None,
+) -> CheckoutBump:
+    """Find the new version of a repository checkout, and stage replacements for it.
 
-@click.command()
+    :param root: The root directory of the repository checkout
+    :param increment_major: `True` to increment the major version number
+    :param increment_minor: `True` to increment the minor version number
+    :param token: The GitHub access token to use, or `None` to use none
+    :param dry_run: ``True`` to not write staged temporary files
+    :param milestones_file: The milestone snapshot file to read instead of using the
+                            GitHub API, or `None` to use the API
+    :param session: The GitHub API session to use, or `None` to create one
+    :return: The new version, the staged replacements and the staged change log
+
+    """
+    pattern_templates_for_files = load_pattern_templates(root)
+    with phase("fetch"):
+        patterns, replacements, new_version = get_replacements(
+            pattern_templates_for_files,  # type: ignore[arg-type]
+            increment_major=increment_major,
+            increment_minor=increment_minor,
+            token=token,
+            dry_run=dry_run,
+            milestones_file=milestones_file,
+            session=session,
+            root=root,
+        )
+    with phase("render"):
+        staged_changelog = stage_changelog(root, new_version, dry_run=dry_run)
+        try:
+            templates_for_files, staged_files = stage_all_replacements(
+                pattern_templates_for_files, patterns, replacements, dry_run=dry_run
+            )
+        except BaseException:
+            staged_changelog.discard()
+            raise
+    return CheckoutBump(
+        root, new_version, templates_for_files, staged_files, staged_changelog
+    )
+
+
+def prepare_bumps(
+    milestones_files: dict[Path, Path | None],
+    *,
+    increment_major: bool,
+    increment_minor: bool,
+    token: str | None,
+    dry_run: bool,
+) -> list[CheckoutBump]:
+    """Prepare bumps for repository checkouts concurrently.
+
+    All checkouts share one GitHub API session, so connections and cached milestone
+    responses are reused. If any checkout fails, replacements staged for the other
+    checkouts are discarded and the first error is raised.
+
+    :param milestones_files: For each repository checkout root directory, the milestone
+                             snapshot file to read, or `None` to use the GitHub API
+    :param increment_major: `True` to increment the major version number
+    :param increment_minor: `True` to increment the minor version number
+    :param token: The GitHub access token to use, or `None` to use none
+    :param dry_run: ``True`` to not write staged temporary files
+    :return: The prepared bump of each checkout, in the same order
+
+    """
+    session: GitHubSession | None = None
+    if not all(milestones_files.values()):
+        from requests_cache import EXPIRE_IMMEDIATELY  # noqa: PLC0415
+
+        from darkgray_dev_tools.github_session import GitHubSession  # noqa: PLC0415
+
+        session = GitHubSession(token, expire_after=EXPIRE_IMMEDIATELY)
+    with ThreadPoolExecutor(max_workers=len(milestones_files)) as executor:
+        futures = [
+            executor.submit(
+                prepare_bump,
+                root,
+                increment_major=increment_major,
+                increment_minor=increment_minor,
+                token=token,
+                dry_run=dry_run,
+                milestones_file=milestones_file,
+                session=session,
+            )
+            for root, milestones_file in milestones_files.items()
+        ]
+    errors = [error for future in futures if (error := future.exception())]
+    bumps = [future.result() for future in futures if not future.exception()]
+    if errors:
+        for bump in bumps:
+            bump.discard()
+        raise errors[0]
+    return bumps
+
+
+def print_bump_report(bumps: list[CheckoutBump], *, diff: bool) -> None:
+    """Print the replacements and change log updates of a dry run.
+
+    With more than one checkout, each checkout is preceded by a header, and a summary of
+    new versions and match counts is printed last.
+
+    :param bumps: The prepared bumps of repository checkouts
+    :param diff: ``True`` to print unified diffs and match counts, instead of the full
+                 content of each file
+
+    """
+    for bump in bumps:
+        if len(bumps) > 1:
+            click.echo(f"\n######## Checkout {bump.root} ########")
+        print_replacements(bump.templates_for_files, bump.staged_files, diff=diff)
+        patch_changelog(
+            bump.new_version, dry_run=True, diff=diff, path=bump.root / CHANGELOG_PATH
+        )
+    if len(bumps) > 1:
+        click.echo("\n######## Workspace ########")
+        for bump in bumps:
+            matches = sum(
+                sum(staged.counts.values()) for staged in bump.staged_files.values()
+            )
+            click.echo(
+                f"{bump.root}: {bump.new_version},"
+                f" {matches} match{'' if matches == 1 else 'es'}"
+                f" in {len(bump.staged_files)} files"
+            )
+
+
+@click.group(invoke_without_command=True)
 @click.option("-n", "--dry-run", is_flag=True, default=False)
+@click.option(
+    "--diff",
+    is_flag=True,
+    help=(
+        "With --dry-run, print a unified diff and match counts instead of full file"
+        " contents"
+    ),
+)
 @click.option("-M", "--major", "increment_major", is_flag=True, default=False)
 @click.option("-m", "--minor", "increment_minor", is_flag=True, default=False)
 @click.option("--token")
-def bump_version(  # pylint: disable=too-many-locals
-    *, dry_run: bool, increment_major: bool, increment_minor: bool, token: str | None
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Read milestones from the snapshot file instead of the GitHub API",
+)
+@click.option(
+    "-C",
+    "--checkout",
+    "checkouts",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help=(
+        "Bump the version in this repository checkout instead of the current directory."
+        " Repeat to bump several checkouts concurrently."
+    ),
+)
+@milestones_file_option
+@metrics_option
+@profile_option
+@click.pass_context
+def bump_version(  # pylint: disable=too-many-locals  # noqa: PLR0913
+    ctx: click.Context,
+    *,
+    dry_run: bool,
+    diff: bool,
+    increment_major: bool,
+    increment_minor: bool,
+    token: str | None,
+    offline: bool,
+    checkouts: tuple[Path, ...],
+    milestones_file: Path,
 ) -> None:
     """Bump the version number."""
-    with Path("release_tools/bump-version-patterns.yaml").open() as pattern_file:
-        yaml = YAML(typ="safe", pure=True)
-        pattern_templates_for_files = yaml.load(pattern_file)
-    (patterns, replacements, new_version) = get_replacements(
-        pattern_templates_for_files,
+    if ctx.invoked_subcommand:
+        return
+    milestones_files: dict[Path, Path | None] = {}
+    for root in checkouts or (Path(),):
+        snapshot_path = root / milestones_file
+        if offline and not snapshot_path.exists():
+            message = f"--offline requires the milestone snapshot file {snapshot_path}"
+            raise click.UsageError(message)
+        use_snapshot = offline or (dry_run and snapshot_path.exists())
+        milestones_files[root] = snapshot_path if use_snapshot else None
+    bumps = prepare_bumps(
+        milestones_files,
         increment_major=increment_major,
         increment_minor=increment_minor,
         token=token,
         dry_run=dry_run,
     )
-    do_replacements(
-        pattern_templates_for_files, patterns, replacements, dry_run=dry_run
-    )
-    patch_changelog(new_version, dry_run=dry_run)
+    with phase("write"):
+        if dry_run:
+            print_bump_report(bumps, diff=diff)
+            return
+        commit_staged_files(
+            [
+                staged
+                for bump in bumps
+                for staged in [*bump.staged_files.values(), bump.staged_changelog]
+            ]
+        )
+
+
+@bump_version.command("refresh-milestones")
+@click.option("--token")
+@milestones_file_option
+def refresh_milestones(token: str | None, milestones_file: Path) -> None:
+    """Save open milestone titles and numbers from GitHub into the snapshot file."""
+    with phase("fetch"):
+        milestone_titles = get_milestone_titles(token)
+    with phase("write"):
+        save_milestone_snapshot(milestones_file, milestone_titles)
+    click.echo(f"Saved {len(milestone_titles)} milestones into {milestones_file}")
 
 
 if __name__ == "__main__":
@@ -10,22 +10,24 @@ import shutil
 import subprocess
 from dataclasses import asdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import TypeVar
+from typing import TYPE_CHECKING, TypeVar
 
 import click
-import keyring
-import requests
-import ruamel.yaml
 
 from darkgray_dev_tools.darkgray_update_contributors import Contribution
 from darkgray_dev_tools.exceptions import GitHubRepoNameError
+from darkgray_dev_tools.metrics import metrics_option, phase
+from darkgray_dev_tools.profiling import profile_option
+
+if TYPE_CHECKING:
+    from ruamel.yaml import YAML
+
+    from darkgray_dev_tools.github_session import GitHubSession
 
 UNSUPPORTED_GIT_URL_ERROR = "Unsupported Git remote URL format"
 
-GITHUB_API_URL = "https://api.github.com"
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
-REQUEST_TIMEOUT = 10
 HTTP_NOT_FOUND = 404
 # SSH format: git@github.com:owner/repo
 #          or git@github.com:owner/repo.git
@@ -36,8 +38,15 @@ RE_GITHUB_HTTPS = re.compile(
     r"^(?:https?|git)://github\.com/([^/]+/[^/]+?)(?:\.git)?/?$"
 )
 
-yaml = ruamel.yaml.YAML(typ="safe", pure=True)
-yaml.indent(offset=2)
+
+@lru_cache(maxsize=1)
+def get_yaml() -> YAML:
+    """Create the YAML reader and writer for ``contributors.yaml`` on first use."""
+    from ruamel.yaml import YAML  # noqa: PLC0415
+
+    yaml = YAML(typ="safe", pure=True)
+    yaml.indent(offset=2)
+    return yaml
 
 
 def get_repo_from_git() -> str:
@@ -77,8 +86,18 @@ def get_repo_from_git() -> str:
 @click.option(
     "--since", help="ISO date to collect contributions from (e.g., 2023-01-01)"
 )
+@metrics_option
+@profile_option
 def collect_contributors(repo: str | None, since: str | None) -> None:
     """Collect and print GitHub usernames of contributors to a repository."""
+    import keyring  # noqa: PLC0415
+    from requests_cache import EXPIRE_IMMEDIATELY  # noqa: PLC0415
+
+    from darkgray_dev_tools.github_session import (  # noqa: PLC0415
+        GITHUB_API_URL,
+        GitHubSession,
+    )
+
     if repo is None:
         repo = get_repo_from_git()
     token = keyring.get_password("gh:github.com", "")
@@ -89,7 +108,8 @@ def collect_contributors(repo: str | None, since: str | None) -> None:
             "service gh:github.com github_api_token'"
         )
         raise click.ClickException(error_message)
-    headers = {"Authorization": f"token {token}"}
+    # nothing is reused between runs, so don't create a cache file
+    session = GitHubSession(token, backend="memory", expire_after=EXPIRE_IMMEDIATELY)
     base_url = f"{GITHUB_API_URL}/repos/{repo}"
 
     contributors = Contributors.load()
@@ -98,12 +118,14 @@ def collect_contributors(repo: str | None, since: str | None) -> None:
         datetime.fromisoformat(since).strftime("%Y-%m-%dT%H:%M:%SZ") if since else None
     )
 
-    collect_issues_and_prs(base_url, contributors, headers, since_date)
-    collect_discussions(repo, contributors, headers, since_date)
+    with phase("fetch"):
+        collect_issues_and_prs(base_url, contributors, session, since_date)
+        collect_discussions(repo, contributors, session, since_date)
 
     click.echo("\n---\n\n")
     # write contributors to stdout as YAML
-    contributors.dump()
+    with phase("write"):
+        contributors.dump()
 
 
 T = TypeVar("T", bound="Contributors")
@@ -121,7 +143,7 @@ class Contributors:
         """Load contributors from a YAML file."""
         result = cls()
         with Path("contributors.yaml").open() as yaml_file:
-            raw_contributors = yaml.load(yaml_file)
+            raw_contributors = get_yaml().load(yaml_file)
             result._contributors = {  # noqa: SLF001
                 login: [Contribution(**c) for c in contributions]
                 for login, contributions in raw_contributors.items()
@@ -134,6 +156,7 @@ class Contributors:
             login: [asdict(c) for c in contributions]
             for login, contributions in self._contributors.items()
         }
+        yaml = get_yaml()
         yaml.dump(
             contributors_raw,
             stream=click.get_text_stream("stdout"),
@@ -197,7 +220,7 @@ CONTRIBUTION_TYPES: dict[tuple[str, str], Contribution] = {
 def collect_issues_and_prs(
     base_url: str,
     contributors: Contributors,
-    headers: dict[str, str],
+    session: GitHubSession,
     since_date: str | None,
 ) -> None:
     """Collect issue and PR authors and commenters."""
@@ -205,10 +228,8 @@ def collect_issues_and_prs(
         url = f"{base_url}/{endpoint}?state=all&sort=updated&direction=desc"
         if since_date:
             url += f"&since={since_date}"
-        while url:
+        for response in session.iter_pages(url):
             click.echo(f"{endpoint} and their comments:")
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
             data = response.json()
             if since_date and all(item["updated_at"] < since_date for item in data):
                 break
@@ -225,12 +246,7 @@ def collect_issues_and_prs(
 
                 if since_date and item["updated_at"] < since_date:
                     continue
-                comments_url = item["comments_url"]
-                comments_response = requests.get(
-                    comments_url, headers=headers, timeout=REQUEST_TIMEOUT
-                )
-                comments_response.raise_for_status()
-                comments_data = comments_response.json()
+                comments_data = session.get(item["comments_url"]).json()
                 for comment in comments_data:
                     if comment["user"]["login"] == "github-actions":
                         continue
@@ -241,13 +257,12 @@ def collect_issues_and_prs(
                         number,
                         comment["updated_at"],
                     )
-            url = response.links.get("next", {}).get("url")
 
 
 def collect_discussions(
     repo: str,
     contributors: Contributors,
-    headers: dict[str, str],
+    session: GitHubSession,
     since_date: str | None,
 ) -> None:
     """Collect discussion authors and commenters using GraphQL API."""
@@ -288,14 +303,7 @@ def collect_discussions(
     has_next_page = True
     while has_next_page:
         click.echo("discussions and their comments:")
-        response = requests.post(
-            GITHUB_GRAPHQL_URL,
-            headers=headers,
-            json={"query": query, "variables": variables},
-            timeout=REQUEST_TIMEOUT,
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = session.graphql(query, variables).json()
 
         discussions = data["data"]["repository"]["discussions"]["nodes"]
         for discussion in discussions:
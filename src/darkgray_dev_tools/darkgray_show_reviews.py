@@ -5,6 +5,21 @@ Usage::
     pip install darkgray-dev-tools
     darkgray-show-reviews --token=<ghp_your_github_token>
 
+To only fetch pull requests updated since the previous run, keep the results in a local
+database. Reports can then also be generated offline from the database::
+
+    darkgray-show-reviews --token=<ghp_your_github_token> --db=reviews.sqlite
+    darkgray-show-reviews --db=reviews.sqlite --offline --stats
+
+To report on several repositories, or all repositories of an organisation, at once::
+
+    darkgray-show-reviews --token=<ghp_your_github_token> --repo=me/one --repo=me/two
+    darkgray-show-reviews --token=<ghp_your_github_token> --org=me
+
+To write each review as a line of JSON as soon as it is received::
+
+    darkgray-show-reviews --token=<ghp_your_github_token> --org=me --format=ndjson
+
 """
 
 # pylint: disable=R0801
@@ -12,51 +27,121 @@ Usage::
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from queue import Queue
+from threading import Event
+from typing import TYPE_CHECKING, Iterable, Iterator, cast
 
 import click
-from requests import codes
-from ruamel.yaml import YAML
 
-from darkgray_dev_tools.darkgray_update_contributors import (
-    GitHubSession,
-    get_github_repository,
+from darkgray_dev_tools.darkgray_update_contributors import get_github_repository
+from darkgray_dev_tools.exceptions import GitHubApiNotFoundError
+from darkgray_dev_tools.metrics import metrics_option, phase
+from darkgray_dev_tools.profiling import profile_option
+from darkgray_dev_tools.review_stats import PERIOD_ADJECTIVES, ReviewColumns
+from darkgray_dev_tools.review_store import ReviewStore
+from darkgray_dev_tools.review_stream import (
+    external_sort,
+    write_ndjson,
+    write_yaml_documents,
 )
-from darkgray_dev_tools.exceptions import GitHubApiError
+from darkgray_dev_tools.reviews import Review
 
+if TYPE_CHECKING:
+    from darkgray_dev_tools.github_session import GitHubSession
 
-@dataclass
-class Review:
-    """Represents a pull request review."""
+REPOSITORY_CONCURRENCY = 4
+OUTPUT_FORMATS = ["yaml", "ndjson", "yaml-stream"]
 
-    pr_number: int
-    pr_title: str
-    reviewer: str
-    submitted_at: datetime
 
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO 8601 timestamp, also accepting the ``Z`` suffix for UTC.
+
+    >>> _parse_timestamp("2024-05-06T07:08:09Z")
+    datetime.datetime(2024, 5, 6, 7, 8, 9, tzinfo=datetime.timezone.utc)
+
+    """
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+
+SEARCH_RESULT_LIMIT = 1000
+"""GitHub search returns at most this many results for one query."""
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """Format a timestamp for use in a GitHub search query.
+
+    >>> _format_timestamp(datetime(2024, 5, 6, 7, 8, 9, tzinfo=timezone.utc))
+    '2024-05-06T07:08:09Z'
+
+    """
+    return timestamp.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-def get_approved_reviews(session: GitHubSession, repo: str) -> list[Review]:
-    """Fetch approved reviews for the repository using GraphQL API.
+
+def build_search_query(
+    repo: str,
+    since: datetime | None = None,
+    updated_before: datetime | None = None,
+) -> str:
+    """Build a GitHub search query for pull requests with approved reviews.
+
+    >>> build_search_query("me/repo")
+    'repo:me/repo is:pr review:approved sort:updated-desc'
+
+    Reviews by the repository owner aren't excluded in the query, since
+    ``-reviewed-by:`` would also drop pull requests approved by others but reviewed by
+    the owner. They are skipped after fetching instead.
+
+    :param repo: The repository name (owner/repo)
+    :param since: Only match pull requests updated at or after this time
+    :param updated_before: Only match pull requests updated at or before this time
+    :return: The search query
+
+    """
+    terms = [f"repo:{repo}", "is:pr", "review:approved"]
+    if since and updated_before:
+        terms.append(
+            f"updated:{_format_timestamp(since)}..{_format_timestamp(updated_before)}"
+        )
+    elif since:
+        terms.append(f"updated:>={_format_timestamp(since)}")
+    elif updated_before:
+        terms.append(f"updated:<={_format_timestamp(updated_before)}")
+    terms.append("sort:updated-desc")
+    return " ".join(terms)
+
+
+def iter_approved_review_pages(
+    session: GitHubSession, repo: str, since: datetime | None = None
+) -> Iterator[list[Review]]:
+    """Fetch approved reviews for the repository using GraphQL API, page by page.
+
+    Pull requests are found using GitHub search, so only approved pull requests updated
+    since the given time are transferred. GitHub search stops after
+    `SEARCH_RESULT_LIMIT` results, so the search is then continued with pull requests
+    updated before the last one received.
 
     :param session: The GitHub API session
     :param repo: The repository name (owner/repo)
-    :return: A list of approved reviews
+    :param since: Only fetch pull requests updated at or after this time
+    :return: The approved reviews in each page of search results, as soon as the page
+             has been received
     """
-    owner, name = repo.split("/")
     query = """
-    query($owner: String!, $name: String!, $cursor: String) {
-      repository(owner: $owner, name: $name) {
-        pullRequests(first: 100,
-                     after: $cursor,
-                     orderBy: {field: UPDATED_AT, direction: DESC}) {
-          pageInfo {
-            hasNextPage
-            endCursor
-          }
-          nodes {
+    query($query: String!, $cursor: String) {
+      search(query: $query, type: ISSUE, first: 100, after: $cursor) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          ... on PullRequest {
             number
             title
+            updatedAt
             reviews(first: 1, states: APPROVED) {
               nodes {
                 author {
@@ -71,20 +156,23 @@ def get_approved_reviews(session: GitHubSession, repo: str) -> list[Review]:
     }
     """
 
-    approved_reviews = []
-    variables = {"owner": owner, "name": name, "cursor": None}
+    seen_pr_numbers: set[int] = set()
+    updated_before = None
+    results_for_query = 0
+    variables = {
+        "query": build_search_query(repo, since),
+        "cursor": None,
+    }
 
     while True:
-        response = session.post(
-            "https://api.github.com/graphql",
-            json={"query": query, "variables": variables},
-        )
-        if response.status_code != codes.ok:
-            raise GitHubApiError(response)
-
-        data = response.json()["data"]["repository"]["pullRequests"]
+        data = session.graphql(query, variables).json()["data"]["search"]
 
+        approved_reviews = []
         for pr in data["nodes"]:
+            results_for_query += 1
+            if pr["number"] in seen_pr_numbers:
+                continue
+            seen_pr_numbers.add(pr["number"])
             if pr["reviews"]["nodes"]:
                 review = pr["reviews"]["nodes"][0]
                 approved_reviews.append(
@@ -92,77 +180,504 @@ def get_approved_reviews(session: GitHubSession, repo: str) -> list[Review]:
                         pr_number=pr["number"],
                         pr_title=pr["title"],
                         reviewer=review["author"]["login"],
-                        submitted_at=datetime.fromisoformat(
-                            review["submittedAt"].replace("Z", "+00:00")
-                        ),
+                        submitted_at=_parse_timestamp(review["submittedAt"]),
+                        repository=repo,
                     )
                 )
+        yield approved_reviews
 
-        if not data["pageInfo"]["hasNextPage"]:
+        if data["pageInfo"]["hasNextPage"]:
+            variables["cursor"] = data["pageInfo"]["endCursor"]
+        elif results_for_query >= SEARCH_RESULT_LIMIT and data["nodes"]:
+            oldest = _parse_timestamp(data["nodes"][-1]["updatedAt"])
+            if updated_before and oldest >= updated_before:
+                break  # no progress, avoid repeating the same search forever
+            updated_before = oldest
+            variables["query"] = build_search_query(repo, since, updated_before)
+            variables["cursor"] = None
+            results_for_query = 0
+        else:
             break
 
-        variables["cursor"] = data["pageInfo"]["endCursor"]
 
-    return approved_reviews
+def get_approved_reviews(
+    session: GitHubSession, repo: str, since: datetime | None = None
+) -> list[Review]:
+    """Fetch approved reviews for the repository using GraphQL API.
+
+    See `iter_approved_review_pages` for details.
+
+    :param session: The GitHub API session
+    :param repo: The repository name (owner/repo)
+    :param since: Only fetch pull requests updated at or after this time
+    :return: A list of approved reviews
+    """
+    return [
+        review
+        for page in iter_approved_review_pages(session, repo, since)
+        for review in page
+    ]
+
+
+def get_repositories(session: GitHubSession, org: str) -> list[str]:
+    """List the repositories of a GitHub organisation or user.
+
+    Forks and archived repositories are skipped.
+
+    :param session: The GitHub API session
+    :param org: The name of the organisation or user
+    :return: Repository names (owner/repo)
+
+    """
+    try:
+        pages = list(session.iter_pages(f"/orgs/{org}/repos", params={"per_page": 100}))
+    except GitHubApiNotFoundError:
+        pages = list(
+            session.iter_pages(f"/users/{org}/repos", params={"per_page": 100})
+        )
+    return [
+        repo["full_name"]
+        for response in pages
+        for repo in response.json()
+        if not repo["fork"] and not repo["archived"]
+    ]
+
+
+def _fetch_pages_into_queue(
+    pages: Queue[list[Review] | Exception | None],
+    stop: Event,
+    session: GitHubSession,
+    repo: str,
+    since: datetime | None,
+) -> None:
+    """Fetch pages of approved reviews into a queue until all are fetched or stopped.
+
+    The end of the fetch is signaled by putting `None`, or the exception which stopped
+    it, into the queue.
+
+    """
+    try:
+        for page in iter_approved_review_pages(session, repo, since):
+            if stop.is_set():
+                break
+            pages.put(page)
+    except Exception as exc:  # noqa: BLE001  # re-raised in the consuming thread
+        pages.put(exc)
+    else:
+        pages.put(None)
+
+
+def iter_review_pages_concurrently(
+    session: GitHubSession, since: dict[str, datetime | None]
+) -> Iterator[list[Review]]:
+    """Fetch approved reviews for multiple repositories concurrently, page by page.
+
+    Pages are returned in the order they are received. At most a few pages are
+    buffered, so fetching pauses if the caller doesn't keep up.
+
+    :param session: The GitHub API session, shared by all requests
+    :param since: Repository names (owner/repo), each with the time to fetch pull
+                  requests updated since, or `None` to fetch all pull requests
+    :return: Pages of approved reviews from all repositories, including reviews by the
+             owner of each repository
+
+    """
+    pages: Queue[list[Review] | Exception | None] = Queue(
+        maxsize=2 * REPOSITORY_CONCURRENCY
+    )
+    stop = Event()
+    remaining = len(since)
+    with ThreadPoolExecutor(max_workers=REPOSITORY_CONCURRENCY) as executor:
+        for repo, repo_since in since.items():
+            executor.submit(
+                _fetch_pages_into_queue, pages, stop, session, repo, repo_since
+            )
+        try:
+            while remaining:
+                item = pages.get()
+                if isinstance(item, list):
+                    yield item
+                    continue
+                remaining -= 1
+                if item is not None:
+                    raise item
+        finally:
+            # unblock and stop remaining fetches if the caller stops early or on error
+            stop.set()
+            while remaining:
+                if not isinstance(pages.get(), list):
+                    remaining -= 1
+
+
+def fetch_reviews_concurrently(
+    session: GitHubSession,
+    since: dict[str, datetime | None],
+    *,
+    include_owner: bool,
+) -> list[Review]:
+    """Fetch approved reviews for multiple repositories concurrently.
+
+    :param session: The GitHub API session, shared by all requests
+    :param since: Repository names (owner/repo), each with the time to fetch pull
+                  requests updated since, or `None` to fetch all pull requests
+    :param include_owner: `True` to include reviews by the owner of each repository
+    :return: Approved reviews from all repositories
+
+    """
+    return list(
+        _filter_owner(
+            (
+                review
+                for page in iter_review_pages_concurrently(session, since)
+                for review in page
+            ),
+            include_owner=include_owner,
+        )
+    )
+
+
+def fetch_and_store_reviews(
+    session: GitHubSession,
+    repositories: list[str],
+    since: datetime | None,
+    store: ReviewStore | None,
+) -> Iterator[Review]:
+    """Fetch approved reviews, and store them in the database if one is given.
+
+    Unless `since` is given, only pull requests updated since the previous fetch
+    recorded in the database are fetched for each repository. Reviews are returned and
+    stored one page at a time as they are received. Reviews by repository owners are
+    included, so they can be skipped or reported later without fetching again.
+
+    The time of this fetch is recorded only for repositories with no gap since the
+    previous fetch, i.e. if `since` isn't given or is at or before the previous fetch.
+
+    :param session: The GitHub API session
+    :param repositories: Repository names (owner/repo)
+    :param since: Fetch pull requests updated since this time, or `None` to use the
+                  time of the previous fetch
+    :param store: The review database, or `None` to not store reviews
+    :return: The approved reviews fetched
+
+    """
+    fetched_at = datetime.now(tz=timezone.utc)
+    last_fetched_at = {
+        repo: store.last_fetched_at(repo) if store else None for repo in repositories
+    }
+    pages = iter_review_pages_concurrently(
+        session, {repo: since or last_fetched_at[repo] for repo in repositories}
+    )
+    for page in pages:
+        if store:
+            store.upsert(page)
+        yield from page
+    if store:
+        store.set_fetched_at(
+            [
+                repo
+                for repo, previous in last_fetched_at.items()
+                if since is None or (previous is not None and since <= previous)
+            ],
+            fetched_at,
+        )
+
+
+def iter_reviews(  # noqa: PLR0913
+    session: GitHubSession | None,
+    repositories: list[str],
+    since: datetime | None,
+    store: ReviewStore | None,
+    *,
+    include_owner: bool,
+    sort: bool,
+) -> Iterator[Review]:
+    """Fetch approved reviews and return them one by one, optionally sorted.
+
+    Unsorted reviews are returned as soon as they are received, and also stored in the
+    database if one is given. Sorted reviews are first fetched into the database and
+    read back sorted, or without a database, sorted in runs merged from temporary
+    files, so memory use stays bounded in all cases. Offline, stored reviews are read
+    back sorted.
+
+    :param session: The GitHub API session, or `None` to not fetch reviews
+    :param repositories: Repository names (owner/repo)
+    :param since: Fetch pull requests updated since this time, or `None` to use the
+                  time of the previous fetch
+    :param store: The review database, or `None` to not store reviews
+    :param include_owner: `True` to include reviews by the owner of each repository
+    :param sort: `True` to return reviews most recent first
+    :return: The approved reviews
+
+    """
+    approved_reviews: Iterable[Review] = ()
+    if session:
+        approved_reviews = fetch_and_store_reviews(session, repositories, since, store)
+    if store and (sort or not session):
+        deque(approved_reviews, maxlen=0)  # fetch everything into the database
+        return store.iter_reviews(repositories, include_owner=include_owner)
+    approved_reviews = _filter_owner(approved_reviews, include_owner=include_owner)
+    if sort:
+        return external_sort(approved_reviews, key=_review_sort_key, reverse=True)
+    return iter(approved_reviews)
+
+
+def _review_sort_key(review: Review) -> tuple[datetime, str, int]:
+    """Return the key for sorting reviews by time, repository and pull request."""
+    return review.submitted_at, review.repository, review.pr_number
+
+
+def _filter_owner(
+    reviews: Iterable[Review], *, include_owner: bool
+) -> Iterator[Review]:
+    """Optionally skip reviews by the owner of each repository."""
+    return (
+        review
+        for review in reviews
+        if include_owner or review.reviewer != review.repository.split("/")[0]
+    )
 
 
-def generate_monthly_stats(approved_reviews: list[Review]) -> dict[str, dict[str, int]]:
+def _review_to_dict(
+    review: Review, *, with_repository: bool = False
+) -> dict[str, object]:
+    """Convert a review to a dictionary for YAML or JSON output."""
+    repository: dict[str, object] = (
+        {"repository": review.repository} if with_repository else {}
+    )
+    return {
+        **repository,
+        "pr_number": review.pr_number,
+        "pr_title": review.pr_title,
+        "approved_by": review.reviewer,
+        "timestamp": review.submitted_at.isoformat(),
+    }
+
+
+def generate_monthly_stats(
+    approved_reviews: Iterable[Review],
+) -> dict[str, dict[str, int]]:
     """Generate monthly statistics of approvals by reviewer."""
-    stats: dict[str, dict[str, int]] = {}
-    for review in approved_reviews:
-        month_key = review.submitted_at.strftime("%Y-%m")
-        if month_key not in stats:
-            stats[month_key] = {}
-        stats[month_key][review.reviewer] = stats[month_key].get(review.reviewer, 0) + 1
+    return ReviewColumns.from_reviews(approved_reviews).counts("month")
+
+
+def generate_stats(
+    approved_reviews: Iterable[Review], period: str, rolling: int, top: int | None
+) -> dict[str, object]:
+    """Generate statistics of approvals by reviewer for YAML output.
+
+    :param approved_reviews: The approved reviews to generate statistics for
+    :param period: ``week``, ``month`` or ``quarter``
+    :param rolling: The number of periods to sum up counts over
+    :param top: The number of most active reviewers to list, or `None` for none
+    :return: Counts of approvals by reviewer for each period, and optionally the most
+             active reviewers
+
+    """
+    columns = ReviewColumns.from_reviews(approved_reviews)
+    stats: dict[str, object] = {
+        f"{PERIOD_ADJECTIVES[period]}_stats": columns.counts(period, rolling)
+    }
+    if rolling > 1:
+        stats["rolling_window"] = rolling
+    if top:
+        stats["top_reviewers"] = columns.top_reviewers(top)
     return stats
 
 
 @click.command()
-@click.option("--token", required=True, help="GitHub API token")
+@click.option("--token", help="GitHub API token (required unless --offline)")
 @click.option(
     "--include-owner", is_flag=True, help="Include reviews by the repository owner"
 )
 @click.option(
     "--stats",
     is_flag=True,
-    help="Show monthly statistics instead of individual reviews",
+    help="Show statistics for each --period instead of individual reviews",
 )
-def show_reviews(token: str, include_owner: bool, stats: bool) -> None:  # noqa: FBT001
-    """Show timestamps and reviewers of most recent approved reviews in YAML format."""
-    session = GitHubSession(token)
-    repo = get_github_repository()
-    owner, _ = repo.split("/")
-
-    approved_reviews = get_approved_reviews(session, repo)
-    approved_reviews.sort(key=lambda r: r.submitted_at, reverse=True)
-
-    if not include_owner:
-        approved_reviews = [
-            review for review in approved_reviews if review.reviewer != owner
-        ]
+@click.option(
+    "--period",
+    type=click.Choice(list(PERIOD_ADJECTIVES)),
+    default="month",
+    show_default=True,
+    help="Period to count approvals over with --stats",
+)
+@click.option(
+    "--rolling",
+    type=click.IntRange(min=1),
+    default=1,
+    help="With --stats, sum up counts over a rolling window of this many periods",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    help="With --stats, also list this many most active reviewers",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    help="Only fetch pull requests updated since this date (e.g. 2024-01-01)",
+)
+@click.option(
+    "--db",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=(
+        "Keep fetched reviews in this SQLite database, and on later runs only fetch"
+        " pull requests updated since the previous run"
+    ),
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Don't fetch anything, report only reviews already stored in --db",
+)
+@click.option(
+    "--repo",
+    "repos",
+    multiple=True,
+    help="Repository to report on (owner/repo). Can be given multiple times.",
+)
+@click.option("--org", help="Report on all repositories of an organisation or user")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default="yaml",
+    show_default=True,
+    help=(
+        "Output one YAML document, or stream reviews as JSON lines (ndjson) or YAML"
+        " documents (yaml-stream) as soon as they are received"
+    ),
+)
+@click.option(
+    "--sort/--no-sort",
+    "sort",
+    default=None,
+    help=(
+        "Sort reviews most recent first. Streaming formats aren't sorted by default."
+        " Without --db, sorting keeps a bounded number of reviews in memory."
+    ),
+)
+@metrics_option
+@profile_option
+def show_reviews(  # noqa: PLR0913,PLR0917
+    token: str | None,
+    include_owner: bool,  # noqa: FBT001
+    stats: bool,  # noqa: FBT001
+    period: str,
+    rolling: int,
+    top: int | None,
+    since: datetime | None,
+    db: Path | None,
+    offline: bool,  # noqa: FBT001
+    repos: tuple[str, ...],
+    org: str | None,
+    output_format: str,
+    sort: bool | None,  # noqa: FBT001
+) -> None:
+    """Show timestamps and reviewers of most recent approved reviews in YAML format.
+
+    Reports on the repository in the current directory unless repositories or an
+    organisation are given.
+
+    """
+    from darkgray_dev_tools.github_session import GitHubSession  # noqa: PLC0415
+
+    if offline and not db:
+        message = "--offline requires --db"
+        raise click.UsageError(message)
+    if not offline and not token:
+        message = "--token is required unless --offline is given"
+        raise click.UsageError(message)
+    store = ReviewStore(db) if db else None
+    session = None if offline else GitHubSession(cast("str", token))
+    repositories = list(repos)
+    if org and session:
+        with phase("fetch"):
+            repositories.extend(get_repositories(session, org))
+    elif org and store:
+        repositories.extend(store.repositories(org))
+    if org and not repositories:
+        message = f"No repositories to report on found for --org={org}"
+        raise click.UsageError(message)
+    if not repositories:
+        repositories = [get_github_repository()]
+
+    approved_reviews = iter_reviews(
+        session,
+        repositories,
+        since.replace(tzinfo=timezone.utc) if since else None,
+        store,
+        include_owner=include_owner,
+        sort=output_format == "yaml" or stats if sort is None else sort,
+    )
+    try:
+        # reviews are fetched lazily while they are written
+        with phase("write"):
+            write_output(
+                approved_reviews,
+                repositories,
+                output_format,
+                stats=(period, rolling, top) if stats else None,
+            )
+    finally:
+        if store:
+            store.close()
+
+
+def write_output(
+    approved_reviews: Iterable[Review],
+    repositories: list[str],
+    output_format: str,
+    stats: tuple[str, int, int | None] | None,
+) -> None:
+    """Write approved reviews or statistics of them to standard output.
 
+    In the ``yaml`` format, everything is written as one YAML document. In the
+    ``ndjson`` and ``yaml-stream`` formats, each review is written as soon as it is
+    available, and statistics are written as one object after the reviews have been
+    received.
+
+    :param approved_reviews: The approved reviews to write
+    :param repositories: The names of the repositories reported on
+    :param output_format: One of `OUTPUT_FORMATS`
+    :param stats: The period, rolling window and number of top reviewers for writing
+                  statistics instead of reviews, or `None` to write reviews
+
+    """
+    stdout = click.get_text_stream("stdout")
+    multiple = len(repositories) > 1
+    header: dict[str, object] = (
+        {"repositories": repositories} if multiple else {"repository": repositories[0]}
+    )
+    items: Iterable[dict[str, object]]
     if stats:
-        yaml_data = {
-            "repository": repo,
-            "monthly_stats": generate_monthly_stats(approved_reviews),
-        }
+        items = [{**header, **generate_stats(approved_reviews, *stats)}]
+    elif output_format == "yaml":
+        items = [
+            {
+                **header,
+                "approved_reviews": [
+                    _review_to_dict(review, with_repository=multiple)
+                    for review in approved_reviews
+                ],
+            }
+        ]
     else:
-        yaml_data = {
-            "repository": repo,
-            "approved_reviews": [
-                {
-                    "pr_number": review.pr_number,
-                    "pr_title": review.pr_title,
-                    "approved_by": review.reviewer,
-                    "timestamp": review.submitted_at.isoformat(),
-                }
-                for review in approved_reviews
-            ],
-        }
+        items = (
+            _review_to_dict(review, with_repository=True) for review in approved_reviews
+        )
+
+    if output_format == "ndjson":
+        write_ndjson(items, stdout)
+    elif output_format == "yaml-stream":
+        write_yaml_documents(items, stdout)
+    else:
+        from ruamel.yaml import YAML  # noqa: PLC0415
 
-    yaml = YAML()
-    yaml.default_flow_style = False
-    yaml.dump(yaml_data, click.get_text_stream("stdout"))
+        yaml = YAML()
+        yaml.default_flow_style = False
+        for item in items:
+            yaml.dump(item, stdout)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,19 @@ then fetches the latest version from PyPI and suggests adding a version limit to
 dependency in the ``pyproject.toml`` file.
 
 The script outputs a GitHub Actions annotation with the suggestion and a notice
-message in the log.
+message in the log. The suggestion is also appended to the job summary.
+
+With ``--all``, a constraint is suggested for every unbounded dependency instead of just
+the first one. Latest versions of all of them are fetched from PyPI concurrently.
+
+Latest versions are looked up using the PyPI JSON Simple API, skipping pre-releases and
+yanked releases. Results are cached on disk together with the ETags of the responses, so
+unchanged packages are revalidated without transferring or parsing their release
+history again.
+
+For air-gapped environments, ``--index-url`` (or ``PIP_INDEX_URL``) can point to
+another simple repository index or to a local simple index directory, and
+``--find-links`` to a wheelhouse directory of wheels and sdists.
 
 The script is intended to be run in a GitHub Actions workflow.
 
@@ -22,112 +34,190 @@ Example usage in a GitHub Actions workflow:
 
 from __future__ import annotations
 
-import json
 import os
-import re
-import urllib.request
+from dataclasses import dataclass
 from pathlib import Path
 from textwrap import dedent
-from typing import cast
+from typing import TYPE_CHECKING, Iterable
 
 import click
-from packaging.requirements import InvalidRequirement, Requirement
-from packaging.version import Version
-from pyproject_parser import PyProject
+from packaging.utils import canonicalize_name
+
+from darkgray_dev_tools.metrics import metrics_option, phase
+from darkgray_dev_tools.package_index import (
+    PYPI_CACHE_PATH,
+    PYPI_SIMPLE_URL,
+    get_latest_versions,
+    get_wheelhouse_versions,
+    load_version_cache,
+    save_version_cache,
+)
+from darkgray_dev_tools.profiling import profile_option
+from darkgray_dev_tools.project_context import get_project_context
+
+if TYPE_CHECKING:
+    from packaging.requirements import Requirement
+    from packaging.version import Version
+
+    from darkgray_dev_tools.pyproject_index import PyprojectIndex, RequirementSpan
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """A suggested maximum version for a dependency, and its position in the file.
+
+    The line number is zero-based, and columns are one-based as in GitHub annotations.
 
+    """
 
-def parse_quoted_package(line: str) -> str | None:
-    """Extract a quoted package name from a line in a TOML file."""
-    try:
-        match = re.match(r' *"(.*?)"', line)
-        return Requirement(match.group(1)).name.lower() if match else None
-    except (AttributeError, InvalidRequirement):
-        return None
+    name: str
+    line_num: int
+    column: int
+    end_column: int
+    latest_version: Version
 
 
-def _get_all_dependencies(pyproject: PyProject) -> list[Requirement]:
-    """Get all dependencies from the project."""
-    project = pyproject.project
-    if not project:
+def _is_unbounded(requirement: Requirement) -> bool:
+    """Return `True` if the requirement has no upper bound on the version."""
+    return not any(
+        specifier.operator in ["<", "<=", "~="] for specifier in requirement.specifier
+    )
+
+
+def find_unbounded_requirements(
+    index: PyprojectIndex, packages: Iterable[str]
+) -> list[RequirementSpan]:
+    """Find requirements without an upper bound on the version.
+
+    :param index: The index of requirements in ``pyproject.toml``
+    :param packages: The packages to consider, or an empty list to consider all
+    :return: The first requirement of each package without an upper bound, in the order
+             they appear in ``pyproject.toml``
+    :raises ValueError: if ``pyproject.toml`` has no ``[project]`` table
+
+    """
+    if not index.has_project:
         msg = "Missing [project] table in pyproject.toml"
         raise ValueError(msg)
-    optional_dependencies = [
-        requirement
-        for requirements in project.get("optional-dependencies", {}).values()
-        for requirement in requirements
-    ]
-    return cast(
-        "list[Requirement]",
-        project["dependencies"] + optional_dependencies,
+    names = {canonicalize_name(package) for package in packages}
+    seen = set()
+    unbounded = []
+    for span in index.requirements:
+        if span.name in seen or (names and span.name not in names):
+            continue
+        seen.add(span.name)
+        if _is_unbounded(span.requirement):
+            unbounded.append(span)
+    return unbounded
+
+
+def format_annotation(suggestion: Suggestion) -> str:
+    """Format a suggestion as a GitHub Actions notice annotation."""
+    return (
+        "::notice "
+        "file=pyproject.toml,"
+        f"line={suggestion.line_num + 1},"
+        f"col={suggestion.column},"
+        f"endColumn={suggestion.end_column},"
+        "title=Future dependency incompatibility?::"
+        "You could add a maximum version constraint for a dependency "
+        f"here, e.g. {suggestion.name}<={suggestion.latest_version}"
+    )
+
+
+def format_summary(suggestion: Suggestion) -> str:
+    """Format a suggestion as Markdown for the GitHub Actions job summary."""
+    return dedent(
+        f"""
+        ### :x: Future dependency incompatibility? :x:
+
+        You could add a maximum version constraint for a dependency on
+        `pyproject.toml` line {suggestion.line_num + 1}, e.g.
+        `{suggestion.name},<={suggestion.latest_version}`
+
+        See [#382](/akaihola/darker/issues/382)
+        for more information
+        """
     )
 
 
 @click.command()
+@click.option(
+    "--all",
+    "all_dependencies",
+    is_flag=True,
+    help="Suggest a constraint for every unbounded dependency instead of the first one",
+)
+@click.option(
+    "--index-url",
+    default=PYPI_SIMPLE_URL,
+    show_default=True,
+    envvar="PIP_INDEX_URL",
+    help="Simple repository index URL, or a path to a local simple index directory",
+)
+@click.option(
+    "--find-links",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Look up versions from wheels and sdists in this directory, not an index",
+)
+@click.option(
+    "--cache-file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=PYPI_CACHE_PATH,
+    show_default=True,
+    help="File for caching latest versions of packages and PyPI response ETags",
+)
 @click.argument("packages", nargs=-1)
-def suggest_constraint(packages: list[str]) -> None:
+@metrics_option
+@profile_option
+def suggest_constraint(
+    packages: list[str],
+    *,
+    all_dependencies: bool,
+    index_url: str,
+    find_links: Path | None,
+    cache_file: Path,
+) -> None:
     """Suggest a version constraint for a dependency in pyproject.toml."""
     # Convert all package names to lowercase for consistent comparison
     packages_to_check = [pkg.lower() for pkg in packages]
-    all_dependencies = _get_all_dependencies(PyProject.load("pyproject.toml"))
-    for requirement in all_dependencies:
-        if packages_to_check and requirement.name.lower() not in packages_to_check:
-            continue
-        if any(
-            specifier.operator in ["<", "<=", "~="]
-            for specifier in requirement.specifier
-        ):
-            continue
-        with Path("pyproject.toml").open(encoding="utf-8") as pyproject_file:
-            line_num, line = next(
-                (_, _line)
-                for _, _line in enumerate(pyproject_file)
-                if parse_quoted_package(_line) == requirement.name.lower()
-            )
-        end_column = len(line)
-        column = end_column - len(line.strip())
-        with urllib.request.urlopen(
-            f"https://pypi.org/pypi/{requirement.name}/json"
-        ) as response:
-            content = json.loads(response.read().decode())
-        latest_version = max(
-            Version(version_str) for version_str in content["releases"]
+    unbounded = find_unbounded_requirements(
+        get_project_context().requirements(), packages_to_check
+    )
+    if not all_dependencies:
+        unbounded = unbounded[:1]
+    if not unbounded:
+        msg_parts = [">= line not found in pyproject.toml"]
+        if packages_to_check:
+            msg_parts.append(f"for packages: {', '.join(packages_to_check)}")
+        raise RuntimeError(" ".join(msg_parts))
+    names = [span.requirement.name for span in unbounded]
+    with phase("fetch"):
+        if find_links:
+            latest_versions = get_wheelhouse_versions(find_links, names)
+        else:
+            cache = load_version_cache(cache_file)
+            latest_versions = get_latest_versions(names, cache, index_url)
+            save_version_cache(cache_file, cache)
+    suggestions = [
+        Suggestion(
+            span.requirement.name,
+            span.line_num,
+            span.start + 1,
+            span.end + 1,
+            latest_version,
         )
+        for span, latest_version in zip(unbounded, latest_versions)
+    ]
 
+    with phase("write"):
         github_step_summary_path = os.getenv("GITHUB_STEP_SUMMARY")
         if github_step_summary_path:
-            Path(github_step_summary_path).write_text(
-                dedent(
-                    f"""
-                    ### :x: Future dependency incompatibility? :x:
-
-                    You could add a maximum version constraint for a dependency on
-                    `pyproject.toml` line {line_num + 1}, e.g.
-                    `{requirement.name},<={latest_version}`
-
-                    See [#382](/akaihola/darker/issues/382)
-                    for more information
-                    """
-                ),
-                encoding="utf-8",
-            )
-
-        print(  # noqa: T201
-            "::notice "
-            "file=pyproject.toml,"
-            f"line={line_num + 1},"
-            f"col={column},"
-            f"endColumn={end_column},"
-            "title=Future dependency incompatibility?::"
-            "You could add a maximum version constraint for a dependency "
-            f"here, e.g. {requirement.name}<={latest_version}"
-        )
-        break
+            with Path(github_step_summary_path).open("a", encoding="utf-8") as summary:
+                summary.write("".join(format_summary(s) for s in suggestions))
 
-    else:
-        msg_parts = [">= line not found in pyproject.toml"]
-        if packages_to_check:
-            msg_parts.append(f"for packages: {', '.join(packages_to_check)}")
-        raise RuntimeError(" ".join(msg_parts))
+        for suggestion in suggestions:
+            print(format_annotation(suggestion))  # noqa: T201
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ Usage::
         --token=<ghp_your_github_token> \
         --modify-readme \
         --modify-contributors
+    darkgray-verify-contributors --token=<ghp_your_github_token>
 
 """
 
@@ -14,37 +15,32 @@ Usage::
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import timedelta
 from functools import lru_cache, total_ordering
+from http import HTTPStatus
 from itertools import groupby
 from pathlib import Path
 from subprocess import run
 from textwrap import dedent, indent
-from typing import (
-    TYPE_CHECKING,
-    Any,
-    Iterable,
-    MutableMapping,
-    Protocol,
-    TypedDict,
-    cast,
-)
+from typing import TYPE_CHECKING, Any, Iterable, Protocol, TypedDict, cast
 from urllib.parse import urlencode, urljoin
 
 import click
-from airium import Airium
-from requests import codes
-from requests_cache.session import CachedSession
-from ruamel.yaml import YAML
 
 from darkgray_dev_tools.exceptions import (
     GitHubApiError,
     GitHubApiNotFoundError,
     GitHubRepoNameError,
 )
+from darkgray_dev_tools.metrics import metrics_option, phase
+from darkgray_dev_tools.profiling import profile_option
 
 if TYPE_CHECKING:
-    from requests.models import Response
+    from airium import Airium
+
+    from darkgray_dev_tools.github_session import GitHubSession
 
 
 @click.group()
@@ -237,55 +233,6 @@ CONTRIBUTION_LINKS = {
 }
 
 
-class GitHubSession(CachedSession):
-    """Caching HTTP request session with useful defaults.
-
-    - GitHub authorization header generated from a given token
-    - Accept HTTP paths and prefix them with the GitHub API server name
-
-    """
-
-    def __init__(  # type: ignore[misc]
-        self, token: str, *args: Any, **kwargs: Any  # noqa: ANN401
-    ) -> None:
-        """Create the cached requests session with the given GitHub token."""
-        super().__init__(*args, **kwargs)
-        self.token = token
-
-    def request(  # type: ignore[override,misc]  # pylint: disable=arguments-differ
-        self,
-        method: str,
-        url: str,
-        headers: MutableMapping[str, str] | None = None,
-        **kwargs: Any,  # noqa: ANN401
-    ) -> Response:
-        """Query GitHub API with authorization, caching and host auto-fill-in.
-
-        Complete the request information with the GitHub API HTTP scheme and hostname,
-        and add a GitHub authorization header. Serve requests from the cache if they
-        match.
-
-        :param method: method for the new `Request` object.
-        :param url: URL for the new `Request` object.
-        :param headers: (optional) dictionary of HTTP Headers to send with the
-                        `Request`.
-        :return: The response object
-
-        """
-        hdrs = {"Authorization": f"token {self.token}", **(headers or {})}
-        if url.startswith("/"):
-            url = f"https://api.github.com{url}"
-        response = super().request(method, url, headers=hdrs, **kwargs)
-        if (
-            response.status_code == codes.not_found
-            and response.json()["message"] == "Not Found"
-        ):
-            raise GitHubApiNotFoundError
-        if response.status_code != codes.ok:
-            raise GitHubApiError(response)
-        return response
-
-
 AVATAR_URL_TEMPLATE = "https://avatars.githubusercontent.com/u/{}?v=3"
 
 
@@ -301,6 +248,8 @@ ALL_CONTRIBUTORS_END = "   <!-- ALL-CONTRIBUTORS-LIST:END -->"
 @click.option("--token")
 @click.option("-r/+r", "--modify-readme/--no-modify-readme", default=False)
 @click.option("-c/+c", "--modify-contributors/--no-modify-contributors", default=False)
+@metrics_option
+@profile_option
 def update(
     token: str, modify_readme: bool, modify_contributors: bool  # noqa: FBT001
 ) -> None:
@@ -311,28 +260,48 @@ def update(
     :param token: The GitHub authorization token for avoiding throttling
 
     """
+    from darkgray_dev_tools.github_session import GitHubSession  # noqa: PLC0415
+
+    config, users_and_contributions = load_contributors_yaml()
+    session = GitHubSession(token)
+    with phase("join"):
+        users = join_github_users_with_contributions(users_and_contributions, session)
+    with phase("render"):
+        doc = render_html(users, config)
+        contributor_list = render_contributor_list(users)
+        contributors_text = "\n".join(
+            sorted(contributor_list, key=lambda s: s.lower())
+        )
+    with phase("write"):
+        click.echo(doc)
+        click.echo(contributors_text)
+        if modify_readme:
+            write_readme(doc)
+        if modify_contributors:
+            write_contributors(contributors_text)
+
+
+def load_contributors_yaml() -> tuple[Configuration, dict[str, list[Contribution]]]:
+    """Read the configuration and the list of contributors from ``contributors.yaml``.
+
+    :return: The configuration, and GitHub logins with their repository contributions
+    :raises ValueError: Raised if there are too many YAML documents in the file
+
+    """
+    from ruamel.yaml import YAML  # noqa: PLC0415
+
     with Path("contributors.yaml").open(encoding="utf-8") as yaml_file:
         yaml = YAML(typ="safe", pure=True)
         *configs, contributors_src = yaml.load_all(yaml_file)
-        if len(configs) > 1:
-            message = "Too many YAML documents in contributors.yaml"
-            raise ValueError(message)
-        config = Configuration(**(configs[0] if configs else {}))
-        users_and_contributions: dict[str, list[Contribution]] = {
-            login: [Contribution(**c) for c in contributions]
-            for login, contributions in contributors_src.items()
-        }
-    session = GitHubSession(token)
-    users = join_github_users_with_contributions(users_and_contributions, session)
-    doc = render_html(users, config)
-    click.echo(doc)
-    contributor_list = render_contributor_list(users)
-    contributors_text = "\n".join(sorted(contributor_list, key=lambda s: s.lower()))
-    click.echo(contributors_text)
-    if modify_readme:
-        write_readme(doc)
-    if modify_contributors:
-        write_contributors(contributors_text)
+    if len(configs) > 1:
+        message = "Too many YAML documents in contributors.yaml"
+        raise ValueError(message)
+    config = Configuration(**(configs[0] if configs else {}))
+    users_and_contributions = {
+        login: [Contribution(**c) for c in contributions]
+        for login, contributions in contributors_src.items()
+    }
+    return config, users_and_contributions
 
 
 def get_cwd_repository() -> list[str]:
@@ -500,6 +469,8 @@ def render_html(users: list[Contributor], config: Configuration) -> Airium:
     :return: An Airium document describing the HTML table
 
     """
+    from airium import Airium  # noqa: PLC0415
+
     doc = Airium()
     rows_of_users: list[list[Contributor]] = make_rows(users, columns=6)
     with doc.table():
@@ -585,5 +556,239 @@ def write_contributors(text: str) -> None:
     )
 
 
+SEARCH_BATCH_SIZE = 6
+"""Maximum number of logins combined with ``OR`` into one GitHub search query.
+
+GitHub search rejects queries with more than five ``AND``, ``OR`` or ``NOT`` operators.
+
+"""
+SEARCH_CONCURRENCY = 4
+SEARCH_CACHE_EXPIRY = timedelta(hours=12)
+
+
+@dataclass(frozen=True)
+class ContributionSearch:
+    """A GitHub search for contributions matching a given link type.
+
+    >>> search = ContributionSearch("/search/issues", "is:pr", "author", "user")
+    >>> print(search.query(["me/repo"], ["alice", "bob"]))
+    repo:me/repo is:pr (author:alice OR author:bob)
+
+    """
+
+    endpoint: str
+    qualifiers: str
+    user_qualifier: str
+    user_field: str | None = None
+    """The field in search result items which identifies the matching user, if any"""
+
+    def query(self, repositories: list[str], logins: list[str]) -> str:
+        """Build a search query which matches contributions by any of the given users.
+
+        :param repositories: The repositories to search in
+        :param logins: The GitHub usernames to search contributions for
+        :return: The search query string
+
+        """
+        users = " OR ".join(f"{self.user_qualifier}:{login}" for login in logins)
+        if len(logins) > 1:
+            users = f"({users})"
+        repos = " ".join(f"repo:{repo}" for repo in repositories)
+        return " ".join(part for part in [repos, self.qualifiers, users] if part)
+
+
+CONTRIBUTION_SEARCHES = {
+    "issues": ContributionSearch("/search/issues", "is:issue", "author", "user"),
+    "pulls-author": ContributionSearch("/search/issues", "is:pr", "author", "user"),
+    "commits": ContributionSearch("/search/commits", "", "author", "author"),
+    "pulls-reviewed": ContributionSearch("/search/issues", "is:pr", "reviewed-by"),
+    "search-comments": ContributionSearch("/search/issues", "", "commenter"),
+}
+
+
+@dataclass
+class ContributionVerifier:
+    """Find users with contributions matching a search using few search requests.
+
+    Requests are paced within the search API rate limit by the session.
+
+    """
+
+    session: GitHubSession
+    repositories: list[str]
+
+    def search(
+        self, search: ContributionSearch, logins: list[str]
+    ) -> tuple[int, set[str]]:
+        """Run one search for contributions by any of the given users.
+
+        :param search: The search to run
+        :param logins: The GitHub usernames to search contributions for
+        :return: The total number of matches, and the lowercase logins of users seen
+                 in the first page of results
+
+        """
+        response = self.session.get(
+            search.endpoint,
+            params={"q": search.query(self.repositories, logins), "per_page": 100},
+        )
+        result = response.json()
+        seen_users = (
+            {
+                item[search.user_field]["login"].lower()
+                for item in result["items"]
+                if item.get(search.user_field)
+            }
+            if search.user_field
+            else set()
+        )
+        return result["total_count"], seen_users
+
+    def find_contributors(  # noqa: PLR0911
+        self, search: ContributionSearch, logins: list[str]
+    ) -> set[str]:
+        """Return those of the given users who have contributions matching a search.
+
+        All users are first searched for with a single query. Users seen in the results
+        are confirmed and the rest searched for again. If the results don't reveal
+        which users matched, the batch is split in half until they do.
+
+        Results of searches without a `ContributionSearch.user_field` never reveal which
+        users matched, so each user is searched for separately instead.
+
+        :param search: The search to run
+        :param logins: The GitHub usernames to search contributions for
+        :return: The GitHub usernames of users with matching contributions
+
+        """
+        if not search.user_field and len(logins) > 1:
+            return set().union(
+                *(self.find_contributors(search, [login]) for login in logins)
+            )
+        try:
+            total_count, seen_users = self.search(search, logins)
+        except GitHubApiError as exc:
+            # GitHub rejects the whole query if any of the users doesn't exist
+            if exc.status_code != HTTPStatus.UNPROCESSABLE_ENTITY:
+                raise
+            if len(logins) == 1:
+                return set()
+            return self._bisect(search, logins)
+        if total_count == 0:
+            return set()
+        found = {login for login in logins if login.lower() in seen_users}
+        if found:
+            rest = [login for login in logins if login not in found]
+            return found | (self.find_contributors(search, rest) if rest else set())
+        if len(logins) == 1:
+            return set(logins)
+        return self._bisect(search, logins)
+
+    def _bisect(self, search: ContributionSearch, logins: list[str]) -> set[str]:
+        middle = len(logins) // 2
+        first_half = self.find_contributors(search, logins[:middle])
+        return first_half | self.find_contributors(search, logins[middle:])
+
+
+def verify_contributions(
+    users_and_contributions: dict[str, list[Contribution]],
+    config: Configuration,
+    session: GitHubSession,
+) -> list[tuple[str, Contribution, str]]:
+    """Check claimed contributions against GitHub search.
+
+    Users claiming the same link type are searched for in batches of up to
+    `SEARCH_BATCH_SIZE` users per query, or one user per query if the search results
+    don't identify the matching users. Batches are searched concurrently while keeping
+    within the search API rate limit.
+
+    :param users_and_contributions: GitHub logins and their claimed contributions
+    :param config: Configuration for updating contributors
+    :param session: A GitHub API HTTP session
+    :return: The login, contribution and a description of the problem for each claimed
+             contribution which couldn't be verified
+
+    """
+    valid_types = {
+        link_type: types for types, link_type in CONTRIBUTION_TYPE_VERIFICATION.values()
+    }
+    problems: list[tuple[str, Contribution, str]] = []
+    to_search: dict[str, dict[str, list[Contribution]]] = {}
+    for login, contributions in users_and_contributions.items():
+        for contribution in contributions:
+            if contribution.type not in valid_types.get(contribution.link_type, []):
+                problems.append(
+                    (login, contribution, "type not supported by the link type")
+                )
+            elif contribution.link_type in CONTRIBUTION_SEARCHES:
+                to_search.setdefault(contribution.link_type, {}).setdefault(
+                    login, []
+                ).append(contribution)
+    verifier = ContributionVerifier(session, config.repositories)
+    confirmed = _search_in_batches(verifier, to_search)
+    for link_type, claims in to_search.items():
+        for login, contributions in claims.items():
+            if (link_type, login) not in confirmed:
+                problems.extend(
+                    (login, contribution, "no matching contributions found")
+                    for contribution in contributions
+                )
+    return sorted(problems, key=lambda problem: problem[0].lower())
+
+
+def _search_in_batches(
+    verifier: ContributionVerifier, to_search: dict[str, dict[str, list[Contribution]]]
+) -> set[tuple[str, str]]:
+    """Search for contributions of each link type concurrently in batches of users.
+
+    :param verifier: The contribution verifier to use for searching
+    :param to_search: Users to search for, grouped by link type
+    :return: Link types and logins of users whose contributions were found
+
+    """
+    confirmed: set[tuple[str, str]] = set()
+    with ThreadPoolExecutor(max_workers=SEARCH_CONCURRENCY) as executor:
+        futures = {}
+        for link_type, claims in to_search.items():
+            search = CONTRIBUTION_SEARCHES[link_type]
+            batch_size = SEARCH_BATCH_SIZE if search.user_field else 1
+            logins = list(claims)
+            for start in range(0, len(logins), batch_size):
+                batch = logins[start : start + batch_size]
+                future = executor.submit(verifier.find_contributors, search, batch)
+                futures[future] = link_type
+        for future, link_type in futures.items():
+            confirmed.update((link_type, login) for login in future.result())
+    return confirmed
+
+
+@cli.command()
+@click.option("--token", required=True, help="GitHub API token")
+@metrics_option
+@profile_option
+def verify(token: str) -> None:
+    """Check claimed contributions in ``contributors.yaml`` against GitHub search.
+
+    Exits with an error if any claimed contributions couldn't be verified. Link types
+    which can't be checked using the GitHub search API are skipped.
+
+    :param token: The GitHub authorization token for the search API
+
+    """
+    from darkgray_dev_tools.github_session import GitHubSession  # noqa: PLC0415
+
+    config, users_and_contributions = load_contributors_yaml()
+    session = GitHubSession(token, expire_after=SEARCH_CACHE_EXPIRY)
+    with phase("fetch"):
+        problems = verify_contributions(users_and_contributions, config, session)
+    for login, contribution, problem in problems:
+        click.echo(
+            f"{login}: {contribution.type} ({contribution.link_type}): {problem}"
+        )
+    if problems:
+        message = f"{len(problems)} claimed contributions couldn't be verified"
+        raise click.ClickException(message)
+
+
 if __name__ == "__main__":
     cli()
@@ -54,3 +54,4 @@ class GitHubApiError(Exception):
         super().__init__(
             f"{response.status_code} {response.text} when requesting {response.url}"
         )
+        self.status_code = response.status_code
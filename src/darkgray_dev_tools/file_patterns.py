@@ -0,0 +1,213 @@
+"""Expand glob keys of pattern files, and prefilter files by literal pattern prefixes.
+
+Keys in ``release_tools/bump-version-patterns.yaml`` may be glob patterns like
+``docs/**/*.rst``. Those are expanded by walking only the directory tree below the
+literal part of the glob.
+
+Before running regular expressions on a file, its raw bytes are searched for the literal
+prefix of each pattern template, so files which can't match aren't decoded at all.
+
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+GLOB_CHARS_RE = re.compile(r"[*?\[]")
+REGEX_SPECIAL_CHARS = set(".^$*+?{}[]()|\\")
+QUANTIFIER_RE = re.compile(r"[*?]|\{\d")
+
+
+def is_glob(path: str) -> bool:
+    """Return `True` if the path is a glob pattern.
+
+    >>> is_glob("docs/**/*.rst"), is_glob("README.rst")
+    (True, False)
+
+    """
+    return bool(GLOB_CHARS_RE.search(path))
+
+
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """Convert a glob pattern to a regular expression for matching relative paths.
+
+    ``**/`` matches any number of directories, ``*`` and ``?`` match within one path
+    component, and ``[...]`` matches a character class.
+
+    >>> bool(glob_to_regex("docs/**/*.rst").match("docs/a/b/index.rst"))
+    True
+    >>> bool(glob_to_regex("docs/*.rst").match("docs/a/index.rst"))
+    False
+
+    :param pattern: The glob pattern
+    :return: The compiled regular expression
+
+    """
+    parts = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if pattern.startswith("**/", position):
+            parts.append("(?:[^/]+/)*")
+            position += 3
+            continue
+        if pattern.startswith("**", position):
+            parts.append(".*")
+            position += 2
+            continue
+        end = pattern.find("]", position + 2)
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[" and end != -1:
+            characters = pattern[position + 1 : end].replace("\\", "\\\\")
+            if characters.startswith("!"):
+                characters = f"^{characters[1:]}"
+            parts.append(f"[{characters}]")
+            position = end
+        else:
+            parts.append(re.escape(char))
+        position += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def expand_glob(pattern: str) -> list[str]:
+    """List files matching a glob pattern, relative to the current directory.
+
+    Only the directory tree below the literal leading directories of the pattern is
+    walked. Without ``**``, directories deeper than the pattern aren't entered either.
+    Hidden directories are skipped.
+
+    :param pattern: The glob pattern, with ``/`` as the directory separator
+    :return: The matching file paths, sorted
+
+    """
+    regex = glob_to_regex(pattern)
+    first_glob_char = GLOB_CHARS_RE.search(pattern)
+    literal_part = pattern[: first_glob_char.start()] if first_glob_char else pattern
+    base = literal_part.rpartition("/")[0]
+    rest = pattern[len(base) + 1 :] if base else pattern
+    max_depth = None if "**" in rest else rest.count("/")
+    root = base or os.curdir
+    matches = []
+    for directory, subdirectories, files in os.walk(root):
+        relative = os.path.relpath(directory, root)
+        depth = 0 if relative == os.curdir else relative.count(os.sep) + 1
+        if max_depth is not None and depth >= max_depth:
+            subdirectories.clear()
+        else:
+            subdirectories[:] = [name for name in subdirectories if name[0] != "."]
+        for name in files:
+            path = os.path.normpath(f"{directory}{os.sep}{name}").replace(os.sep, "/")
+            if regex.match(path):
+                matches.append(path)
+    return sorted(matches)
+
+
+def expand_glob_keys(
+    pattern_templates_for_files: dict[str, list[str]],
+) -> dict[str, dict[str, str | None]]:
+    """Expand glob keys into the files they match, and combine templates for each file.
+
+    >>> expand_glob_keys({"README.rst": ["v{old_version->new_version}"]})
+    {'README.rst': {'v{old_version->new_version}': None}}
+
+    :param pattern_templates_for_files: Pattern templates keyed by file paths or globs
+    :return: For each file, its pattern templates, each with the glob key it came from,
+             or `None` if the file was listed explicitly
+
+    """
+    templates_for_files: dict[str, dict[str, str | None]] = {}
+    for key, pattern_templates in pattern_templates_for_files.items():
+        if is_glob(key):
+            for path in expand_glob(key):
+                templates = templates_for_files.setdefault(path, {})
+                for template in pattern_templates:
+                    templates.setdefault(template, key)
+        else:
+            templates = templates_for_files.setdefault(key, {})
+            templates.update(dict.fromkeys(pattern_templates))
+    return templates_for_files
+
+
+def literal_prefix(pattern_template: str) -> str:
+    r"""Return the literal text any match of a pattern template must start with.
+
+    The prefix ends before the first regular expression construct, or before a
+    character which a quantifier makes optional. An empty string is returned for
+    templates with alternations, since they have no single literal prefix.
+
+    >>> literal_prefix(r'^__version__ *= *"{old_version->new_version}"')
+    '__version__'
+    >>> literal_prefix(r"compare/v{old_version->new_version}\.\.\.HEAD")
+    'compare/v'
+    >>> literal_prefix(r"a|b")
+    ''
+
+    :param pattern_template: The regular expression pattern template
+    :return: The literal prefix, possibly empty
+
+    """
+    if re.search(r"(?<!\\)(?:\\\\)*\|", pattern_template):
+        return ""
+    prefix = []
+    position = 1 if pattern_template.startswith("^") else 0
+    while position < len(pattern_template):
+        char = pattern_template[position]
+        if char == "\\":
+            escaped = pattern_template[position + 1 : position + 2]
+            if not escaped or escaped.isalnum():
+                break
+            char, step = escaped, 2
+        elif char in REGEX_SPECIAL_CHARS:
+            break
+        else:
+            step = 1
+        position += step
+        if QUANTIFIER_RE.match(pattern_template, position):
+            break
+        prefix.append(char)
+        if pattern_template.startswith("+", position):
+            break
+    return "".join(prefix)
+
+
+def find_literal_prefixes(path: Path, prefixes: dict[str, bytes]) -> set[str]:
+    """Find which literal prefixes appear in the raw bytes of a file.
+
+    The file is memory mapped, so it isn't read into memory or decoded.
+
+    :param path: The file to search in
+    :param prefixes: Encoded literal prefixes, keyed by the pattern templates
+    :return: The pattern templates whose literal prefixes appear in the file
+
+    """
+    with path.open("rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return {template for template, prefix in prefixes.items() if not prefix}
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return {
+                template
+                for template, prefix in prefixes.items()
+                if content.find(prefix) != -1
+            }
+
+
+def encode_prefixes(pattern_templates: Iterable[str]) -> dict[str, bytes]:
+    """Return the UTF-8 encoded literal prefix for each pattern template.
+
+    >>> encode_prefixes(["v{old_version->new_version}"])
+    {'v{old_version->new_version}': b'v'}
+
+    """
+    return {
+        template: literal_prefix(template).encode("utf-8")
+        for template in pattern_templates
+    }
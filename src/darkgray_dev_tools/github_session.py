@@ -0,0 +1,229 @@
+"""The client for the GitHub REST and GraphQL APIs used by all commands.
+
+Each command creates one `GitHubSession` and passes it to everything which talks to
+GitHub, so all requests of a command share one pool of kept-alive connections. The
+session
+
+- limits the number of connections to each host, and makes threads wait for a free
+  connection instead of opening more,
+- retries requests on connection errors and on transient server errors,
+- paces requests and adapts their concurrency to the GitHub rate limits, and waits for
+  the rate limit to reset instead of failing, using `RateLimitScheduler`,
+- accepts gzip compressed responses, which `requests` decompresses transparently,
+- caches responses using `requests_cache`,
+- records request metrics for the ``--metrics`` option, and
+- raises `GitHubApiError` on unsuccessful responses.
+
+This module imports `requests_cache`, which is slow to import. Commands import it only
+when they are about to make requests, so their ``--help`` stays fast.
+
+"""
+
+# pylint: disable=too-few-public-methods,abstract-method
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Iterator, Mapping, MutableMapping
+
+import click
+from requests.adapters import HTTPAdapter
+from requests_cache.session import CachedSession
+from urllib3.util.retry import Retry
+
+from darkgray_dev_tools.exceptions import GitHubApiError, GitHubApiNotFoundError
+from darkgray_dev_tools.metrics import endpoint_name, get_metrics
+from darkgray_dev_tools.rate_limit import (
+    SECONDARY_LIMIT_WAIT,
+    RateLimitScheduler,
+    api_resource,
+)
+
+if TYPE_CHECKING:
+    from requests.models import Response
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+REQUEST_TIMEOUT = 10
+"""Seconds to wait for a connection or a response, unless a request says otherwise."""
+
+POOL_MAXSIZE = 8
+"""The maximum number of kept-alive connections to each host."""
+
+RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    ],
+    allowed_methods=None,
+    raise_on_status=False,
+)
+"""Retry policy for all requests, including GraphQL queries sent using ``POST``."""
+
+RATE_LIMIT_RETRIES = 5
+"""How many times to wait and retry a request which was rate limited."""
+
+
+def _error_message(response: Response) -> str:
+    """Return the error message in a GitHub API error response, or an empty string."""
+    if response.status_code == HTTPStatus.OK:
+        return ""
+    try:
+        return str(response.json().get("message", ""))
+    except ValueError:
+        return ""
+
+
+def _record_metrics(
+    method: str, url: str, response: Response, latency: float, *, from_cache: bool
+) -> None:
+    """Record the size, latency and rate limit points of a response."""
+    metrics = get_metrics()
+    metrics.record_request(
+        endpoint_name(method, url),
+        status_code=response.status_code,
+        size=len(response.content),
+        latency=latency,
+        from_cache=from_cache,
+    )
+    if not from_cache:
+        metrics.record_rate_limit(response.headers)
+
+
+class GitHubSession(CachedSession):
+    """Caching HTTP request session with useful defaults.
+
+    - GitHub authorization header generated from a given token, unless the token is
+      `None`
+    - Accept HTTP paths and prefix them with the GitHub API server name
+    - Keep-alive connection pooling with a per-host limit, retries and a default
+      timeout
+    - Rate limit aware pacing and concurrency, shared by all threads using the session
+
+    """
+
+    def __init__(  # type: ignore[misc]
+        self, token: str | None, *args: Any, **kwargs: Any  # noqa: ANN401
+    ) -> None:
+        """Create the cached requests session with the given GitHub token."""
+        super().__init__(*args, **kwargs)
+        self.token = token
+        adapter = HTTPAdapter(
+            pool_maxsize=POOL_MAXSIZE, pool_block=True, max_retries=RETRY
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.scheduler = RateLimitScheduler(POOL_MAXSIZE)
+
+    def request(  # type: ignore[override,misc]  # pylint: disable=arguments-differ
+        self,
+        method: str,
+        url: str,
+        headers: MutableMapping[str, str] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Response:
+        """Query GitHub API with authorization, caching and host auto-fill-in.
+
+        Complete the request information with the GitHub API HTTP scheme and hostname,
+        and add a GitHub authorization header. Serve requests from the cache if they
+        match. Wait and retry if the request is rate limited.
+
+        :param method: method for the new `Request` object.
+        :param url: URL for the new `Request` object.
+        :param headers: (optional) dictionary of HTTP Headers to send with the
+                        `Request`.
+        :return: The response object
+
+        """
+        authorization = {"Authorization": f"token {self.token}"} if self.token else {}
+        hdrs = {**authorization, **(headers or {})}
+        if url.startswith("/"):
+            url = f"{GITHUB_API_URL}{url}"
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        resource = api_resource(url)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self.scheduler.acquire(resource)
+            start = perf_counter()
+            try:
+                response = super().request(method, url, headers=hdrs, **kwargs)
+            finally:
+                self.scheduler.release()
+            from_cache = bool(getattr(response, "from_cache", False))
+            latency = perf_counter() - start
+            _record_metrics(method, url, response, latency, from_cache=from_cache)
+            wait = self.scheduler.update(
+                resource,
+                response.status_code,
+                response.headers,
+                _error_message(response),
+                from_cache=from_cache,
+            )
+            if wait is None or attempt == RATE_LIMIT_RETRIES:
+                break
+            click.echo(
+                f"GitHub API rate limit reached, waiting {wait:.0f} seconds", err=True
+            )
+        if (
+            response.status_code == HTTPStatus.NOT_FOUND
+            and response.json()["message"] == "Not Found"
+        ):
+            raise GitHubApiNotFoundError
+        if response.status_code != HTTPStatus.OK:
+            raise GitHubApiError(response)
+        return response
+
+    def iter_pages(
+        self, url: str, params: Mapping[str, str | int] | None = None
+    ) -> Iterator[Response]:
+        """Fetch all pages of a paginated REST API response.
+
+        The next page is only requested when the previous one has been consumed, so
+        callers can stop paging early.
+
+        :param url: The URL or API path of the first page
+        :param params: Query parameters for the first page. The URLs of later pages
+                       include them already.
+        :return: The response for each page
+
+        """
+        response = self.get(url, params=params)
+        while True:
+            yield response
+            next_url = response.links.get("next", {}).get("url")
+            if not next_url:
+                return
+            response = self.get(next_url)
+
+    def graphql(self, query: str, variables: Mapping[str, object]) -> Response:
+        """Run a GraphQL query.
+
+        :param query: The GraphQL query
+        :param variables: Values for the variables in the query
+        :return: The response, with the result of the query in ``["data"]``
+        :raises GitHubApiError: if the response reports errors in the query, or if the
+                                query stays rate limited after several retries
+
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            response = self.post(
+                GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}
+            )
+            errors = response.json().get("errors")
+            if (
+                not errors
+                or any(error.get("type") != "RATE_LIMITED" for error in errors)
+                or attempt == RATE_LIMIT_RETRIES
+            ):
+                break
+            # GitHub may report an exhausted GraphQL budget as an error in a successful
+            # response. If the rate limit headers didn't reveal when the budget is
+            # reset, pause as after a secondary rate limit.
+            if self.scheduler.delay("graphql") <= 0:
+                self.scheduler.pause(SECONDARY_LIMIT_WAIT)
+        if errors:
+            raise GitHubApiError(response)
+        return response
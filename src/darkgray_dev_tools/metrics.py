@@ -0,0 +1,268 @@
+"""Collect performance metrics of a command run, and write them as JSON.
+
+All commands accept a ``--metrics FILE`` option. When it is given, the following are
+written into the file as a JSON object once the command finishes:
+
+- the wall time of the whole run, and of each phase (``fetch``, ``join``, ``render``
+  and ``write``) marked in the command using `phase`,
+- for each endpoint, the number of requests, errors, cache hits and misses, bytes
+  transferred and a histogram of latencies, and
+- the number of GitHub API rate limit points used for each rate limit resource.
+
+Phase times are summed up over all threads, so phases run concurrently in several
+threads can add up to more than the wall time of the run.
+
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from contextlib import AbstractContextManager, ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Iterator, Mapping
+from urllib.parse import urlsplit
+
+import click
+
+if TYPE_CHECKING:
+    from click.decorators import FC
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Upper bounds of the latency histogram buckets in seconds."""
+
+ENDPOINT_PATTERNS = (
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/(users|orgs)/[^/]+"), r"/\1/{name}"),
+    (re.compile(r"^/simple/[^/]+"), "/simple/{project}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{number}"),
+)
+"""Substitutions which turn request paths into endpoint names."""
+
+
+def endpoint_name(method: str, url: str) -> str:
+    """Return the name under which metrics of requests to a URL are collected.
+
+    Owner, repository, user and project names and numeric identifiers in the path are
+    replaced with placeholders, and the query string is dropped.
+
+    >>> endpoint_name("GET", "https://api.github.com/repos/o/r/milestones/5?state=all")
+    'GET api.github.com/repos/{owner}/{repo}/milestones/{number}'
+    >>> endpoint_name("GET", "https://pypi.org/simple/click/")
+    'GET pypi.org/simple/{project}/'
+
+    :param method: The HTTP method of the request
+    :param url: The URL of the request
+    :return: The method, host name and path of the endpoint
+
+    """
+    parts = urlsplit(url)
+    path = parts.path
+    for pattern, replacement in ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return f"{method} {parts.netloc}{path}"
+
+
+@dataclass
+class EndpointMetrics:
+    """Request counts, transferred bytes and latencies of one endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    bytes: int = 0
+    latency_seconds: float = 0.0
+    latency_histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def to_dict(self) -> dict[str, object]:
+        """Return the metrics as a JSON compatible dictionary."""
+        bounds = [*map(str, LATENCY_BUCKETS), "inf"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.requests - self.cache_hits,
+            "bytes": self.bytes,
+            "latency_seconds": round(self.latency_seconds, 6),
+            "latency_histogram": dict(zip(bounds, self.latency_histogram)),
+        }
+
+
+class Metrics:
+    """Thread safe collector of performance metrics for one command run."""
+
+    def __init__(self, clock: Callable[[], float] = perf_counter) -> None:
+        """Start collecting metrics, counting the wall time from now.
+
+        :param clock: The function for measuring elapsed time in seconds
+
+        """
+        self.clock = clock
+        self.started = clock()
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self.phases: dict[str, tuple[float, int]] = {}
+        self.rate_limit_used: dict[tuple[str, str], tuple[int, int]] = {}
+        self.lock = Lock()
+
+    def record_request(
+        self,
+        endpoint: str,
+        *,
+        status_code: int,
+        size: int,
+        latency: float,
+        from_cache: bool,
+    ) -> None:
+        """Record a completed request.
+
+        :param endpoint: The endpoint name, see `endpoint_name`
+        :param status_code: The HTTP status code of the response
+        :param size: The size of the response body in bytes
+        :param latency: The time taken by the request in seconds
+        :param from_cache: `True` if the response was served from a cache, or the
+                           server responded that the cached response is still valid
+
+        """
+        bucket = next(
+            (index for index, bound in enumerate(LATENCY_BUCKETS) if latency <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        with self.lock:
+            metrics = self.endpoints.setdefault(endpoint, EndpointMetrics())
+            metrics.requests += 1
+            metrics.errors += status_code >= 400  # noqa: PLR2004
+            metrics.cache_hits += from_cache
+            metrics.bytes += 0 if from_cache else size
+            metrics.latency_seconds += latency
+            metrics.latency_histogram[bucket] += 1
+
+    def record_rate_limit(self, headers: Mapping[str, str]) -> None:
+        """Record GitHub API rate limit points used, as reported in response headers.
+
+        For each rate limit window, the difference between the highest and lowest
+        ``X-RateLimit-Used`` values seen is counted, plus one point for the first
+        request seen in the window.
+
+        :param headers: The HTTP headers of a response which wasn't served from cache
+
+        """
+        used = headers.get("X-RateLimit-Used")
+        if used is None:
+            return
+        key = (
+            headers.get("X-RateLimit-Resource", "core"),
+            headers.get("X-RateLimit-Reset", ""),
+        )
+        with self.lock:
+            lowest, highest = self.rate_limit_used.get(key, (int(used), int(used)))
+            self.rate_limit_used[key] = min(lowest, int(used)), max(highest, int(used))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the wall time spent in a phase of the run.
+
+        :param name: The name of the phase, e.g. ``fetch``, ``join``, ``render`` or
+                     ``write``
+
+        """
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = self.clock() - start
+            with self.lock:
+                seconds, count = self.phases.get(name, (0.0, 0))
+                self.phases[name] = seconds + elapsed, count + 1
+
+    def to_dict(self) -> dict[str, object]:
+        """Return all collected metrics as a JSON compatible dictionary."""
+        with self.lock:
+            requests = sum(metrics.requests for metrics in self.endpoints.values())
+            cache_hits = sum(metrics.cache_hits for metrics in self.endpoints.values())
+            rate_limit_used: dict[str, int] = {}
+            for (resource, _), (lowest, highest) in self.rate_limit_used.items():
+                rate_limit_used[resource] = (
+                    rate_limit_used.get(resource, 0) + highest - lowest + 1
+                )
+            return {
+                "wall_time_seconds": round(self.clock() - self.started, 6),
+                "phases": {
+                    name: {"seconds": round(seconds, 6), "count": count}
+                    for name, (seconds, count) in self.phases.items()
+                },
+                "requests": requests,
+                "bytes": sum(metrics.bytes for metrics in self.endpoints.values()),
+                "cache_hits": cache_hits,
+                "cache_misses": requests - cache_hits,
+                "cache_hit_ratio": cache_hits / requests if requests else None,
+                "endpoints": {
+                    endpoint: metrics.to_dict()
+                    for endpoint, metrics in sorted(self.endpoints.items())
+                },
+                "rate_limit_used": rate_limit_used,
+            }
+
+    def write(self, path: Path) -> None:
+        """Write the collected metrics into a JSON file.
+
+        :param path: The path of the file to write
+
+        """
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+
+_METRICS = Metrics()
+
+PHASE_HOOKS: list[Callable[[str], AbstractContextManager[None]]] = []
+"""Context managers to run around each phase in addition to measuring its time."""
+
+
+def get_metrics() -> Metrics:
+    """Return the metrics collector of the current run."""
+    return _METRICS
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Measure the wall time spent in a phase of the current run.
+
+    Context managers in `PHASE_HOOKS`, e.g. the profiler of the ``--profile`` option,
+    are also run around the phase.
+
+    :param name: The name of the phase, e.g. ``fetch``, ``join``, ``render`` or
+                 ``write``
+
+    """
+    with ExitStack() as stack:
+        stack.enter_context(_METRICS.phase(name))
+        for hook in PHASE_HOOKS:
+            stack.enter_context(hook(name))
+        yield
+
+
+def _start_metrics(
+    ctx: click.Context, _param: click.Parameter, path: Path | None
+) -> None:
+    """Restart metrics collection, and write the metrics when the command finishes."""
+    global _METRICS  # noqa: PLW0603  # pylint: disable=global-statement
+    if path is None:
+        return
+    metrics = _METRICS = Metrics()
+    ctx.call_on_close(lambda: metrics.write(path))
+
+
+def metrics_option(command: FC) -> FC:
+    """Add the ``--metrics FILE`` option to a click command."""
+    return click.option(
+        "--metrics",
+        type=click.Path(dir_okay=False, path_type=Path),
+        expose_value=False,
+        is_eager=True,
+        callback=_start_metrics,
+        help="Write performance metrics of the run into this JSON file",
+    )(command)
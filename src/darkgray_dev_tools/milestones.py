@@ -2,40 +2,161 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Literal, cast
 from urllib.parse import urlsplit
 from warnings import warn
 
-import requests
 from packaging.version import Version
 
 from darkgray_dev_tools.package_metadata import get_repo_url
 
+if TYPE_CHECKING:
+    from requests import Response
 
-def get_milestone_numbers(token: str | None) -> dict[Version, str]:
-    """Fetch milestone names and numbers from the GitHub API.
+    from darkgray_dev_tools.github_session import GitHubSession
+
+MilestoneState = Literal["open", "closed", "all"]
+
+
+def _milestone_pages(pages: Iterable[Response]) -> list[object]:
+    """Collect milestones from all pages of a paginated GitHub API response."""
+    milestones = []
+    for response in pages:
+        page = response.json()
+        if not isinstance(page, list):
+            message = f"Expected a JSON list from GitHub API, got {page}"
+            raise TypeError(message)
+        milestones.extend(page)
+    return milestones
+
+
+def get_milestone_titles(
+    token: str | None,
+    *,
+    state: MilestoneState = "open",
+    session: GitHubSession | None = None,
+    root: Path | None = None,
+) -> dict[str, str]:
+    """Fetch milestone titles and numbers from the GitHub API.
+
+    All pages of milestones are fetched, 100 milestones per page. Responses are cached,
+    and revalidated on each call using their ETags. Revalidated responses which haven't
+    changed don't count against the GitHub API rate limit.
 
     :param token: The GitHub access token to use, or `None` to use none
-    :return: Milestone names as version numbers, and corresponding milestone numbers
+    :param state: Fetch ``open``, ``closed`` or ``all`` milestones
+    :param session: The GitHub API session to use, or `None` to create one
+    :param root: The root directory of the repository checkout, or `None` for the
+                 current working directory
+    :return: Milestone titles and corresponding milestone numbers
     :raises TypeError: Raised on unexpected JSON response
 
     """
-    repo_url = urlsplit(get_repo_url())
-    milestones = requests.get(
-        f"https://api.github.com/repos{repo_url.path}/milestones",
-        headers={"Authorization": f"Bearer {token}"} if token else {},
-        timeout=10,
-    ).json()
-    if not isinstance(milestones, list):
-        message = f"Expected a JSON list from GitHub API, got {milestones}"
-        raise TypeError(message)
-    # Extract milestone numbers from the milestone titles. Titles are expected to be
-    # like "Darker x.y.z" or "Darker x.y.z - additional comment".
+    if session is None:
+        from requests_cache import EXPIRE_IMMEDIATELY  # noqa: PLC0415
+
+        from darkgray_dev_tools.github_session import GitHubSession  # noqa: PLC0415
+
+        session = GitHubSession(token, expire_after=EXPIRE_IMMEDIATELY)
+    repo_url = urlsplit(get_repo_url(root))
+    milestones = _milestone_pages(
+        session.iter_pages(
+            f"/repos{repo_url.path}/milestones",
+            params={"state": state, "per_page": 100},
+        )
+    )
     return {
-        Version(m["title"].split(" - ")[0].split()[-1]): str(m["number"])
-        for m in milestones
+        m["title"]: str(m["number"]) for m in cast("list[dict[str, str]]", milestones)
     }
 
 
+def parse_milestone_titles(milestone_titles: dict[str, str]) -> dict[Version, str]:
+    """Extract version numbers from milestone titles.
+
+    Titles are expected to be like "Darker x.y.z" or "Darker x.y.z - additional
+    comment".
+
+    >>> parse_milestone_titles({"Darker 1.2.0 - big changes": "12"})
+    {<Version('1.2.0')>: '12'}
+
+    :param milestone_titles: Milestone titles and corresponding milestone numbers
+    :return: Milestone names as version numbers, and corresponding milestone numbers
+
+    """
+    return {
+        Version(title.split(" - ")[0].split()[-1]): number
+        for title, number in milestone_titles.items()
+    }
+
+
+def get_milestone_numbers(
+    token: str | None,
+    *,
+    state: MilestoneState = "open",
+    session: GitHubSession | None = None,
+    root: Path | None = None,
+) -> dict[Version, str]:
+    """Fetch milestone names and numbers from the GitHub API.
+
+    See `get_milestone_titles` for details.
+
+    :param token: The GitHub access token to use, or `None` to use none
+    :param state: Fetch ``open``, ``closed`` or ``all`` milestones
+    :param session: The GitHub API session to use, or `None` to create one
+    :param root: The root directory of the repository checkout, or `None` for the
+                 current working directory
+    :return: Milestone names as version numbers, and corresponding milestone numbers
+    :raises TypeError: Raised on unexpected JSON response
+
+    """
+    return parse_milestone_titles(
+        get_milestone_titles(token, state=state, session=session, root=root)
+    )
+
+
+MILESTONE_SNAPSHOT_PATH = Path("release_tools/milestones.yaml")
+MILESTONE_SNAPSHOT_HEADER = """\
+Snapshot of open GitHub milestone titles and numbers, used by `darkgray_bump_version`
+for dry runs and offline bumps. Refresh using:
+  darkgray_bump_version refresh-milestones --token=<github_token>
+"""
+
+
+def save_milestone_snapshot(path: Path, milestone_titles: dict[str, str]) -> None:
+    """Write milestone titles and numbers into a YAML snapshot file.
+
+    :param path: The path of the snapshot file
+    :param milestone_titles: Milestone titles and corresponding milestone numbers
+
+    """
+    from ruamel.yaml import YAML  # noqa: PLC0415
+    from ruamel.yaml.comments import CommentedMap  # noqa: PLC0415
+
+    snapshot = CommentedMap(
+        (title, int(number)) for title, number in sorted(milestone_titles.items())
+    )
+    snapshot.yaml_set_start_comment(MILESTONE_SNAPSHOT_HEADER)
+    with path.open("w", encoding="utf-8") as snapshot_file:
+        YAML().dump(snapshot, snapshot_file)
+
+
+def load_milestone_snapshot(path: Path) -> dict[Version, str]:
+    """Read milestone version numbers and milestone numbers from a snapshot file.
+
+    :param path: The path of the snapshot file
+    :return: Milestone names as version numbers, and corresponding milestone numbers
+
+    """
+    from ruamel.yaml import YAML  # noqa: PLC0415
+
+    with path.open(encoding="utf-8") as snapshot_file:
+        snapshot = YAML(typ="safe", pure=True).load(snapshot_file) or {}
+    return parse_milestone_titles(
+        {title: str(number) for title, number in snapshot.items()}
+    )
+
+
 def get_next_milestone_version(
     version: Version, milestone_numbers: dict[Version, str], *, dry_run: bool
 ) -> Version:
@@ -0,0 +1,381 @@
+"""Find the latest versions of packages in a package index or a wheelhouse.
+
+Versions are looked up from one of:
+
+- a remote simple repository API, e.g. ``https://pypi.org/simple``, using the PEP 691
+  JSON format if the server supports it, or PEP 503 HTML otherwise
+- a local simple index directory with a ``<normalized-name>/index.html`` file for each
+  package, given as a path or a ``file:`` URL
+- a wheelhouse, i.e. a flat directory of wheels and sdists
+
+Latest versions fetched from remote indexes are cached on disk together with the ETags
+of the responses, so unchanged packages are revalidated without transferring or parsing
+their release history again.
+
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from html.parser import HTMLParser
+from http import HTTPStatus
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, TypedDict, cast
+from urllib.error import HTTPError
+from urllib.parse import unquote, urlsplit
+
+import click
+from packaging.utils import (
+    InvalidSdistFilename,
+    InvalidWheelFilename,
+    canonicalize_name,
+    parse_sdist_filename,
+    parse_wheel_filename,
+)
+from packaging.version import InvalidVersion, Version
+
+from darkgray_dev_tools.metrics import endpoint_name, get_metrics
+
+PYPI_SIMPLE_URL = "https://pypi.org/simple"
+SIMPLE_JSON_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+SIMPLE_ACCEPT = f"{SIMPLE_JSON_CONTENT_TYPE}, text/html;q=0.01"
+PYPI_CACHE_PATH = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "darkgray_dev_tools"
+    / "pypi_versions.json"
+)
+PYPI_CONCURRENCY = 16
+"""The number of package index lookups to run concurrently."""
+
+
+class SimpleFile(TypedDict, total=False):
+    """A file in a PEP 691 JSON Simple API project response."""
+
+    filename: str
+    yanked: bool | str
+
+
+class SimpleProject(TypedDict, total=False):
+    """A PEP 691 JSON Simple API project response, with PEP 700 ``versions``."""
+
+    versions: list[str]
+    files: list[SimpleFile]
+
+
+@dataclass(frozen=True)
+class CachedVersion:
+    """The latest version of a package, and the ETag of the response it came from."""
+
+    etag: str
+    latest_version: str
+
+
+def load_version_cache(path: Path) -> dict[str, CachedVersion]:
+    """Read cached latest versions of packages from a JSON file.
+
+    :param path: The path of the cache file
+    :return: The cached latest version for each project URL, or an empty dictionary if
+             the file doesn't exist or is invalid
+
+    """
+    try:
+        content = json.loads(path.read_text(encoding="utf-8"))
+        return {url: CachedVersion(**entry) for url, entry in content.items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+
+
+def save_version_cache(path: Path, cache: dict[str, CachedVersion]) -> None:
+    """Write cached latest versions of packages into a JSON file.
+
+    If the file can't be written, a warning is printed and the cache is left as is.
+
+    :param path: The path of the cache file
+    :param cache: The cached latest version for each project URL
+
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({url: asdict(entry) for url, entry in sorted(cache.items())}),
+            encoding="utf-8",
+        )
+    except OSError as exc:
+        click.echo(f"Warning: couldn't write the version cache {path}: {exc}", err=True)
+
+
+def _parse_filename(filename: str) -> tuple[str, Version] | None:
+    """Return the project name and version of a wheel or sdist file.
+
+    `None` is returned for other files.
+
+    """
+    try:
+        if filename.endswith(".whl"):
+            name, version, _, _ = parse_wheel_filename(filename)
+        else:
+            name, version = parse_sdist_filename(filename)
+    except (InvalidWheelFilename, InvalidSdistFilename, InvalidVersion):
+        return None
+    return name, version
+
+
+def _file_version(filename: str) -> Version | None:
+    """Return the version of a wheel or sdist file, or `None` for other files."""
+    parsed = _parse_filename(filename)
+    return parsed[1] if parsed else None
+
+
+def _parse_version(version_string: str) -> Version | None:
+    """Parse a version string, or return `None` if it isn't a valid version."""
+    try:
+        return Version(version_string)
+    except InvalidVersion:
+        return None
+
+
+def find_latest_release(project: SimpleProject) -> Version:
+    """Find the highest final release in a PEP 691 JSON Simple API project response.
+
+    Pre-releases and development releases are skipped. So are yanked releases, i.e.
+    versions with no files which haven't been yanked. File names are only parsed if any
+    files have been yanked, or if the response has no PEP 700 ``versions`` list.
+
+    >>> find_latest_release(
+    ...     {
+    ...         "versions": ["1.0", "1.1", "2.0b1"],
+    ...         "files": [
+    ...             {"filename": "pkg-1.0.tar.gz", "yanked": False},
+    ...             {"filename": "pkg-1.1.tar.gz", "yanked": "broken"},
+    ...         ],
+    ...     }
+    ... )
+    <Version('1.0')>
+
+    :param project: The JSON response for the project
+    :return: The highest version which isn't a pre-release or yanked
+    :raises ValueError: if there is no such version
+
+    """
+    files = project.get("files", [])
+    yanked_files = [file for file in files if file.get("yanked")]
+    if "versions" in project:
+        versions = {_parse_version(version) for version in project["versions"]}
+    else:
+        versions = {_file_version(file["filename"]) for file in files}
+    versions.discard(None)
+    available = None
+    if yanked_files:
+        available = {
+            _file_version(file["filename"])
+            for file in files
+            if not file.get("yanked")
+        }
+    for version in sorted(cast("set[Version]", versions), reverse=True):
+        if version.is_prerelease:
+            continue
+        if available is None or version in available:
+            return version
+    message = "No final releases which haven't been yanked"
+    raise ValueError(message)
+
+
+class _SimpleHtmlParser(HTMLParser):
+    """Collect file names and yanked flags from links in a PEP 503 project page."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.files: list[SimpleFile] = []
+        self._link: SimpleFile | None = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        """Start collecting a link."""
+        if tag != "a":
+            return
+        attributes = dict(attrs)
+        href = urlsplit(attributes.get("href") or "").path
+        self._link = {"filename": unquote(href.rpartition("/")[2])}
+        if "data-yanked" in attributes:
+            self._link["yanked"] = attributes["data-yanked"] or True
+        self._text = []
+
+    def handle_data(self, data: str) -> None:
+        """Collect the text of a link, which is the file name."""
+        if self._link is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        """Finish collecting a link."""
+        if tag != "a" or self._link is None:
+            return
+        text = "".join(self._text).strip()
+        if text:
+            self._link["filename"] = text
+        self.files.append(self._link)
+        self._link = None
+
+
+def parse_simple_html(html: str) -> SimpleProject:
+    """Convert a PEP 503 HTML project page to the PEP 691 JSON structure.
+
+    >>> parse_simple_html(
+    ...     '<a href="../../p/pkg-1.0.tar.gz#sha256=0">pkg-1.0.tar.gz</a>'
+    ...     '<a href="pkg-1.1.tar.gz" data-yanked="">pkg-1.1.tar.gz</a>'
+    ... )["files"]
+    [{'filename': 'pkg-1.0.tar.gz'}, {'filename': 'pkg-1.1.tar.gz', 'yanked': True}]
+
+    :param html: The HTML project page
+    :return: The files linked to on the page
+
+    """
+    parser = _SimpleHtmlParser()
+    parser.feed(html)
+    parser.close()
+    return {"files": parser.files}
+
+
+def local_index_path(index_url: str) -> Path | None:
+    """Return the directory of a local simple index, or `None` for remote indexes.
+
+    >>> local_index_path("https://pypi.org/simple") is None
+    True
+    >>> local_index_path("file:///srv/simple").as_posix()
+    '/srv/simple'
+
+    :param index_url: The URL of the index, or a path to a local index directory
+    :return: The path of the local index directory
+
+    """
+    scheme = urlsplit(index_url).scheme
+    if scheme == "file":
+        return Path(urllib.request.url2pathname(urlsplit(index_url).path))
+    if len(scheme) > 1:
+        return None
+    return Path(index_url)
+
+
+def _record_request(url: str, status_code: int, size: int, latency: float) -> None:
+    """Record the metrics of a request to an index, counting 304 as a cache hit."""
+    get_metrics().record_request(
+        endpoint_name("GET", url),
+        status_code=status_code,
+        size=size,
+        latency=latency,
+        from_cache=status_code == HTTPStatus.NOT_MODIFIED,
+    )
+
+
+def get_latest_version(
+    name: str,
+    cached: CachedVersion | None = None,
+    index_url: str = PYPI_SIMPLE_URL,
+) -> CachedVersion:
+    """Fetch the latest version of a package from a simple repository index.
+
+    For remote indexes, the PEP 691 JSON format is requested, and PEP 503 HTML is
+    accepted as a fallback. If the cached version is given, the request is made
+    conditional on its ETag. If the package hasn't changed, the server responds with no
+    content, and the cached version is returned without parsing anything.
+
+    :param name: The name of the package
+    :param cached: The previously cached latest version, or `None`
+    :param index_url: The URL of the index, or a path to a local index directory
+    :return: The highest final release in the index, and the ETag of the response, or
+             an empty ETag for local indexes
+    :raises LookupError: if a local index has no page for the package
+
+    """
+    local_path = local_index_path(index_url)
+    if local_path:
+        try:
+            html = (local_path / canonicalize_name(name) / "index.html").read_text(
+                encoding="utf-8"
+            )
+        except FileNotFoundError as exc:
+            message = f"No files for {canonicalize_name(name)} in {local_path}"
+            raise LookupError(message) from exc
+        return CachedVersion("", str(find_latest_release(parse_simple_html(html))))
+    headers = {"Accept": SIMPLE_ACCEPT}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    url = f"{index_url.rstrip('/')}/{canonicalize_name(name)}/"
+    request = urllib.request.Request(url, headers=headers)  # noqa: S310
+    start = perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:  # noqa: S310
+            body = response.read()
+            content_type = response.headers.get("Content-Type") or ""
+            etag = response.headers.get("ETag") or ""
+    except HTTPError as exc:
+        _record_request(url, exc.code, 0, perf_counter() - start)
+        if cached and exc.code == HTTPStatus.NOT_MODIFIED:
+            return cached
+        raise
+    _record_request(url, HTTPStatus.OK, len(body), perf_counter() - start)
+    content = body.decode()
+    project = (
+        cast("SimpleProject", json.loads(content))
+        if "json" in content_type
+        else parse_simple_html(content)
+    )
+    return CachedVersion(etag, str(find_latest_release(project)))
+
+
+def get_latest_versions(
+    names: list[str],
+    cache: dict[str, CachedVersion],
+    index_url: str = PYPI_SIMPLE_URL,
+) -> list[Version]:
+    """Fetch the latest versions of packages from a simple index concurrently.
+
+    :param names: The names of the packages
+    :param cache: Cached latest versions keyed by project URLs. Updated with versions
+                  fetched from remote indexes.
+    :param index_url: The URL of the index, or a path to a local index directory
+    :return: The highest final release of each package, in the same order
+
+    """
+    keys = [f"{index_url.rstrip('/')}/{canonicalize_name(name)}/" for name in names]
+    cached = [cache.get(key) for key in keys]
+    if len(names) == 1:
+        results = [get_latest_version(names[0], cached[0], index_url)]
+    else:
+        with ThreadPoolExecutor(max_workers=PYPI_CONCURRENCY) as executor:
+            results = list(
+                executor.map(
+                    get_latest_version, names, cached, [index_url] * len(names)
+                )
+            )
+    cache.update((key, result) for key, result in zip(keys, results) if result.etag)
+    return [Version(result.latest_version) for result in results]
+
+
+def get_wheelhouse_versions(directory: Path, names: Iterable[str]) -> list[Version]:
+    """Find the latest versions of packages in a flat directory of wheels and sdists.
+
+    The directory is listed once, and files of other packages are ignored.
+
+    :param directory: The wheelhouse directory
+    :param names: The names of the packages
+    :return: The highest final release of each package, in the same order
+    :raises LookupError: if a package has no files in the wheelhouse
+
+    """
+    wanted = [canonicalize_name(name) for name in names]
+    files: dict[str, list[SimpleFile]] = {name: [] for name in wanted}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            parsed = _parse_filename(entry.name)
+            if parsed and parsed[0] in files:
+                files[parsed[0]].append({"filename": entry.name})
+    for name in wanted:
+        if not files[name]:
+            message = f"No files for {name} in {directory}"
+            raise LookupError(message)
+    return [find_latest_release({"files": files[name]}) for name in wanted]
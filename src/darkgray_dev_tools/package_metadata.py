@@ -1,9 +1,14 @@
 """Module for getting metadata about a package."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 from urllib.parse import urlsplit
 
-from pyproject_parser import PyProject
-from setuptools.config import setupcfg
+from darkgray_dev_tools.project_context import get_project_context
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 def is_valid_github_repo_url(url: str) -> bool:
@@ -24,19 +29,25 @@ def is_valid_github_repo_url(url: str) -> bool:
     return len(path_parts) == 2 and not path_parts[1].endswith(".git")  # noqa: PLR2004
 
 
-def get_repo_url() -> str:
+def get_repo_url(root: Path | None = None) -> str:
     """Get the URL of the repository from the setup configuration file.
 
+    The configuration files are parsed once per process, and ``setup.cfg`` is only
+    parsed if ``pyproject.toml`` has no GitHub repository URL.
+
     Supports repositories which have a ``pyproject.toml`` file, and use one of the
     following build systems:
     - `setuptools` with a ``setup.cfg`` file
     - PEP621 compliant systems (e.g. Flit) with ``project.Home`` in
       ``pyproject.toml`` pointing to the repository URL
 
+    :param root: The root directory of the repository checkout, or `None` for the
+                 current working directory
     :return: The URL of the repository
 
     """
-    pyproject = PyProject.load("pyproject.toml")
+    context = get_project_context(root)
+    pyproject = context.pyproject()
     if not pyproject.project:
         message = "No [project] information found in pyproject.toml"
         raise ValueError(message)
@@ -51,5 +62,4 @@ def get_repo_url() -> str:
     for url in url_candidates.values():
         if is_valid_github_repo_url(url):
             return url
-    metadata: dict[str, str] = setupcfg.read_configuration("setup.cfg")["metadata"]
-    return metadata["url"]
+    return str(context.setup_cfg()["metadata"]["url"])
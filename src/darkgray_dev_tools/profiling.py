@@ -0,0 +1,361 @@
+"""Profile the CPU time and memory allocations of a command run.
+
+All commands accept a ``--profile FILE`` option. When it is given, the run is profiled
+using `cProfile`, and the profile is written into the file once the command finishes,
+either
+
+- in the ``pstats`` format, for `pstats.Stats`, ``snakeviz`` or ``gprof2dot``, or
+- with ``--profile-format=speedscope``, as a speedscope_ JSON file with a separate
+  profile for each phase of the run (see `darkgray_dev_tools.metrics.phase`), and one
+  named ``run`` for everything outside phases.
+
+Worker threads are profiled too, and their calls are attributed to the phase in which
+the profiler was when they started. With ``--profile-memory``, `tracemalloc` is used to
+find the lines with the largest memory allocations in each phase. They are written into
+a text file next to the profile, with ``.memory.txt`` appended to its name.
+
+.. _speedscope: https://www.speedscope.app/
+
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+import click
+
+from darkgray_dev_tools.metrics import PHASE_HOOKS
+
+if TYPE_CHECKING:
+    import pstats
+    from types import FrameType
+
+    from click.decorators import FC
+
+    Function = tuple[str, int, str]
+    CallerStats = tuple[int, int, float, float]
+    FunctionStats = tuple[int, int, float, float, dict[Function, CallerStats]]
+
+PROFILE_FORMATS = ("pstats", "speedscope")
+
+RUN_PHASE = "run"
+"""The name of the profile for calls made outside of any phase."""
+
+TOP_ALLOCATIONS = 10
+"""The number of lines with the largest allocations to report for each phase."""
+
+MIN_SAMPLE_SECONDS = 1e-4
+"""Call stacks taking less time are left out of speedscope profiles."""
+
+MAX_STACK_DEPTH = 200
+"""Deeper call stacks are cut off in speedscope profiles."""
+
+
+class Profiler:
+    """Profile the current thread and threads started while profiling, by phase."""
+
+    def __init__(self, *, memory: bool) -> None:
+        """Create a profiler, but don't start it yet.
+
+        :param memory: `True` to also trace memory allocations in each phase
+
+        """
+        self.memory = memory
+        self.profiles: dict[str, list[cProfile.Profile]] = {}
+        self.allocations: dict[str, list[str]] = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.main_stack: list[tuple[str, cProfile.Profile | None]] = []
+
+    def _stack(self) -> list[tuple[str, cProfile.Profile | None]]:
+        """Return the phases entered in the current thread, and their profiles."""
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack  # type: ignore[no-any-return]
+
+    def _enable(self, phase: str) -> cProfile.Profile | None:
+        """Start a new profile for the current thread.
+
+        :param phase: The name of the phase to attribute the profiled calls to
+        :return: The profile, or `None` if another profiler is active. Since Python
+                 3.12, only one profiler can be active at a time in all threads.
+
+        """
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return None
+        with self.lock:
+            self.profiles.setdefault(phase, []).append(profile)
+        return profile
+
+    def _start_thread(self, _frame: FrameType, _event: str, _arg: object) -> None:
+        """Start profiling a new thread, attributing it to the current main phase."""
+        sys.setprofile(None)
+        phase = self.main_stack[-1][0] if self.main_stack else RUN_PHASE
+        self._stack().append((phase, self._enable(phase)))
+
+    def start(self) -> None:
+        """Start profiling the current thread and threads started from now on."""
+        if self.memory:
+            import tracemalloc  # noqa: PLC0415
+
+            tracemalloc.start()
+        self.local.stack = self.main_stack
+        self.main_stack.append((RUN_PHASE, self._enable(RUN_PHASE)))
+        threading.setprofile(self._start_thread)
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        threading.setprofile(None)
+        with self.lock:
+            for profiles in self.profiles.values():
+                for profile in profiles:
+                    profile.disable()
+        self.main_stack.clear()
+        if self.memory:
+            import tracemalloc  # noqa: PLC0415
+
+            tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Profile a phase of the run separately.
+
+        :param name: The name of the phase
+
+        """
+        stack = self._stack()
+        if stack and stack[-1][1]:
+            stack[-1][1].disable()
+        stack.append((name, self._enable(name)))
+        snapshot = self._take_snapshot()
+        try:
+            yield
+        finally:
+            _, profile = stack.pop()
+            if profile:
+                profile.disable()
+            if snapshot:
+                self._record_allocations(name, snapshot)
+            if stack and stack[-1][1]:
+                stack[-1][1].enable()
+
+    def _take_snapshot(self) -> object | None:
+        """Take a snapshot of memory allocations if tracing them."""
+        if not self.memory:
+            return None
+        import tracemalloc  # noqa: PLC0415
+
+        return tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+    def _record_allocations(self, phase: str, start: object) -> None:
+        """Record the lines which allocated most memory since the start of a phase."""
+        import tracemalloc  # noqa: PLC0415
+
+        if not tracemalloc.is_tracing() or not isinstance(start, tracemalloc.Snapshot):
+            return
+        differences = tracemalloc.take_snapshot().compare_to(start, "lineno")
+        with self.lock:
+            self.allocations.setdefault(phase, []).extend(
+                str(difference) for difference in differences[:TOP_ALLOCATIONS]
+            )
+
+    def stats(self, phase: str | None = None) -> pstats.Stats:
+        """Return the profiled statistics of one phase or the whole run.
+
+        :param phase: The name of the phase, or `None` for all phases
+        :return: The statistics of all profiles of the phase or the run combined
+
+        """
+        import pstats  # noqa: PLC0415
+
+        result = pstats.Stats()
+        for name, profiles in self.profiles.items():
+            if phase not in (None, name):
+                continue
+            for profile in profiles:
+                profile.create_stats()
+                # `pstats.Stats` refuses to add empty profiles
+                if profile.stats:
+                    result.add(profile)
+        return result
+
+    def write(self, path: Path, profile_format: str, name: str) -> None:
+        """Write the profile, and the memory allocation report if tracing memory.
+
+        :param path: The file to write the profile into
+        :param profile_format: One of `PROFILE_FORMATS`
+        :param name: The name of the profiled command
+
+        """
+        if profile_format == "speedscope":
+            stats_by_phase = {
+                phase: self.stats(phase).stats  # type: ignore[attr-defined]
+                for phase in self.profiles
+            }
+            speedscope = to_speedscope(stats_by_phase, name)
+            path.write_text(json.dumps(speedscope), encoding="utf-8")
+        else:
+            self.stats().dump_stats(path)
+        if self.memory:
+            memory_path = path.with_name(f"{path.name}.memory.txt")
+            memory_path.write_text(
+                "".join(
+                    f"# {phase}\n" + "".join(f"{line}\n" for line in lines) + "\n"
+                    for phase, lines in self.allocations.items()
+                ),
+                encoding="utf-8",
+            )
+
+
+def _iter_stacks(
+    stats: dict[Function, FunctionStats],
+) -> Iterator[tuple[tuple[Function, ...], float]]:
+    """Reconstruct call stacks and their self times from aggregated statistics.
+
+    `cProfile` only records time per caller and callee pair, so the time of a function
+    is divided between the call stacks leading to it in proportion to the time spent in
+    it by each caller.
+
+    :param stats: Statistics of each function in the `pstats.Stats` format
+    :return: Each call stack from a root function, and the time spent in the function at
+             the top of the stack
+
+    """
+    callees: dict[Function, list[tuple[Function, float]]] = {}
+    for function, (*_, callers) in stats.items():
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, []).append((function, caller_stats[3]))
+
+    def walk(
+        function: Function, stack: tuple[Function, ...], seconds: float
+    ) -> Iterator[tuple[tuple[Function, ...], float]]:
+        _, _, self_seconds, cumulative_seconds, _ = stats[function]
+        fraction = seconds / cumulative_seconds if cumulative_seconds else 0.0
+        stack = (*stack, function)
+        if self_seconds * fraction >= MIN_SAMPLE_SECONDS:
+            yield stack, self_seconds * fraction
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, callee_seconds in callees.get(function, []):
+            if callee not in stack and callee_seconds * fraction >= MIN_SAMPLE_SECONDS:
+                yield from walk(callee, stack, callee_seconds * fraction)
+
+    for function, (_, _, _, cumulative_seconds, callers) in stats.items():
+        if not callers:
+            yield from walk(function, (), cumulative_seconds)
+
+
+def to_speedscope(
+    stats_by_phase: dict[str, dict[Function, FunctionStats]], name: str
+) -> dict[str, object]:
+    """Convert profile statistics into the speedscope file format.
+
+    :param stats_by_phase: Statistics in the `pstats.Stats` format for each phase
+    :param name: The name of the profiled command
+    :return: A speedscope file with a sampled profile for each phase
+
+    """
+    frames: list[dict[str, object]] = []
+    frame_indices: dict[Function, int] = {}
+    profiles = []
+    for phase, stats in stats_by_phase.items():
+        samples = []
+        weights = []
+        for stack, seconds in _iter_stacks(stats):
+            for function in stack:
+                if function not in frame_indices:
+                    frame_indices[function] = len(frames)
+                    filename, line, function_name = function
+                    frames.append(
+                        {"name": function_name, "file": filename, "line": line}
+                    )
+            samples.append([frame_indices[function] for function in stack])
+            weights.append(seconds)
+        profiles.append(
+            {
+                "type": "sampled",
+                "name": phase,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        )
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": profiles,
+        "name": name,
+        "activeProfileIndex": 0,
+        "exporter": "darkgray_dev_tools",
+    }
+
+
+def _store_in_meta(ctx: click.Context, param: click.Parameter, value: object) -> None:
+    """Store the value of a profiling option for `_start_profile`."""
+    ctx.meta[f"darkgray_dev_tools.{param.name}"] = value
+
+
+def _start_profile(
+    ctx: click.Context, _param: click.Parameter, path: Path | None
+) -> None:
+    """Start profiling, and write the profile when the command finishes."""
+    if path is None:
+        return
+    profiler = Profiler(memory=ctx.meta["darkgray_dev_tools.profile_memory"])
+    profile_format = ctx.meta["darkgray_dev_tools.profile_format"]
+    name = ctx.info_name or ""
+
+    def finish() -> None:
+        PHASE_HOOKS.remove(profiler.phase)
+        profiler.stop()
+        profiler.write(path, profile_format, name)
+
+    PHASE_HOOKS.append(profiler.phase)
+    profiler.start()
+    ctx.call_on_close(finish)
+
+
+def profile_option(command: FC) -> FC:
+    """Add the ``--profile``, ``--profile-format`` and ``--profile-memory`` options."""
+    # The format and memory options are eager, so they are known when the non-eager
+    # --profile option starts the profiler.
+    for option in [
+        click.option(
+            "--profile",
+            type=click.Path(dir_okay=False, path_type=Path),
+            expose_value=False,
+            callback=_start_profile,
+            help="Profile the run using cProfile and write the profile into this file",
+        ),
+        click.option(
+            "--profile-format",
+            type=click.Choice(PROFILE_FORMATS),
+            default="pstats",
+            show_default=True,
+            expose_value=False,
+            is_eager=True,
+            callback=_store_in_meta,
+            help="Write --profile for pstats, or as speedscope JSON with phases",
+        ),
+        click.option(
+            "--profile-memory",
+            is_flag=True,
+            expose_value=False,
+            is_eager=True,
+            callback=_store_in_meta,
+            help="With --profile, also report the largest allocations of each phase",
+        ),
+    ]:
+        command = option(command)
+    return command
@@ -0,0 +1,102 @@
+"""Parse the configuration files of a project once per process.
+
+A `ProjectContext` is created lazily for each repository checkout, and it parses
+``pyproject.toml`` and ``setup.cfg`` only when they are first needed. Parsed files are
+cached until they are modified, so commands which look up the repository URL or the
+dependencies of a project several times don't parse the files again.
+
+Both `pyproject_parser` and `setuptools` are slow to import, so they are only imported
+when the corresponding file is actually parsed.
+
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, TypeVar, cast
+
+from darkgray_dev_tools.pyproject_index import PyprojectIndex, index_pyproject
+
+if TYPE_CHECKING:
+    from pyproject_parser import PyProject
+
+T = TypeVar("T")
+
+SetupCfg = dict[str, dict[str, object]]
+
+
+def _load_pyproject(path: Path) -> PyProject:
+    """Parse ``pyproject.toml``, importing `pyproject_parser` on first use."""
+    from pyproject_parser import PyProject  # noqa: PLC0415
+
+    return PyProject.load(path)
+
+
+def _load_setup_cfg(path: Path) -> SetupCfg:
+    """Parse ``setup.cfg``, importing `setuptools` on first use."""
+    from setuptools.config import setupcfg  # noqa: PLC0415
+
+    return cast("SetupCfg", setupcfg.read_configuration(path))
+
+
+class ProjectContext:
+    """Parsed configuration files of a repository checkout."""
+
+    def __init__(self, root: Path) -> None:
+        """Create a context without reading any files yet.
+
+        :param root: The root directory of the repository checkout
+
+        """
+        self.root = root
+        self._cache: dict[
+            tuple[str, Callable[[Path], object]], tuple[int, int, object]
+        ] = {}
+
+    def _cached(self, filename: str, loader: Callable[[Path], T]) -> T:
+        """Return a parsed file, parsing it again only if it has been modified.
+
+        :param filename: The name of the file in the root directory
+        :param loader: The function for parsing the file. Each loader is cached
+                       separately, so one file can be parsed in several ways.
+        :return: The result of the loader
+
+        """
+        path = self.root / filename
+        stat = path.stat()
+        key = (filename, loader)
+        cached = self._cache.get(key)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cast("T", cached[2])
+        value = loader(path)
+        self._cache[key] = (stat.st_mtime_ns, stat.st_size, value)
+        return value
+
+    def pyproject(self) -> PyProject:
+        """Return the parsed ``pyproject.toml`` file."""
+        return self._cached("pyproject.toml", _load_pyproject)
+
+    def requirements(self) -> PyprojectIndex:
+        """Return the requirements in ``pyproject.toml`` and their positions."""
+        return self._cached("pyproject.toml", index_pyproject)
+
+    def setup_cfg(self) -> SetupCfg:
+        """Return the parsed ``setup.cfg`` file."""
+        return self._cached("setup.cfg", _load_setup_cfg)
+
+
+_CONTEXTS: dict[Path, ProjectContext] = {}
+
+
+def get_project_context(root: Path | None = None) -> ProjectContext:
+    """Return the shared context for a repository checkout, creating it on first use.
+
+    :param root: The root directory of the repository checkout, or `None` for the
+                 current working directory
+    :return: The project context
+
+    """
+    key = (root or Path()).resolve()
+    if key not in _CONTEXTS:
+        _CONTEXTS[key] = ProjectContext(key)
+    return _CONTEXTS[key]
@@ -0,0 +1,217 @@
+"""Index the positions of dependency requirements in ``pyproject.toml``.
+
+One pass over the file finds the requirement strings in ``[project] dependencies`` and
+in ``[project.optional-dependencies]``, whether written as tables, dotted keys or
+inline tables, including arrays spanning several lines and several requirements on one
+line. For each requirement, the exact line and column span
+of the quoted string is recorded, so callers can both list dependencies and point at
+them in annotations without parsing the file again.
+
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+TABLE_RE = re.compile(r"\s*\[\[?\s*([^\]]+?)\s*\]\]?\s*(?:#.*)?$")
+KEY_PART = r"""(?:"[^"]*"|'[^']*'|[\w-]+)"""
+KEY_RE = re.compile(rf"\s*({KEY_PART}(?:\s*\.\s*{KEY_PART})*)\s*=\s*")
+KEY_PART_RE = re.compile(r""""([^"]*)"|'([^']*)'|([\w-]+)""")
+INLINE_SEPARATOR_RE = re.compile(r"[\s,]*(}?)")
+SCALAR_RE = re.compile(r"""\s*(?:"(?:[^"\\]|\\.)*"|'[^']*'|[^,}\s#]+)""")
+DEPENDENCIES = "project.dependencies"
+OPTIONAL_DEPENDENCIES = "project.optional-dependencies"
+
+
+@dataclass(frozen=True)
+class RequirementSpan:
+    """A requirement and the position of its quoted string in ``pyproject.toml``.
+
+    Line numbers and columns are zero-based, and `end` is the column after the closing
+    quote.
+
+    """
+
+    requirement: Requirement
+    group: str | None
+    line_num: int
+    start: int
+    end: int
+
+    @property
+    def name(self) -> str:
+        """Return the normalized name of the required package."""
+        return canonicalize_name(self.requirement.name)
+
+
+@dataclass(frozen=True)
+class PyprojectIndex:
+    """Dependency requirements of a project, in the order they appear in the file."""
+
+    has_project: bool
+    requirements: list[RequirementSpan]
+
+    def find(self, name: str) -> RequirementSpan | None:
+        """Return the first requirement for a package, or `None` if there is none.
+
+        :param name: The package name, normalized or not
+
+        """
+        name = canonicalize_name(name)
+        return next((span for span in self.requirements if span.name == name), None)
+
+
+def _dotted_key(key: str) -> str:
+    """Normalize a dotted TOML key or table name by removing quotes and whitespace.
+
+    >>> _dotted_key('project . "optional-dependencies".dev')
+    'project.optional-dependencies.dev'
+
+    """
+    return ".".join("".join(part) for part in KEY_PART_RE.findall(key))
+
+
+def _array_group(key_path: str) -> tuple[bool, str | None]:
+    """Return whether an array lists requirements, and its optional group name.
+
+    :param key_path: The full dotted key of the array, including the table name
+    :return: `True` for requirement arrays, and the optional dependency group name
+
+    """
+    if key_path == DEPENDENCIES:
+        return True, None
+    if key_path.startswith(f"{OPTIONAL_DEPENDENCIES}."):
+        return True, key_path[len(OPTIONAL_DEPENDENCIES) + 1 :]
+    return False, None
+
+
+def _quoted_strings(line: str, position: int) -> Iterator[tuple[int, int, str | None]]:
+    """Find quoted strings in an array, starting from a position on a line.
+
+    :param line: The line to scan
+    :param position: The column to start scanning from
+    :return: The start and end column and the content of each string, and the column of
+             the closing bracket, the column after it and `None` if the end of the
+             array is reached
+
+    """
+    while position < len(line):
+        char = line[position]
+        if char in "\"'":
+            end = position + 1
+            while end < len(line) and line[end] != char:
+                end += 2 if char == '"' and line[end] == "\\" else 1
+            yield position, end + 1, line[position + 1 : end]
+            position = end + 1
+        elif char == "]":
+            yield position, position + 1, None
+            return
+        elif char == "#":
+            return
+        else:
+            position += 1
+
+
+def _scan_array(
+    line: str,
+    line_num: int,
+    position: int,
+    array: tuple[bool, str | None],
+    requirements: list[RequirementSpan],
+) -> int | None:
+    """Collect requirements from an array on one line.
+
+    :param line: The line to scan
+    :param line_num: The zero-based line number
+    :param position: The column to start scanning from
+    :param array: Whether the array lists requirements, and its dependency group
+    :param requirements: The list to append found requirements to
+    :return: The column after the closing bracket, or `None` if the array continues on
+             the next line
+
+    """
+    is_requirements, group = array
+    for start, end, content in _quoted_strings(line, position):
+        if content is None:
+            return end
+        if not is_requirements:
+            continue
+        try:
+            requirement = Requirement(content)
+        except InvalidRequirement:
+            continue
+        requirements.append(RequirementSpan(requirement, group, line_num, start, end))
+    return None
+
+
+def index_pyproject(path: Path) -> PyprojectIndex:  # noqa: C901,PLR0912
+    """Find dependency requirements and their positions in ``pyproject.toml``.
+
+    Requirement arrays are found under tables, dotted keys like
+    ``project.dependencies = [...]`` and inline tables like
+    ``optional-dependencies = { dev = [...] }``. Strings which aren't valid
+    requirements are skipped.
+
+    :param path: The path to ``pyproject.toml``
+    :return: The index of requirements
+
+    """
+    table = ""
+    has_project = False
+    inline_tables: list[str] = []
+    array: tuple[bool, str | None] | None = None
+    requirements: list[RequirementSpan] = []
+    with path.open(encoding="utf-8") as pyproject_file:
+        for line_num, line in enumerate(pyproject_file):
+            position = 0
+            if array is None and not inline_tables:
+                table_match = TABLE_RE.match(line)
+                if table_match:
+                    table = _dotted_key(table_match.group(1))
+                    has_project = has_project or table.split(".")[0] == "project"
+                    continue
+            while position < len(line):
+                if array is not None:
+                    array_end = _scan_array(
+                        line, line_num, position, array, requirements
+                    )
+                    if array_end is None:
+                        break  # the array continues on the next line
+                    array, position = None, array_end
+                    continue
+                if inline_tables:
+                    separator = INLINE_SEPARATOR_RE.match(line, position)
+                    position = separator.end() if separator else position
+                    if separator and separator.group(1):
+                        inline_tables.pop()
+                        continue
+                elif position:
+                    break  # only one key-value pair per line outside inline tables
+                key_match = KEY_RE.match(line, position)
+                if not key_match:
+                    break
+                parent = inline_tables[-1] if inline_tables else table
+                key = _dotted_key(key_match.group(1))
+                key_path = f"{parent}.{key}" if parent else key
+                has_project = has_project or key_path.split(".")[0] == "project"
+                position = key_match.end()
+                value = line[position : position + 1]
+                if value == "[":
+                    array = _array_group(key_path)
+                    position += 1
+                elif value == "{":
+                    inline_tables.append(key_path)
+                    position += 1
+                elif inline_tables and (scalar := SCALAR_RE.match(line, position)):
+                    position = scalar.end()
+                else:
+                    break
+    return PyprojectIndex(has_project, requirements)
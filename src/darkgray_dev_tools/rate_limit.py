@@ -0,0 +1,217 @@
+"""Keep GitHub API requests within the rate limits, adapting how many run at once.
+
+GitHub reports the remaining budget of each rate limit resource in the
+``X-RateLimit-Remaining`` and ``X-RateLimit-Reset`` headers of every response, including
+GraphQL responses whose budget is counted in query cost points. When the budget is
+exhausted, or when a secondary rate limit is hit, GitHub responds with ``403`` or
+``429``, often with a ``Retry-After`` header.
+
+`RateLimitScheduler` tracks those headers and
+
+- paces requests evenly over the time left until the reset once the remaining budget
+  runs low,
+- makes requests wait until the reset instead of failing when the budget is used up,
+- pauses all requests for the time given in ``Retry-After`` after a secondary limit,
+  and
+- limits the number of concurrent requests, halving the limit after each rate limited
+  response and raising it again slowly while requests succeed (additive increase,
+  multiplicative decrease).
+
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from math import inf
+from threading import Condition
+from typing import Callable, Mapping
+from urllib.parse import urlsplit
+
+PACING_THRESHOLD = 100
+"""Remaining budget below which requests are spread evenly until the reset."""
+
+RESET_MARGIN = 1.0
+"""Extra seconds to wait after a reset time, to allow for clock differences."""
+
+SECONDARY_LIMIT_WAIT = 60.0
+"""Seconds to pause after a secondary rate limit response without ``Retry-After``."""
+
+DECREASE_FACTOR = 0.5
+"""Factor for the concurrency limit after a rate limited response."""
+
+RESOURCE_PATHS = (
+    ("/search/code", "code_search"),
+    ("/search/", "search"),
+    ("/graphql", "graphql"),
+)
+
+
+def api_resource(url: str) -> str:
+    """Return the GitHub rate limit resource which requests to a URL count against.
+
+    >>> api_resource("https://api.github.com/search/issues?q=is:pr")
+    'search'
+    >>> api_resource("https://api.github.com/repos/owner/repo/milestones")
+    'core'
+
+    :param url: The URL of the request
+    :return: The name of the rate limit resource
+
+    """
+    path = urlsplit(url).path
+    for prefix, resource in RESOURCE_PATHS:
+        if path.startswith(prefix):
+            return resource
+    return "core"
+
+
+def _parse_seconds(value: str | None) -> float | None:
+    """Parse a number of seconds from a header, or return `None` if not a number."""
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitBudget:
+    """The remaining budget of a rate limit resource, and when it is reset."""
+
+    remaining: int
+    reset: float
+
+
+class RateLimitScheduler:
+    """Pace requests and adapt their concurrency to GitHub API rate limits.
+
+    Call `acquire` before sending a request, `release` once it has completed, and
+    `update` with the response. All methods are thread safe.
+
+    """
+
+    def __init__(
+        self, max_concurrency: int, clock: Callable[[], float] = time.time
+    ) -> None:
+        """Create a scheduler which doesn't know any budgets yet.
+
+        :param max_concurrency: The highest number of concurrent requests to allow
+        :param clock: The function for getting the current time in seconds since the
+                      epoch, which GitHub uses for reset times
+
+        """
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.active = 0
+        self.budgets: dict[str, RateLimitBudget] = {}
+        self.last_start: dict[str, float] = {}
+        self.paused_until = 0.0
+        self.clock = clock
+        self.condition = Condition()
+
+    def delay(self, resource: str) -> float:
+        """Return how many seconds to wait before the next request to a resource.
+
+        :param resource: The rate limit resource of the request
+        :return: Seconds to wait, or zero if the request can be sent now
+
+        """
+        now = self.clock()
+        if now < self.paused_until:
+            return self.paused_until - now
+        budget = self.budgets.get(resource)
+        if budget is None or budget.reset <= now:
+            return 0.0
+        if budget.remaining <= 0:
+            return budget.reset - now + RESET_MARGIN
+        if budget.remaining > PACING_THRESHOLD:
+            return 0.0
+        interval = (budget.reset - now) / budget.remaining
+        return max(0.0, self.last_start.get(resource, -inf) + interval - now)
+
+    def acquire(self, resource: str) -> None:
+        """Wait until a request to a resource can be sent, and reserve budget for it.
+
+        :param resource: The rate limit resource of the request
+
+        """
+        with self.condition:
+            while True:
+                delay = self.delay(resource)
+                if delay <= 0 and self.active < int(self.concurrency):
+                    break
+                self.condition.wait(delay if delay > 0 else None)
+            self.active += 1
+            self.last_start[resource] = self.clock()
+            budget = self.budgets.get(resource)
+            if budget:
+                budget.remaining -= 1
+
+    def release(self) -> None:
+        """Free the concurrency slot of a completed or failed request."""
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for the given time, and reduce concurrency.
+
+        :param seconds: The number of seconds to pause for
+
+        """
+        with self.condition:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self.concurrency = max(1.0, self.concurrency * DECREASE_FACTOR)
+            self.condition.notify_all()
+
+    def update(
+        self,
+        resource: str,
+        status_code: int,
+        headers: Mapping[str, str],
+        message: str = "",
+        *,
+        from_cache: bool = False,
+    ) -> float | None:
+        """Record the rate limit information of a response.
+
+        :param resource: The rate limit resource of the request
+        :param status_code: The HTTP status code of the response
+        :param headers: The HTTP headers of the response
+        :param message: The error message in the response body, if any
+        :param from_cache: `True` if the response was served from the HTTP cache, and
+                           didn't count against the rate limit
+        :return: Seconds to wait before retrying if the request was rate limited, or
+                 `None` if it wasn't
+
+        """
+        with self.condition:
+            budget = self.budgets.get(resource)
+            if from_cache:
+                if budget:
+                    budget.remaining += 1
+                return None
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = _parse_seconds(headers.get("X-RateLimit-Reset"))
+            if remaining is not None and reset is not None:
+                budget = self.budgets[resource] = RateLimitBudget(int(remaining), reset)
+            if status_code not in (HTTPStatus.FORBIDDEN, HTTPStatus.TOO_MANY_REQUESTS):
+                self.concurrency = min(
+                    self.max_concurrency, self.concurrency + 1 / self.concurrency
+                )
+                return None
+            retry_after = _parse_seconds(headers.get("Retry-After"))
+            if retry_after is None and budget and budget.remaining <= 0:
+                # primary rate limit, `acquire` waits for the reset of this resource
+                self.concurrency = max(1.0, self.concurrency * DECREASE_FACTOR)
+                return max(budget.reset - self.clock(), 0.0) + RESET_MARGIN
+            if (
+                retry_after is None
+                and status_code == HTTPStatus.FORBIDDEN
+                and "rate limit" not in message.lower()
+            ):
+                return None  # forbidden for some other reason
+        wait = SECONDARY_LIMIT_WAIT if retry_after is None else retry_after
+        self.pause(wait)
+        return wait
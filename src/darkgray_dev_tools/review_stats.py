@@ -0,0 +1,241 @@
+"""Statistics of approved reviews, computed over a compact columnar representation."""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from datetime import date
+from operator import add, mul
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from darkgray_dev_tools.reviews import Review
+
+SECONDS_PER_DAY = 86400
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+PERIOD_ADJECTIVES = {"week": "weekly", "month": "monthly", "quarter": "quarterly"}
+
+
+def _week_index(day: int) -> int:
+    """Return the number of the Monday-based week since the Unix epoch for a day.
+
+    The week starting on Monday 1969-12-29 is week zero:
+
+    >>> _week_index(-3), _week_index(3), _week_index(4)
+    (0, 0, 1)
+
+    """
+    return (day + 3) // 7
+
+
+def _week_label(index: int) -> str:
+    """Return the ISO week label for a week number.
+
+    >>> _week_label(0)
+    '1970-W01'
+
+    """
+    year, week, _ = date.fromordinal(EPOCH_ORDINAL + 7 * index - 3).isocalendar()
+    return f"{year}-W{week:02}"
+
+
+def _month_index(day: int) -> int:
+    """Return the number of the month since year zero for a day since the Unix epoch.
+
+    >>> _month_index(0), _month_index(31)
+    (23640, 23641)
+
+    """
+    civil_date = date.fromordinal(EPOCH_ORDINAL + day)
+    return civil_date.year * 12 + civil_date.month - 1
+
+
+def _month_label(index: int) -> str:
+    """Return the ``YYYY-MM`` label for a month number.
+
+    >>> _month_label(23641)
+    '1970-02'
+
+    """
+    return f"{index // 12:04}-{index % 12 + 1:02}"
+
+
+def _quarter_index(day: int) -> int:
+    """Return the number of the quarter since year zero for a day since the Unix epoch.
+
+    >>> _quarter_index(0), _quarter_index(90)
+    (7880, 7881)
+
+    """
+    civil_date = date.fromordinal(EPOCH_ORDINAL + day)
+    return civil_date.year * 4 + (civil_date.month - 1) // 3
+
+
+def _quarter_label(index: int) -> str:
+    """Return the ``YYYY-Qn`` label for a quarter number.
+
+    >>> _quarter_label(7881)
+    '1970-Q2'
+
+    """
+    return f"{index // 4:04}-Q{index % 4 + 1}"
+
+
+PERIODS: dict[str, tuple[Callable[[int], int], Callable[[int], str]]] = {
+    "week": (_week_index, _week_label),
+    "month": (_month_index, _month_label),
+    "quarter": (_quarter_index, _quarter_label),
+}
+"""Functions for converting a day to a period number, and a period number to a label.
+
+Period numbers are consecutive integers, so rolling windows can be computed by counting
+back from a period number.
+
+"""
+
+
+class ReviewColumns:
+    """Approved reviews stored column by column in compact arrays.
+
+    Reviewer names are interned, and each review only stores the index of the reviewer.
+    Timestamps are stored as seconds since the Unix epoch.
+
+    >>> from datetime import datetime, timezone
+    >>> columns = ReviewColumns()
+    >>> columns.append(1, "alice", datetime(2024, 1, 31, tzinfo=timezone.utc))
+    >>> columns.append(2, "bob", datetime(2024, 2, 1, tzinfo=timezone.utc))
+    >>> columns.append(3, "alice", datetime(2024, 2, 2, tzinfo=timezone.utc))
+    >>> columns.counts("month")
+    {'2024-01': {'alice': 1}, '2024-02': {'bob': 1, 'alice': 1}}
+    >>> columns.top_reviewers(1)
+    {'alice': 2}
+
+    """
+
+    def __init__(self) -> None:
+        """Create empty columns."""
+        self.timestamps = array("q")
+        self.reviewer_ids = array("l")
+        self.pr_numbers = array("l")
+        self.reviewers: list[str] = []
+        self._reviewer_ids: dict[str, int] = {}
+        self._days: list[int] | None = None
+
+    @classmethod
+    def from_reviews(cls, reviews: Iterable[Review]) -> ReviewColumns:
+        """Load approved reviews into columns.
+
+        :param reviews: The approved reviews to load
+        :return: The reviews in columnar form
+
+        """
+        columns = cls()
+        for review in reviews:
+            columns.append(review.pr_number, review.reviewer, review.submitted_at)
+        return columns
+
+    def __len__(self) -> int:
+        """Return the number of reviews."""
+        return len(self.timestamps)
+
+    def append(self, pr_number: int, reviewer: str, submitted_at: datetime) -> None:
+        """Add a review at the end of the columns.
+
+        :param pr_number: The number of the reviewed pull request
+        :param reviewer: The login of the reviewer
+        :param submitted_at: The time the review was submitted
+
+        """
+        reviewer_id = self._reviewer_ids.get(reviewer)
+        if reviewer_id is None:
+            reviewer_id = self._reviewer_ids[reviewer] = len(self.reviewers)
+            self.reviewers.append(reviewer)
+        self.timestamps.append(int(submitted_at.timestamp()))
+        self.reviewer_ids.append(reviewer_id)
+        self.pr_numbers.append(pr_number)
+        self._days = None
+
+    def period_column(self, period: str) -> list[int]:
+        """Return the period number for each review.
+
+        Conversion from days to periods is done once for each distinct day.
+
+        :param period: ``week``, ``month`` or ``quarter``
+        :return: Period numbers in the same order as the reviews
+
+        """
+        to_period, _ = PERIODS[period]
+        if self._days is None:
+            self._days = list(map(SECONDS_PER_DAY.__rfloordiv__, self.timestamps))
+        period_of_day = {day: to_period(day) for day in set(self._days)}
+        return list(map(period_of_day.__getitem__, self._days))
+
+    def _count_by_period(self, period: str) -> dict[tuple[int, int], int]:
+        """Count approvals for each combination of period and reviewer.
+
+        Period numbers and reviewer indices are combined into single integers for
+        counting, which is much faster than counting tuples.
+
+        :param period: ``week``, ``month`` or ``quarter``
+        :return: Numbers of approvals keyed by period number and reviewer index, in
+                 order of first appearance
+
+        """
+        reviewer_count = len(self.reviewers)
+        periods = self.period_column(period)
+        multipliers = [reviewer_count] * len(periods)
+        keys = map(add, map(mul, periods, multipliers), self.reviewer_ids)
+        return {
+            divmod(key, reviewer_count): count for key, count in Counter(keys).items()
+        }
+
+    def counts(
+        self, period: str = "month", rolling: int = 1
+    ) -> dict[str, dict[str, int]]:
+        """Count approvals by reviewer in each period.
+
+        With a rolling window of one period, periods and reviewers are listed in the
+        order they first appear among the reviews. With a longer window, the counts for
+        each period include the preceding periods in the window, periods are listed
+        most recent first and reviewers by descending count.
+
+        :param period: ``week``, ``month`` or ``quarter``
+        :param rolling: The number of periods to sum up the counts over
+        :return: Counts of approvals by reviewer, keyed by period label
+
+        """
+        _, to_label = PERIODS[period]
+        counter = self._count_by_period(period)
+        if not counter:
+            return {}
+        if rolling <= 1:
+            stats: dict[str, dict[str, int]] = {}
+            for (period_number, reviewer_id), count in counter.items():
+                label = to_label(period_number)
+                stats.setdefault(label, {})[self.reviewers[reviewer_id]] = count
+            return stats
+        by_period: dict[int, Counter[int]] = {}
+        for (period_number, reviewer_id), count in counter.items():
+            by_period.setdefault(period_number, Counter())[reviewer_id] = count
+        rolling_stats = {}
+        for period_number in range(max(by_period), min(by_period) - 1, -1):
+            window: Counter[int] = Counter()
+            for previous in range(period_number - rolling + 1, period_number + 1):
+                window.update(by_period.get(previous, {}))
+            rolling_stats[to_label(period_number)] = self._named(window.most_common())
+        return rolling_stats
+
+    def top_reviewers(self, count: int) -> dict[str, int]:
+        """Return the reviewers with the most approvals.
+
+        :param count: The number of reviewers to return
+        :return: Numbers of approvals keyed by reviewer, the most active reviewer first
+
+        """
+        return self._named(Counter(self.reviewer_ids).most_common(count))
+
+    def _named(self, counts: list[tuple[int, int]]) -> dict[str, int]:
+        """Replace reviewer indices with reviewer names in a list of counts."""
+        return {self.reviewers[reviewer_id]: count for reviewer_id, count in counts}
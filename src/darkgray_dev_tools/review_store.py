@@ -0,0 +1,162 @@
+"""Local SQLite database of approved reviews for incremental and offline reports."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from darkgray_dev_tools.reviews import Review
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    repo TEXT NOT NULL,
+    pr_number INTEGER NOT NULL,
+    reviewer TEXT NOT NULL,
+    pr_title TEXT NOT NULL,
+    submitted_at INTEGER NOT NULL,
+    PRIMARY KEY (repo, pr_number, reviewer)
+);
+CREATE INDEX IF NOT EXISTS reviews_submitted_at ON reviews (submitted_at);
+CREATE TABLE IF NOT EXISTS fetches (
+    repo TEXT PRIMARY KEY,
+    fetched_at INTEGER NOT NULL
+);
+"""
+
+
+class ReviewStore:
+    """Approved reviews of one or more repositories, stored in a SQLite database.
+
+    Timestamps are stored as seconds since the Unix epoch.
+
+    >>> store = ReviewStore(":memory:")
+    >>> t = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    >>> store.upsert([Review(1, "Title", "alice", t, repository="me/repo")])
+    >>> store.upsert([Review(1, "New title", "alice", t, repository="me/repo")])
+    >>> [review.pr_title for review in store.reviews(["me/repo"])]
+    ['New title']
+
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """Open the database, creating it and its tables if needed.
+
+        :param path: The path to the database file
+
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def upsert(self, reviews: Iterable[Review]) -> None:
+        """Insert new approved reviews, and update titles and times of existing ones.
+
+        :param reviews: The approved reviews to store
+
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO reviews VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (repo, pr_number, reviewer) DO UPDATE"
+                " SET pr_title = excluded.pr_title,"
+                " submitted_at = excluded.submitted_at",
+                (
+                    (
+                        review.repository,
+                        review.pr_number,
+                        review.reviewer,
+                        review.pr_title,
+                        int(review.submitted_at.timestamp()),
+                    )
+                    for review in reviews
+                ),
+            )
+
+    def last_fetched_at(self, repo: str) -> datetime | None:
+        """Return when fetching reviews for a repository was last started.
+
+        :param repo: The repository name (owner/repo)
+        :return: The time of the previous fetch, or `None` if never fetched
+
+        """
+        row = self.connection.execute(
+            "SELECT fetched_at FROM fetches WHERE repo = ?", (repo,)
+        ).fetchone()
+        return datetime.fromtimestamp(row[0], tz=timezone.utc) if row else None
+
+    def set_fetched_at(self, repos: Iterable[str], fetched_at: datetime) -> None:
+        """Record when fetching reviews for repositories was started.
+
+        :param repos: The repository names (owner/repo)
+        :param fetched_at: The time when fetching was started
+
+        """
+        timestamp = int(fetched_at.timestamp())
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO fetches VALUES (?, ?)",
+                ((repo, timestamp) for repo in repos),
+            )
+
+    def repositories(self, owner: str) -> list[str]:
+        """List the stored repositories of an organisation or user.
+
+        :param owner: The name of the organisation or user
+        :return: Repository names (owner/repo)
+
+        """
+        rows = self.connection.execute(
+            "SELECT repo FROM fetches WHERE repo LIKE ? ESCAPE '\\' ORDER BY repo",
+            (owner.replace("_", "\\_").replace("%", "\\%") + "/%",),
+        )
+        return [repo for (repo,) in rows]
+
+    def reviews(self, repos: list[str], *, include_owner: bool = True) -> list[Review]:
+        """Return the stored approved reviews for repositories, most recent first.
+
+        :param repos: The repository names (owner/repo)
+        :param include_owner: `False` to skip reviews by the owner of each repository
+        :return: The approved reviews
+
+        """
+        return list(self.iter_reviews(repos, include_owner=include_owner))
+
+    def iter_reviews(
+        self, repos: list[str], *, include_owner: bool = True
+    ) -> Iterator[Review]:
+        """Read the stored approved reviews for repositories one by one.
+
+        Sorting is done by SQLite, so reviews don't need to be held in memory.
+
+        :param repos: The repository names (owner/repo)
+        :param include_owner: `False` to skip reviews by the owner of each repository
+        :return: The approved reviews, most recent first
+
+        """
+        placeholders = ", ".join("?" * len(repos))
+        owner_filter = (
+            ""
+            if include_owner
+            else " AND reviewer != substr(repo, 1, instr(repo, '/') - 1)"
+        )
+        rows = self.connection.execute(
+            "SELECT pr_number, pr_title, reviewer, submitted_at, repo FROM reviews"  # noqa: S608
+            f" WHERE repo IN ({placeholders}){owner_filter}"
+            " ORDER BY submitted_at DESC, repo DESC, pr_number DESC",
+            repos,
+        )
+        for pr_number, pr_title, reviewer, submitted_at, repo in rows:
+            yield Review(
+                pr_number,
+                pr_title,
+                reviewer,
+                datetime.fromtimestamp(submitted_at, tz=timezone.utc),
+                repository=repo,
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
@@ -0,0 +1,115 @@
+"""Streaming output and bounded-memory sorting of approved reviews."""
+
+from __future__ import annotations
+
+import heapq
+import json
+import pickle
+from contextlib import ExitStack
+from itertools import islice
+from tempfile import TemporaryFile
+from typing import IO, TYPE_CHECKING, Callable, Iterable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsRichComparison
+
+T = TypeVar("T")
+
+RUN_SIZE = 10000
+"""The number of items to sort in memory before spilling them to a temporary file."""
+
+BLOCK_SIZE = 500
+"""The number of items to pickle at once, and to read back at a time from each run."""
+
+
+def _write_run(run: list[T], run_file: IO[bytes]) -> int:
+    """Pickle items into a temporary file in blocks, and return the number of blocks."""
+    for start in range(0, len(run), BLOCK_SIZE):
+        pickle.dump(
+            run[start : start + BLOCK_SIZE], run_file, protocol=pickle.HIGHEST_PROTOCOL
+        )
+    return (len(run) + BLOCK_SIZE - 1) // BLOCK_SIZE
+
+
+def _read_run(run_file: IO[bytes], block_count: int) -> Iterator[T]:
+    """Read back items pickled into a temporary file, in the order written."""
+    run_file.seek(0)
+    for _ in range(block_count):
+        yield from pickle.load(run_file)  # noqa: S301  # our own temporary file
+
+
+def external_sort(
+    items: Iterable[T],
+    key: Callable[[T], SupportsRichComparison],
+    *,
+    reverse: bool = False,
+    run_size: int = RUN_SIZE,
+) -> Iterator[T]:
+    """Sort items while keeping at most `run_size` of them in memory.
+
+    Items are sorted in runs of `run_size` items. If there are more items than fit in
+    one run, each sorted run is written into a temporary file, and the runs are merged.
+
+    >>> list(external_sort([3, 1, 4, 1, 5, 9, 2, 6], key=int, run_size=3))
+    [1, 1, 2, 3, 4, 5, 6, 9]
+
+    :param items: The items to sort
+    :param key: A function returning the sort key for an item
+    :param reverse: `True` to sort in descending order
+    :param run_size: The number of items to sort in memory at a time
+    :return: The items in sorted order
+
+    """
+    iterator = iter(items)
+    run = sorted(islice(iterator, run_size), key=key, reverse=reverse)
+    if len(run) < run_size:
+        yield from run
+        return
+    with ExitStack() as stack:
+        runs: list[Iterator[T]] = []
+        while run:
+            run_file = stack.enter_context(TemporaryFile())
+            runs.append(_read_run(run_file, _write_run(run, run_file)))
+            run = sorted(islice(iterator, run_size), key=key, reverse=reverse)
+        yield from heapq.merge(*runs, key=key, reverse=reverse)
+
+
+def write_ndjson(items: Iterable[dict[str, object]], stream: IO[str]) -> None:
+    """Write each item as one line of JSON, as soon as it becomes available.
+
+    >>> import sys
+    >>> write_ndjson([{"a": 1}, {"b": 2}], sys.stdout)
+    {"a": 1}
+    {"b": 2}
+
+    :param items: The items to write
+    :param stream: The text stream to write to
+
+    """
+    for item in items:
+        stream.write(json.dumps(item) + "\n")
+        stream.flush()
+
+
+def write_yaml_documents(items: Iterable[dict[str, object]], stream: IO[str]) -> None:
+    """Write each item as a separate YAML document, as soon as it becomes available.
+
+    >>> import sys
+    >>> write_yaml_documents([{"a": 1}, {"b": 2}], sys.stdout)
+    ---
+    a: 1
+    ---
+    b: 2
+
+    :param items: The items to write
+    :param stream: The text stream to write to
+
+    """
+    from ruamel.yaml import YAML  # noqa: PLC0415
+
+    yaml = YAML(typ="safe")
+    yaml.default_flow_style = False
+    yaml.explicit_start = True
+    for item in items:
+        yaml.dump(item, stream)
+        stream.flush()
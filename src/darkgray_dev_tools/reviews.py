@@ -0,0 +1,20 @@
+"""Approved pull request reviews, shared by the review commands and storage."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+@dataclass
+class Review:
+    """Represents a pull request review."""
+
+    pr_number: int
+    pr_title: str
+    reviewer: str
+    submitted_at: datetime
+    repository: str = ""
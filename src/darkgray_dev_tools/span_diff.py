@@ -0,0 +1,156 @@
+"""Build unified diffs directly from replaced spans, without diffing whole files."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+Edit = tuple[int, int, str]
+"""A replacement of ``content[start:end]`` with a string."""
+
+DIFF_CONTEXT = 1
+"""The number of unchanged lines to show around changed lines."""
+
+
+def _hunk_start(content: str, position: int, context: int) -> int:
+    """Return the start of the line at a position, moved back by context lines."""
+    start = content.rfind("\n", 0, position) + 1
+    for _ in range(context):
+        if start == 0:
+            break
+        start = content.rfind("\n", 0, start - 1) + 1
+    return start
+
+
+def _hunk_end(content: str, position: int, context: int) -> int:
+    """Return the end of the line at a position, moved forward by context lines.
+
+    The end is the position of the newline character ending the line, or the length of
+    the content if the last line has no newline.
+
+    """
+    end = content.find("\n", position)
+    if end == -1:
+        return len(content)
+    for _ in range(context):
+        next_end = content.find("\n", end + 1)
+        if next_end == -1:
+            if not content.endswith("\n"):
+                end = len(content)
+            break
+        end = next_end
+    return end
+
+
+def apply_edits(content: str, edits: Iterable[Edit], offset: int = 0) -> str:
+    """Replace spans of a string with replacement strings.
+
+    >>> apply_edits("__FU__BAR__", [(2, 4, "BA"), (6, 9, "Z")])
+    '__BA__Z__'
+
+    :param content: The content to replace spans in
+    :param edits: Non-overlapping spans and replacements, sorted by position
+    :param offset: The position of `content` in the string the spans refer to
+    :return: The result after the replacements
+
+    """
+    parts: list[str] = []
+    position = 0
+    for start, end, replacement in edits:
+        parts.extend((content[position : start - offset], replacement))
+        position = end - offset
+    parts.append(content[position:])
+    return "".join(parts)
+
+
+def _diff_lines(old_lines: list[str], new_lines: list[str]) -> list[str]:
+    """Mark lines of a hunk as unchanged, removed or added.
+
+    If no lines were added or removed, lines are compared one by one. Otherwise,
+    common leading and trailing lines are kept as context, and the rest is marked as
+    removed and added.
+
+    """
+    if len(old_lines) != len(new_lines):
+        head = 0
+        while (
+            head < min(len(old_lines), len(new_lines))
+            and old_lines[head] == new_lines[head]
+        ):
+            head += 1
+        tail = 0
+        while (
+            tail < min(len(old_lines), len(new_lines)) - head
+            and old_lines[-1 - tail] == new_lines[-1 - tail]
+        ):
+            tail += 1
+        return [
+            *(f" {line}" for line in old_lines[:head]),
+            *(f"-{line}" for line in old_lines[head : len(old_lines) - tail]),
+            *(f"+{line}" for line in new_lines[head : len(new_lines) - tail]),
+            *(f" {line}" for line in old_lines[len(old_lines) - tail :]),
+        ]
+    result: list[str] = []
+    removed: list[str] = []
+    added: list[str] = []
+    for old_line, new_line in zip(old_lines, new_lines):
+        if old_line == new_line:
+            result.extend(removed + added)
+            removed, added = [], []
+            result.append(f" {old_line}")
+        else:
+            removed.append(f"-{old_line}")
+            added.append(f"+{new_line}")
+    return result + removed + added
+
+
+def unified_span_diff(
+    path: str, content: str, edits: list[Edit], context: int = DIFF_CONTEXT
+) -> str:
+    r"""Return a unified diff of the content and the content with edits applied.
+
+    Only the lines around the edits are looked at, so the cost doesn't depend on the
+    size of the unchanged parts of the content.
+
+    >>> print(unified_span_diff("f.txt", "a\nv1.0\nb\nc\n", [(3, 6, "1.1")]))
+    --- a/f.txt
+    +++ b/f.txt
+    @@ -1,3 +1,3 @@
+     a
+    -v1.0
+    +v1.1
+     b
+
+    :param path: The path of the file to show in the diff header
+    :param content: The original content
+    :param edits: Non-overlapping edits sorted by position
+    :param context: The number of unchanged lines to show around changed lines
+    :return: The unified diff, or an empty string if there are no edits
+
+    """
+    if not edits:
+        return ""
+    hunks: list[tuple[int, int, list[Edit]]] = []
+    for edit in edits:
+        start = _hunk_start(content, edit[0], context)
+        end = _hunk_end(content, edit[1], context)
+        if hunks and start <= hunks[-1][1] + 1:
+            previous_start, previous_end, hunk_edits = hunks[-1]
+            hunks[-1] = (previous_start, max(previous_end, end), [*hunk_edits, edit])
+        else:
+            hunks.append((start, end, [edit]))
+    lines = [f"--- a/{path}", f"+++ b/{path}"]
+    line_number = 1
+    line_delta = 0
+    position = 0
+    for start, end, hunk_edits in hunks:
+        line_number += content.count("\n", position, start)
+        position = start
+        old_lines = content[start:end].split("\n")
+        new_lines = apply_edits(content[start:end], hunk_edits, start).split("\n")
+        lines.append(
+            f"@@ -{line_number},{len(old_lines)}"
+            f" +{line_number + line_delta},{len(new_lines)} @@"
+        )
+        lines.extend(_diff_lines(old_lines, new_lines))
+        line_delta += len(new_lines) - len(old_lines)
+    return "\n".join(lines)
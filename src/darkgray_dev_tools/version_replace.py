@@ -3,23 +3,39 @@
 from __future__ import annotations
 
 import re
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from re import Match
-from typing import TYPE_CHECKING, TypedDict
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Callable, Container, Iterable, TypedDict, cast
 
 import click
 
 from darkgray_dev_tools.exceptions import NoMatchError
+from darkgray_dev_tools.file_patterns import (
+    encode_prefixes,
+    expand_glob_keys,
+    find_literal_prefixes,
+    is_glob,
+)
 from darkgray_dev_tools.milestones import (
     get_milestone_numbers,
     get_next_milestone_version,
+    load_milestone_snapshot,
 )
+from darkgray_dev_tools.span_diff import apply_edits, unified_span_diff
 from darkgray_dev_tools.versions import get_current_version, get_next_version
 
 if TYPE_CHECKING:
     from packaging.version import Version
 
+    from darkgray_dev_tools.github_session import GitHubSession
+    from darkgray_dev_tools.span_diff import Edit
+
 
 class PatternDict(TypedDict):
     r"""Patterns for old and new version and the milestone number for the new version.
@@ -158,30 +174,40 @@ def replace_group_1(pattern: str, replacement: str, content: str, path: str) ->
 
     """
     matches = re.finditer(pattern, content, flags=re.MULTILINE)
-    if not matches:
+    spans = [match.span(1) for match in matches]
+    if not spans:
         raise NoMatchError(pattern, path)
-    return replace_spans([match.span(1) for match in matches], replacement, content)
+    return replace_spans(spans, replacement, content)
 
 
-def get_replacements(
+def get_replacements(  # noqa: PLR0913
     patterns: dict[str, set[str]],
     *,
     increment_major: bool,
     increment_minor: bool,
     token: str | None = None,
     dry_run: bool = False,
+    milestones_file: Path | None = None,
+    session: GitHubSession | None = None,
+    root: Path | None = None,
 ) -> tuple[PatternDict, ReplacementDict, Version]:
     """Return search patterns and replacements for version numbers and milestones.
 
     Gets the current version from `version.py` and the milestone numbers from the GitHub
-    API. Based on these, builds the search patterns for the old and new version numbers
-    and the milestone number of the new version, as well as replacement strings for the
-    new and next version numbers and the milestone number of the next version.
+    API or a snapshot file. Based on these, builds the search patterns for the old and
+    new version numbers and the milestone number of the new version, as well as
+    replacement strings for the new and next version numbers and the milestone number of
+    the next version.
 
     :param increment_major: `True` to increment the major version number
     :param increment_minor: `True` to increment the minor version number
     :param token: The GitHub access token to use, or `None` to use none
     :param dry_run: `True` if running in dry-run mode
+    :param milestones_file: The milestone snapshot file to read instead of using the
+                            GitHub API, or `None` to use the API
+    :param session: The GitHub API session to use, or `None` to create one
+    :param root: The root directory of the repository checkout, or `None` for the
+                 current working directory
     :param patterns: Regular expression patterns for finding version numbers in files
     :return: Patterns, replacements and the new version number
 
@@ -190,13 +216,18 @@ def get_replacements(
         path
         for path, patterns in patterns.items()
         if path.endswith(".py")
+        and not is_glob(path)
         and any("__version__" in pattern for pattern in patterns)
     )
     old_version = get_current_version(version_py_path, patterns)
     new_version = get_next_version(
         old_version, increment_major=increment_major, increment_minor=increment_minor
     )
-    milestone_numbers = get_milestone_numbers(token)
+    milestone_numbers = (
+        load_milestone_snapshot(milestones_file)
+        if milestones_file
+        else get_milestone_numbers(token, session=session, root=root)
+    )
     next_version = get_next_milestone_version(
         new_version, milestone_numbers, dry_run=dry_run
     )
@@ -219,42 +250,441 @@ def get_replacements(
 CAPTURE_RE = re.compile(r"\{(\w+)->(\w+)}")
 
 
+def expand_template(
+    pattern_template: str,
+    patterns: PatternDict,
+    replacements: ReplacementDict,
+    group_name: str | None = None,
+) -> tuple[str, str]:
+    r"""Turn a pattern template into a regular expression and a replacement string.
+
+    The magic ``{OLD->NEW}`` expression in the template is turned into a capture group
+    for the pattern of ``OLD``.
+
+    >>> expand_template(
+    ...     "darker/{any_milestone->next_milestone}",
+    ...     {"any_milestone": r"\d+"},
+    ...     {"next_milestone": "15"},
+    ...     group_name="v0",
+    ... )
+    ('darker/(?P<v0>\\d+)', '15')
+
+    :param pattern_template: The pattern template with a ``{OLD->NEW}`` expression
+    :param patterns: The regular expression patterns corresponding to pattern names
+    :param replacements: The replacement strings corresponding to replacement names
+    :param group_name: The name for the capture group, or `None` for an unnamed group
+    :raises NoMatchError: Raised if the template has no ``{OLD->NEW}`` expression
+    :return: The regular expression pattern and the replacement string
+
+    """
+    # example:: pattern_template == r"darker/{any_milestone->next_milestone}"
+    template_match = CAPTURE_RE.search(pattern_template)
+    if not template_match:
+        raise NoMatchError(CAPTURE_RE.pattern, pattern_template)
+    current_pattern, replacement = lookup_patterns(
+        template_match, patterns, replacements
+    )
+    # example: current_pattern == "14", replacement == "15"
+    group = f"?P<{group_name}>" if group_name else ""
+    pattern = replace_spans(
+        [template_match.span()], f"({group}{current_pattern})", pattern_template
+    )
+    # example:: pattern = r"darker/(14)"
+    return pattern, replacement
+
+
+@dataclass(frozen=True)
+class TemplateReplacer:
+    r"""Pattern templates for one file, compiled into a single regular expression.
+
+    The regular expression is an alternation of all templates, so all templates are
+    searched for in a single scan of the content. Each template is wrapped in a group
+    named ``t<index>``, and its ``{OLD->NEW}`` expression is a group named
+    ``v<index>``.
+
+    >>> replacer = TemplateReplacer.compile(
+    ...     ["v{old_version->new_version}", "next: {new_version->next_version}"],
+    ...     {"old_version": r"1\.0", "new_version": r"1\.1"},
+    ...     {"new_version": "1.1", "next_version": "1.2"},
+    ... )
+    >>> replacer.replace("v1.0, next: 1.1, v1.0")
+    ('v1.1, next: 1.2, v1.1', [2, 1])
+
+    """
+
+    pattern_templates: list[str]
+    regex: re.Pattern[str]
+    replacements: list[str]
+
+    @classmethod
+    def compile(
+        cls,
+        pattern_templates: Iterable[str],
+        patterns: PatternDict,
+        replacements: ReplacementDict,
+    ) -> TemplateReplacer:
+        """Compile pattern templates into a single regular expression.
+
+        :param pattern_templates: The pattern templates to compile
+        :param patterns: The regular expression patterns corresponding to pattern names
+        :param replacements: The replacement strings corresponding to replacement names
+        :return: The compiled pattern templates
+
+        """
+        templates = list(pattern_templates)
+        expanded = [
+            expand_template(template, patterns, replacements, group_name=f"v{index}")
+            for index, template in enumerate(templates)
+        ]
+        regex = re.compile(
+            "|".join(
+                f"(?P<t{index}>{pattern})"
+                for index, (pattern, _) in enumerate(expanded)
+            ),
+            flags=re.MULTILINE,
+        )
+        return cls(templates, regex, [replacement for _, replacement in expanded])
+
+    def find_edits(self, content: str) -> tuple[list[Edit], list[int]]:
+        """Find the ``{OLD->NEW}`` groups of all templates in a single scan.
+
+        The template which matched is identified by `re.Match.lastgroup`, since the
+        group wrapping a whole template is always the last one to close.
+
+        :param content: The content to search in
+        :return: The spans to replace with their replacements, and the number of matches
+                 for each template
+
+        """
+        counts = [0] * len(self.pattern_templates)
+        edits = []
+        for match in self.regex.finditer(content):
+            index = int(cast("str", match.lastgroup)[1:])
+            start, end = match.span(f"v{index}")
+            edits.append((start, end, self.replacements[index]))
+            counts[index] += 1
+        return edits, counts
+
+    def replace(self, content: str) -> tuple[str, list[int]]:
+        """Replace the ``{OLD->NEW}`` groups of all templates in a single scan.
+
+        :param content: The content to search and do the replacements in
+        :return: The resulting content, and the number of matches for each template
+
+        """
+        edits, counts = self.find_edits(content)
+        return apply_edits(content, edits), counts
+
+    def check_counts(
+        self, counts: list[int], path: str, required: Container[str] | None = None
+    ) -> None:
+        """Raise an exception for the first required template which didn't match.
+
+        :param counts: The number of matches for each template
+        :param path: The path of the file the templates were searched in
+        :param required: The templates which must match, or `None` if all of them
+        :raises NoMatchError: Raised if any of the required templates didn't match
+
+        """
+        for template, count in zip(self.pattern_templates, counts):
+            if not count and (required is None or template in required):
+                raise NoMatchError(template, path)
+
+
+REPLACE_CONCURRENCY = 8
+"""The number of files to read, replace and stage concurrently."""
+
+
+@dataclass
+class StagedFile:
+    """A file with replacements done, and optionally staged into a temporary file.
+
+    The staged temporary file is created in the same directory as the file, so it can be
+    atomically renamed over the original file.
+
+    """
+
+    path: Path
+    original: str
+    content: str
+    counts: dict[str, int] = field(default_factory=dict)
+    edits: list[Edit] = field(default_factory=list)
+    staged_path: Path | None = None
+
+    def stage(self) -> None:
+        """Write the content into a temporary file next to the original file."""
+        with NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self.path.parent,
+            prefix=f".{self.path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as staged_file:
+            self.staged_path = Path(staged_file.name)
+            staged_file.write(self.content)
+        shutil.copymode(self.path, self.staged_path)
+
+    def discard(self) -> None:
+        """Remove the staged temporary file, if it still exists."""
+        if self.staged_path:
+            self.staged_path.unlink(missing_ok=True)
+
+
+def stage_replacements(
+    path_str: str,
+    replacer: TemplateReplacer,
+    *,
+    dry_run: bool,
+    required: Container[str] | None = None,
+) -> StagedFile:
+    """Do replacements for one file, and write the result into a temporary file.
+
+    No temporary file is written if nothing was replaced.
+
+    :param path_str: The path of the file to do replacements in
+    :param replacer: The compiled pattern templates for the file
+    :param dry_run: ``True`` to not write the temporary file
+    :param required: The templates which must match, or `None` if all of them
+    :raises NoMatchError: Raised if a required pattern template isn't found in the file
+    :return: The original and replaced content, the number of matches for each
+             template, and the path of the temporary file
+
+    """
+    path = Path(path_str)
+    original = path.read_text(encoding="utf-8")
+    edits, counts = replacer.find_edits(original)
+    replacer.check_counts(counts, path_str, required)
+    content = apply_edits(original, edits)
+    staged = StagedFile(
+        path, original, content, dict(zip(replacer.pattern_templates, counts)), edits
+    )
+    if not dry_run and any(counts):
+        staged.stage()
+    return staged
+
+
+def commit_staged_files(staged_files: list[StagedFile]) -> None:
+    """Atomically rename staged temporary files over the original files.
+
+    If renaming fails or is interrupted, files already replaced are restored to their
+    original content, so either all files or none of them are modified.
+
+    :param staged_files: The files with staged temporary files
+
+    """
+    committed = []
+    try:
+        for staged in staged_files:
+            if staged.staged_path:
+                staged.staged_path.replace(staged.path)
+                committed.append(staged)
+    except BaseException:
+        for staged in committed:
+            staged.path.write_text(staged.original, encoding="utf-8")
+        raise
+    finally:
+        for staged in staged_files:
+            staged.discard()
+
+
+def replace_in_file(
+    path_str: str,
+    templates: dict[str, str | None],
+    compile_templates: Callable[[tuple[str, ...]], TemplateReplacer],
+    *,
+    dry_run: bool,
+) -> StagedFile | None:
+    """Prefilter a file by literal prefixes of templates, and do replacements in it.
+
+    The raw bytes of the file are first searched for the literal prefix of each
+    template. The file is only decoded and searched using regular expressions for
+    templates whose prefixes were found.
+
+    :param path_str: The path of the file to do replacements in
+    :param templates: The pattern templates for the file, each with the glob key it came
+                      from, or `None` if the template must match in this file
+    :param compile_templates: A function for compiling a tuple of pattern templates
+    :param dry_run: ``True`` to not write the temporary file
+    :raises NoMatchError: Raised if a required pattern template isn't found in the file
+    :return: The replaced and staged file, or `None` if no templates can match
+
+    """
+    found = find_literal_prefixes(Path(path_str), encode_prefixes(templates))
+    required = {template for template, key in templates.items() if key is None}
+    for template in required - found:
+        raise NoMatchError(template, path_str)
+    candidates = tuple(template for template in templates if template in found)
+    if not candidates:
+        return None
+    return stage_replacements(
+        path_str, compile_templates(candidates), dry_run=dry_run, required=required
+    )
+
+
+def _check_glob_counts(
+    templates_for_files: dict[str, dict[str, str | None]],
+    staged_files: dict[str, StagedFile],
+) -> None:
+    """Raise an exception if a template of a glob key didn't match in any file."""
+    expected = {
+        (key, template)
+        for templates in templates_for_files.values()
+        for template, key in templates.items()
+        if key is not None
+    }
+    matched = {
+        (templates_for_files[path_str][template], template)
+        for path_str, staged in staged_files.items()
+        for template, count in staged.counts.items()
+        if count
+    }
+    for key, template in sorted(expected - matched):
+        raise NoMatchError(template, key)
+
+
+def print_diffs_and_counts(staged_files: dict[str, StagedFile]) -> None:
+    """Print unified diffs of replacements, and a summary of matches in each file.
+
+    :param staged_files: Files with replacements done, keyed by their paths
+
+    """
+    for path_str, staged in staged_files.items():
+        diff = unified_span_diff(path_str, staged.original, staged.edits)
+        if diff:
+            click.echo(diff)
+    click.echo("\n######## Matches ########")
+    for path_str, staged in staged_files.items():
+        total = sum(staged.counts.values())
+        if not total:
+            continue
+        click.echo(f"{path_str}: {total} match{'' if total == 1 else 'es'}")
+        if len(staged.counts) > 1:
+            for template, count in staged.counts.items():
+                click.echo(f"  {count}  {template}")
+
+
+def stage_all_replacements(
+    pattern_templates_for_files: dict[str, list[str]],
+    patterns: PatternDict,
+    replacements: ReplacementDict,
+    *,
+    dry_run: bool,
+) -> tuple[dict[str, dict[str, str | None]], dict[str, StagedFile]]:
+    """Do replacements in all files concurrently, and stage the results.
+
+    See `do_replacements` for how pattern templates and glob keys are matched. If any
+    file fails, all staged temporary files are removed and the first error is raised.
+
+    :param pattern_templates_for_files: The file paths or globs and the pattern
+                                        templates to use
+    :param patterns: Regular expression patterns for finding old version and milestone
+                     numbers in files, based on the templates above
+    :param replacements: Replacement strings with new version and milestone numbers
+    :param dry_run: ``True`` to not write staged temporary files
+    :raises NoMatchError: Raised if a pattern template isn't found in a file
+    :return: The pattern templates for each file after expanding glob keys, and the
+             files with replacements done, keyed by their paths
+
+    """
+    templates_for_files = expand_glob_keys(pattern_templates_for_files)
+
+    @lru_cache(maxsize=None)
+    def compile_templates(pattern_templates: tuple[str, ...]) -> TemplateReplacer:
+        return TemplateReplacer.compile(pattern_templates, patterns, replacements)
+
+    with ThreadPoolExecutor(max_workers=REPLACE_CONCURRENCY) as executor:
+        futures = [
+            executor.submit(
+                replace_in_file,
+                path_str,
+                templates,
+                compile_templates,
+                dry_run=dry_run,
+            )
+            for path_str, templates in templates_for_files.items()
+        ]
+    staged_files = {
+        path_str: staged
+        for path_str, future in zip(templates_for_files, futures)
+        if not future.exception() and (staged := future.result())
+    }
+    errors = [error for future in futures if (error := future.exception())]
+    if not errors:
+        try:
+            _check_glob_counts(templates_for_files, staged_files)
+        except NoMatchError as exc:
+            errors.append(exc)
+    if errors:
+        for staged in staged_files.values():
+            staged.discard()
+        raise errors[0]
+    return templates_for_files, staged_files
+
+
+def print_replacements(
+    templates_for_files: dict[str, dict[str, str | None]],
+    staged_files: dict[str, StagedFile],
+    *,
+    diff: bool,
+) -> None:
+    """Print the result of replacements in dry-run mode.
+
+    :param templates_for_files: The pattern templates for each file, each with the glob
+                                key it came from, or `None` if listed explicitly
+    :param staged_files: Files with replacements done, keyed by their paths
+    :param diff: ``True`` to print a unified diff and match counts, instead of the full
+                 content of each file
+
+    """
+    if diff:
+        print_diffs_and_counts(staged_files)
+        return
+    for path_str, staged in staged_files.items():
+        listed_explicitly = None in templates_for_files[path_str].values()
+        if listed_explicitly or staged.content != staged.original:
+            click.echo(f"\n######## {path_str} ########\n")
+            click.echo(staged.content)
+
+
 def do_replacements(
-    pattern_templates_for_files: dict[str, set[str]],
+    pattern_templates_for_files: dict[str, list[str]],
     patterns: PatternDict,
-    replacements: dict[str, str],
+    replacements: ReplacementDict,
     *,
     dry_run: bool,
+    diff: bool = False,
 ) -> None:
     """Replace old versions and milestones in files with new versions and milestones.
 
+    Keys of `pattern_templates_for_files` may be glob patterns. Templates of explicitly
+    listed files must match in each file, and templates of glob keys must match in at
+    least one of the files matched by the glob.
+
+    All pattern templates for a file are compiled into one regular expression, and each
+    file is scanned only once. Files which share the same templates share the compiled
+    regular expression. Files without the literal prefix of any template aren't decoded
+    or scanned at all.
+
+    Files are read and replaced concurrently into staged temporary files. Only if all
+    files succeed, the staged files are renamed over the original files. Otherwise no
+    files are modified.
+
     :param dry_run: ``True`` to just print the result
-    :param pattern_templates_for_files: The file paths and the pattern templates to use
+    :param diff: ``True`` to print a unified diff and match counts in dry-run mode,
+                 instead of the full content of each file
+    :param pattern_templates_for_files: The file paths or globs and the pattern
+                                        templates to use
     :param patterns: Regular expression patterns for finding old version and milestone
                      numbers in files, based on the templates above
     :param replacements: Replacement strings with new version and milestone numbers
     :raises NoMatchError: Raised if a pattern template isn't found in a file
 
     """
-    for path_str, pattern_templates in pattern_templates_for_files.items():
-        path = Path(path_str)
-        content = path.read_text(encoding="utf-8")
-        for pattern_template in pattern_templates:
-            # example:: pattern_template == r"darker/{any_milestone->next_milestone}"
-            template_match = CAPTURE_RE.search(pattern_template)
-            if not template_match:
-                raise NoMatchError(CAPTURE_RE.pattern, pattern_template)
-            current_pattern, replacement = lookup_patterns(
-                template_match, patterns, replacements
-            )
-            # example: current_pattern == "14", replacement == "15"
-            pattern = replace_spans(
-                [template_match.span()], f"({current_pattern})", pattern_template
-            )
-            # example:: pattern = r"darker/(14)"
-            content = replace_group_1(pattern, replacement, content, path=path_str)
-        if dry_run:
-            click.echo(f"\n######## {path_str} ########\n")
-            click.echo(content)
-        else:
-            path.write_text(content, encoding="utf-8")
+    templates_for_files, staged_files = stage_all_replacements(
+        pattern_templates_for_files, patterns, replacements, dry_run=dry_run
+    )
+    if dry_run:
+        print_replacements(templates_for_files, staged_files, diff=diff)
+    else:
+        commit_staged_files(list(staged_files.values()))
@@ -0,0 +1,172 @@
+"""Tests for the `darkgray_dev_tools.changelog` module."""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+from packaging.version import Version
+
+from darkgray_dev_tools.changelog import (
+    get_changelog_index,
+    patch_changelog,
+    release_notes,
+    validate_changelog,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CHANGELOG = """\
+Unreleased_
+===========
+
+These features will be included in the next release:
+
+Added
+-----
+- New feature.
+
+Fixed
+-----
+- Bug fix.
+
+
+1.0.0_ - 2024-02-01
+===================
+
+Removed
+-------
+- Old feature.
+
+
+0.9.0_ - 2024-01-01
+===================
+
+Added
+-----
+- First feature.
+
+.. _Unreleased: https://example.com/compare/v1.0.0...HEAD
+.. _1.0.0: https://example.com/compare/v0.9.0...v1.0.0
+"""
+
+
+def test_get_changelog_index(tmp_path: Path) -> None:
+    """Releases and subsections are indexed with byte offsets, up to link targets."""
+    path = tmp_path / "CHANGES.rst"
+    path.write_text(CHANGELOG)
+
+    index = get_changelog_index(path)
+
+    assert [
+        (release.version, release.date, [s.title for s in release.subsections])
+        for release in index.releases
+    ] == [
+        ("Unreleased", None, ["Added", "Fixed"]),
+        ("1.0.0", "2024-02-01", ["Removed"]),
+        ("0.9.0", "2024-01-01", ["Added"]),
+    ]
+    fixed = index.releases[0].subsections[1]
+    assert index.read(fixed.start, fixed.end) == "Fixed\n-----\n- Bug fix.\n\n\n"
+    assert index.read(index.releases[2].end, index.size).startswith(".. _Unreleased:")
+
+
+def test_get_changelog_index_cache(tmp_path: Path) -> None:
+    """The cached index is reused until the file is modified."""
+    path = tmp_path / "CHANGES.rst"
+    path.write_text(CHANGELOG)
+    index = get_changelog_index(path)
+
+    assert get_changelog_index(path) is index
+
+    path.write_text(CHANGELOG.replace("1.0.0_ - 2024-02-01", "1.0.0_ - 2024-02-02"))
+    os.utime(path, ns=(index.mtime_ns + 1, index.mtime_ns + 1))
+
+    assert get_changelog_index(path).releases[1].date == "2024-02-02"
+
+
+def test_release_notes(tmp_path: Path) -> None:
+    """The body of one release is returned without its title."""
+    path = tmp_path / "CHANGES.rst"
+    path.write_text(CHANGELOG)
+
+    result = release_notes("1.0.0", path)
+
+    assert result == "Removed\n-------\n- Old feature.\n"
+
+
+@pytest.mark.kwparametrize(
+    dict(replace=("", ""), expect=[]),
+    dict(
+        replace=("Unreleased_\n===========", "Unreleased\n=========="),
+        expect=[
+            "The first section isn't Unreleased_",
+            "Invalid release title 'Unreleased'",
+        ],
+    ),
+    dict(
+        replace=("0.9.0_ - 2024-01-01", "1.0.0_ - 2024-03-01"),
+        expect=["Duplicate release 1.0.0", "Release 1.0.0 is out of date order"],
+    ),
+    dict(
+        replace=("0.9.0_ - 2024-01-01", "0.9.0_ - unknown"),
+        expect=["Invalid release title '0.9.0_ - unknown'"],
+    ),
+    dict(
+        replace=("Removed\n-------", "Changes\n-------"),
+        expect=["Unknown subsection 'Changes' in 1.0.0_ - 2024-02-01"],
+    ),
+)
+def test_validate_changelog(
+    tmp_path: Path, replace: tuple[str, str], expect: list[str]
+) -> None:
+    """Problems in the structure of the change log are reported."""
+    path = tmp_path / "CHANGES.rst"
+    path.write_text(CHANGELOG.replace(*replace))
+
+    result = validate_changelog(get_changelog_index(path))
+
+    assert result == expect
+
+
+def test_patch_changelog(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A release title and empty subsections are inserted after Unreleased_."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "CHANGES.rst").write_text(CHANGELOG)
+    today = datetime.now(tz=timezone.utc).date()
+
+    patch_changelog(Version("1.1.0"), dry_run=False)
+
+    content = (tmp_path / "CHANGES.rst").read_text()
+    assert content.startswith(
+        "Unreleased_\n"
+        "===========\n\n"
+        "These features will be included in the next release:\n\n"
+        "Added\n-----\n\n"
+        "Fixed\n-----\n\n\n"
+        f"1.1.0_ - {today}\n"
+        "===================\n\n"
+        "Added\n-----\n- New feature.\n"
+    )
+    assert content.endswith(CHANGELOG[CHANGELOG.index("\n\n1.0.0_") :])
+    index = get_changelog_index(tmp_path / "CHANGES.rst")
+    assert [release.version for release in index.releases] == [
+        "Unreleased",
+        "1.1.0",
+        "1.0.0",
+        "0.9.0",
+    ]
+
+
+def test_patch_changelog_no_unreleased(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An exception is raised if there is no Unreleased section."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "CHANGES.rst").write_text(CHANGELOG.replace("Unreleased_\n", "Next_\n"))
+
+    with pytest.raises(ValueError, match=r"No Unreleased_ section in CHANGES\.rst"):
+        patch_changelog(Version("1.1.0"), dry_run=False)
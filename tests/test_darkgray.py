@@ -0,0 +1,71 @@
+"""Tests for the `darkgray_dev_tools.darkgray` module."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from darkgray_dev_tools.darkgray import LAZY_COMMANDS, darkgray
+
+HEAVY_MODULES = [
+    "airium",
+    "keyring",
+    "pyproject_parser",
+    "requests",
+    "requests_cache",
+    "ruamel.yaml",
+    "setuptools",
+]
+STARTUP_TIME_LIMIT = 1.0
+"""Seconds allowed for importing and running ``darkgray --help`` in a new process."""
+
+STARTUP_SCRIPT = """\
+import json, sys, time
+start = time.perf_counter()
+from darkgray_dev_tools.darkgray import darkgray
+darkgray.main(sys.argv[1:], standalone_mode=False)
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": list(sys.modules)}))
+"""
+
+
+@pytest.mark.parametrize("name", sorted(LAZY_COMMANDS))
+def test_lazy_command_load(name: str) -> None:
+    """Each subcommand can be imported."""
+    command = LAZY_COMMANDS[name].load()
+
+    assert isinstance(command, click.Command)
+
+
+def test_darkgray_help() -> None:
+    """All subcommands are listed with their short help."""
+    result = CliRunner().invoke(darkgray, ["--help"])
+
+    assert result.exit_code == 0, result.output
+    assert "  bump-version          Bump the version number in project files.\n" in (
+        result.output
+    )
+    assert result.output.endswith(
+        "  verify-contributors   Verify claimed contributions in contributors.yaml.\n"
+    )
+
+
+@pytest.mark.parametrize("args", [[], *([name] for name in sorted(LAZY_COMMANDS))])
+def test_darkgray_help_startup(args: list[str]) -> None:
+    """Showing help is fast, and doesn't import slow third party packages."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", STARTUP_SCRIPT, *args, "--help"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+
+    result = json.loads(output.splitlines()[-1])
+
+    assert [module for module in HEAVY_MODULES if module in result["modules"]] == []
+    assert result["elapsed"] < STARTUP_TIME_LIMIT
@@ -0,0 +1,123 @@
+"""Tests for the `darkgray_dev_tools.darkgray_bump_version` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from click.testing import CliRunner
+
+from darkgray_dev_tools.darkgray_bump_version import bump_version
+from darkgray_dev_tools.exceptions import NoMatchError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PATTERNS = """\
+version.py:
+- ^__version__ = "{old_version->new_version}"
+README.rst:
+- milestone/{any_milestone->next_milestone}
+"""
+CHANGELOG = """\
+Unreleased_
+===========
+
+These features will be included in the next release:
+
+Added
+-----
+- A feature.
+"""
+
+
+def make_checkout(root: Path, version: str, milestone: str) -> Path:
+    """Create a repository checkout with version patterns and a milestone snapshot."""
+    (root / "release_tools").mkdir(parents=True)
+    (root / "release_tools" / "bump-version-patterns.yaml").write_text(PATTERNS)
+    (root / "release_tools" / "milestones.yaml").write_text(f"{milestone}: 7\n")
+    (root / "version.py").write_text(f'__version__ = "{version}"\n')
+    (root / "README.rst").write_text("See milestone/6\n")
+    (root / "CHANGES.rst").write_text(CHANGELOG)
+    return root
+
+
+def test_bump_version_workspace_dry_run(tmp_path: Path) -> None:
+    """A dry run of several checkouts prints one report and modifies nothing."""
+    one = make_checkout(tmp_path / "one", "1.0.0", "One 1.0.2")
+    two = make_checkout(tmp_path / "two", "2.0.0", "Two 2.0.2")
+
+    result = CliRunner().invoke(
+        bump_version, ["--dry-run", "--diff", "-C", str(one), "-C", str(two)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"######## Checkout {one} ########" in result.output
+    assert f"+++ b/{two.as_posix()}/version.py" in result.output
+    assert f"+++ b/{two / 'CHANGES.rst'}" in result.output
+    assert result.output.endswith(
+        "######## Workspace ########\n"
+        f"{one}: 1.0.1, 2 matches in 2 files\n"
+        f"{two}: 2.0.1, 2 matches in 2 files\n"
+    )
+    assert (two / "version.py").read_text() == '__version__ = "2.0.0"\n'
+
+
+def test_bump_version_workspace(tmp_path: Path) -> None:
+    """All checkouts are bumped, and their change logs are patched."""
+    one = make_checkout(tmp_path / "one", "1.0.0", "One 1.0.2")
+    two = make_checkout(tmp_path / "two", "2.0.0", "Two 2.0.2")
+
+    result = CliRunner().invoke(
+        bump_version, ["--offline", "-C", str(one), "-C", str(two)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert (one / "version.py").read_text() == '__version__ = "1.0.1"\n'
+    assert (two / "version.py").read_text() == '__version__ = "2.0.1"\n'
+    assert (two / "README.rst").read_text() == "See milestone/7\n"
+    assert "\n2.0.1_ - " in (two / "CHANGES.rst").read_text()
+
+
+def test_bump_version_workspace_failure(tmp_path: Path) -> None:
+    """If any checkout fails, no files in any checkout are modified."""
+    one = make_checkout(tmp_path / "one", "1.0.0", "One 1.0.2")
+    two = make_checkout(tmp_path / "two", "2.0.0", "Two 2.0.2")
+    (two / "README.rst").write_text("No milestone link\n")
+
+    result = CliRunner().invoke(
+        bump_version, ["--offline", "-C", str(one), "-C", str(two)]
+    )
+
+    assert isinstance(result.exception, NoMatchError)
+    assert (one / "version.py").read_text() == '__version__ = "1.0.0"\n'
+    assert (one / "CHANGES.rst").read_text() == CHANGELOG
+    assert sorted(path.name for path in one.iterdir()) == [
+        "CHANGES.rst",
+        "README.rst",
+        "release_tools",
+        "version.py",
+    ]
+
+
+def test_bump_version_workspace_no_unreleased(tmp_path: Path) -> None:
+    """If a change log has no Unreleased section, no files are modified."""
+    one = make_checkout(tmp_path / "one", "1.0.0", "One 1.0.2")
+    two = make_checkout(tmp_path / "two", "2.0.0", "Two 2.0.2")
+    (two / "CHANGES.rst").write_text(CHANGELOG.replace("Unreleased_", "Next_"))
+
+    result = CliRunner().invoke(
+        bump_version, ["--offline", "-C", str(one), "-C", str(two)]
+    )
+
+    assert isinstance(result.exception, ValueError)
+    assert str(result.exception) == f"No Unreleased_ section in {two / 'CHANGES.rst'}"
+    for root, version in [(one, "1.0.0"), (two, "2.0.0")]:
+        assert (root / "version.py").read_text() == f'__version__ = "{version}"\n'
+        assert (root / "README.rst").read_text() == "See milestone/6\n"
+        assert sorted(path.name for path in root.iterdir()) == [
+            "CHANGES.rst",
+            "README.rst",
+            "release_tools",
+            "version.py",
+        ]
+    assert (one / "CHANGES.rst").read_text() == CHANGELOG
@@ -13,10 +13,7 @@ from click.testing import CliRunner
 
 from darkgray_dev_tools.darkgray_collect_contributors import (
     CONTRIBUTION_TYPES,
-    GITHUB_API_URL,
-    GITHUB_GRAPHQL_URL,
     HTTP_NOT_FOUND,
-    REQUEST_TIMEOUT,
     UNSUPPORTED_GIT_URL_ERROR,
     Contributors,
     collect_contributors,
@@ -25,7 +22,12 @@ from darkgray_dev_tools.darkgray_collect_contributors import (
     get_repo_from_git,
 )
 from darkgray_dev_tools.darkgray_update_contributors import Contribution
-from darkgray_dev_tools.exceptions import GitHubRepoNameError
+from darkgray_dev_tools.exceptions import GitHubApiError, GitHubRepoNameError
+from darkgray_dev_tools.github_session import (
+    GITHUB_API_URL,
+    GITHUB_GRAPHQL_URL,
+    GitHubSession,
+)
 
 
 class TestGetRepoFromGit:
@@ -115,7 +117,8 @@ class TestContributors:
         mock_yaml.load.return_value = yaml_content
 
         with patch("pathlib.Path.open", mock_open()), patch(
-            "darkgray_dev_tools.darkgray_collect_contributors.yaml", mock_yaml
+            "darkgray_dev_tools.darkgray_collect_contributors.get_yaml",
+            return_value=mock_yaml,
         ):
             contributors = Contributors.load()
 
@@ -139,7 +142,8 @@ class TestContributors:
         mock_stream = Mock()
 
         with patch("pathlib.Path.open", mock_open()), patch(
-            "darkgray_dev_tools.darkgray_collect_contributors.yaml", mock_yaml
+            "darkgray_dev_tools.darkgray_collect_contributors.get_yaml",
+            return_value=mock_yaml,
         ), patch("click.get_text_stream", return_value=mock_stream):
             contributors.dump()
 
@@ -278,7 +282,7 @@ class TestCollectIssuesAndPrs:
         """Test successful collection of issues and PRs."""
         base_url = f"{GITHUB_API_URL}/repos/owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
         # Mock API responses
         issues_response = Mock()
@@ -308,8 +312,8 @@ class TestCollectIssuesAndPrs:
                 return issues_response
             return comments_response
 
-        with patch("requests.get", side_effect=mock_get), patch("click.echo"):
-            collect_issues_and_prs(base_url, contributors, headers, None)
+        with patch.object(session, "get", side_effect=mock_get), patch("click.echo"):
+            collect_issues_and_prs(base_url, contributors, session, None)
 
             assert "user1" in contributors._contributors
             assert "user2" in contributors._contributors
@@ -318,7 +322,7 @@ class TestCollectIssuesAndPrs:
         """Test collection with since date filtering."""
         base_url = f"{GITHUB_API_URL}/repos/owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
         since_date = "2023-01-02T00:00:00Z"
 
         # Mock API responses with dates before and after since_date
@@ -350,8 +354,8 @@ class TestCollectIssuesAndPrs:
                 return issues_response
             return comments_response
 
-        with patch("requests.get", side_effect=mock_get), patch("click.echo"):
-            collect_issues_and_prs(base_url, contributors, headers, since_date)
+        with patch.object(session, "get", side_effect=mock_get), patch("click.echo"):
+            collect_issues_and_prs(base_url, contributors, session, since_date)
 
             # Both users should be added as authors
             assert "user1" in contributors._contributors
@@ -361,7 +365,7 @@ class TestCollectIssuesAndPrs:
         """Test handling of paginated responses."""
         base_url = f"{GITHUB_API_URL}/repos/owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
         # First page response
         first_response = Mock()
@@ -404,8 +408,8 @@ class TestCollectIssuesAndPrs:
                 return first_response
             return second_response
 
-        with patch("requests.get", side_effect=mock_get), patch("click.echo"):
-            collect_issues_and_prs(base_url, contributors, headers, None)
+        with patch.object(session, "get", side_effect=mock_get), patch("click.echo"):
+            collect_issues_and_prs(base_url, contributors, session, None)
 
             assert "user1" in contributors._contributors
             assert "user2" in contributors._contributors
@@ -418,7 +422,7 @@ class TestCollectDiscussions:
         """Test successful collection of discussions."""
         repo = "owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
         # Mock GraphQL response
         graphql_response = Mock()
@@ -448,8 +452,10 @@ class TestCollectDiscussions:
             }
         }
 
-        with patch("requests.post", return_value=graphql_response), patch("click.echo"):
-            collect_discussions(repo, contributors, headers, None)
+        with patch.object(
+            session, "post", return_value=graphql_response
+        ), patch("click.echo"):
+            collect_discussions(repo, contributors, session, None)
 
             assert "user1" in contributors._contributors
             assert "user2" in contributors._contributors
@@ -458,7 +464,7 @@ class TestCollectDiscussions:
         """Test collection with since date filtering."""
         repo = "owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
         since_date = "2023-01-02T00:00:00Z"
 
         # Mock GraphQL response with discussion after since_date
@@ -493,8 +499,10 @@ class TestCollectDiscussions:
             }
         }
 
-        with patch("requests.post", return_value=graphql_response), patch("click.echo"):
-            collect_discussions(repo, contributors, headers, since_date)
+        with patch.object(
+            session, "post", return_value=graphql_response
+        ), patch("click.echo"):
+            collect_discussions(repo, contributors, session, since_date)
 
             # user1 should be added (discussion after since_date)
             # user3 should be added (comment after since_date)
@@ -506,7 +514,7 @@ class TestCollectDiscussions:
         """Test handling of paginated GraphQL responses."""
         repo = "owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
         # Mock responses for pagination
         first_response = Mock()
@@ -558,8 +566,8 @@ class TestCollectDiscussions:
                 return first_response
             return second_response
 
-        with patch("requests.post", side_effect=mock_post), patch("click.echo"):
-            collect_discussions(repo, contributors, headers, None)
+        with patch.object(session, "post", side_effect=mock_post), patch("click.echo"):
+            collect_discussions(repo, contributors, session, None)
 
             assert "user1" in contributors._contributors
             assert "user2" in contributors._contributors
@@ -672,51 +680,62 @@ class TestApiErrorHandling:
         """Test handling of API errors in collect_issues_and_prs."""
         base_url = f"{GITHUB_API_URL}/repos/owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
-        with patch(
-            "requests.get", side_effect=requests.RequestException("API Error")
+        with patch.object(
+            session, "get", side_effect=requests.RequestException("API Error")
         ), patch("click.echo"):
             with pytest.raises(requests.RequestException):
-                collect_issues_and_prs(base_url, contributors, headers, None)
+                collect_issues_and_prs(base_url, contributors, session, None)
 
     def test_collect_discussions_api_error(self) -> None:
         """Test handling of API errors in collect_discussions."""
         repo = "owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
-        with patch(
-            "requests.post", side_effect=requests.RequestException("GraphQL Error")
+        with patch.object(
+            session, "post", side_effect=requests.RequestException("GraphQL Error")
         ), patch("click.echo"):
             with pytest.raises(requests.RequestException):
-                collect_discussions(repo, contributors, headers, None)
+                collect_discussions(repo, contributors, session, None)
 
     def test_collect_issues_and_prs_http_error(self) -> None:
         """Test handling of HTTP errors in collect_issues_and_prs."""
         base_url = f"{GITHUB_API_URL}/repos/owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+        mock_response = Mock(
+            status_code=404, url=base_url, headers={}, content=b"", from_cache=False
+        )
+        mock_response.json.return_value = {"message": "Moved"}
 
-        with patch("requests.get", return_value=mock_response), patch("click.echo"):
-            with pytest.raises(requests.HTTPError):
-                collect_issues_and_prs(base_url, contributors, headers, None)
+        with patch(
+            "requests_cache.session.CachedSession.request", return_value=mock_response
+        ), patch("click.echo"):
+            with pytest.raises(GitHubApiError):
+                collect_issues_and_prs(base_url, contributors, session, None)
 
     def test_collect_discussions_http_error(self) -> None:
         """Test handling of HTTP errors in collect_discussions."""
         repo = "owner/repo"
         contributors = Contributors()
-        headers = {"Authorization": "token fake_token"}
+        session = GitHubSession(None, backend="memory")
 
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.HTTPError("403 Forbidden")
+        mock_response = Mock(
+            status_code=403,
+            url=GITHUB_GRAPHQL_URL,
+            headers={},
+            content=b"",
+            from_cache=False,
+        )
 
-        with patch("requests.post", return_value=mock_response), patch("click.echo"):
-            with pytest.raises(requests.HTTPError):
-                collect_discussions(repo, contributors, headers, None)
+        with patch(
+            "requests_cache.session.CachedSession.request", return_value=mock_response
+        ), patch("click.echo"):
+            with pytest.raises(GitHubApiError):
+                collect_discussions(repo, contributors, session, None)
 
 
 class TestConstants:
@@ -724,8 +743,5 @@ class TestConstants:
 
     def test_constants_defined(self) -> None:
         """Test that all expected constants are defined."""
-        assert GITHUB_API_URL == "https://api.github.com"
-        assert GITHUB_GRAPHQL_URL == "https://api.github.com/graphql"
-        assert REQUEST_TIMEOUT == 10
         assert HTTP_NOT_FOUND == 404
         assert UNSUPPORTED_GIT_URL_ERROR == "Unsupported Git remote URL format"
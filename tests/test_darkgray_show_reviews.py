@@ -0,0 +1,208 @@
+"""Tests for the `darkgray_dev_tools.darkgray_show_reviews` module."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from darkgray_dev_tools.darkgray_show_reviews import (
+    fetch_reviews_concurrently,
+    get_approved_reviews,
+    get_repositories,
+    iter_review_pages_concurrently,
+    show_reviews,
+)
+from darkgray_dev_tools.exceptions import GitHubApiError, GitHubApiNotFoundError
+
+
+def make_pr(
+    number: int, updated_at: str, reviewer: str | None = None
+) -> dict[str, object]:
+    """Create a pull request node as returned by the GitHub GraphQL API."""
+    reviews = [{"author": {"login": reviewer}, "submittedAt": updated_at}]
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "updatedAt": updated_at,
+        "reviews": {"nodes": reviews if reviewer else []},
+    }
+
+
+def make_page(prs: list[dict[str, object]], end_cursor: str | None) -> Mock:
+    """Create a response with one page of pull request search results."""
+    response = Mock(status_code=200)
+    response.json.return_value = {
+        "data": {
+            "search": {
+                "pageInfo": {
+                    "hasNextPage": end_cursor is not None,
+                    "endCursor": end_cursor,
+                },
+                "nodes": prs,
+            }
+        }
+    }
+    return response
+
+
+def test_get_approved_reviews_search_query() -> None:
+    """Pull requests are narrowed down using a GitHub search query."""
+    session = Mock()
+    session.graphql.return_value = make_page(
+        [make_pr(3, "2024-03-01T00:00:00Z", "alice")], end_cursor=None
+    )
+
+    result = get_approved_reviews(
+        session, "owner/repo", since=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+
+    assert [review.pr_number for review in result] == [3]
+    assert session.graphql.call_args.args[1]["query"] == (
+        "repo:owner/repo is:pr review:approved"
+        " updated:>=2024-01-01T00:00:00Z sort:updated-desc"
+    )
+
+
+def test_get_approved_reviews_result_limit() -> None:
+    """The search continues from the oldest result after the search result limit."""
+    session = Mock()
+    session.graphql.side_effect = [
+        make_page([make_pr(4, "2024-04-01T00:00:00Z", "alice")], end_cursor="page2"),
+        make_page([make_pr(3, "2024-03-01T00:00:00Z", "bob")], end_cursor=None),
+        make_page(
+            [
+                make_pr(3, "2024-03-01T00:00:00Z", "bob"),
+                make_pr(2, "2024-02-01T00:00:00Z", "carol"),
+            ],
+            end_cursor=None,
+        ),
+        make_page([make_pr(2, "2024-02-01T00:00:00Z", "carol")], end_cursor=None),
+    ]
+
+    with patch("darkgray_dev_tools.darkgray_show_reviews.SEARCH_RESULT_LIMIT", 2):
+        result = get_approved_reviews(session, "owner/repo")
+
+    assert [review.pr_number for review in result] == [4, 3, 2]
+    assert session.graphql.call_count == 4
+    assert session.graphql.call_args.args[1] == {
+        "query": (
+            "repo:owner/repo is:pr review:approved"
+            " updated:<=2024-02-01T00:00:00Z sort:updated-desc"
+        ),
+        "cursor": None,
+    }
+
+
+def test_fetch_reviews_concurrently() -> None:
+    """Reviews from all repositories are combined, excluding each repository owner."""
+    session = Mock()
+    session.graphql.side_effect = lambda *_args: make_page(
+        [
+            make_pr(1, "2024-03-01T00:00:00Z", "alice"),
+            make_pr(2, "2024-03-02T00:00:00Z", "one"),
+        ],
+        end_cursor=None,
+    )
+
+    result = fetch_reviews_concurrently(
+        session, {"one/repo": None, "two/repo": None}, include_owner=False
+    )
+
+    assert sorted((review.repository, review.reviewer) for review in result) == [
+        ("one/repo", "alice"),
+        ("two/repo", "alice"),
+        ("two/repo", "one"),
+    ]
+    assert not any(
+        "reviewed-by" in call.args[1]["query"]
+        for call in session.graphql.call_args_list
+    )
+
+
+def test_iter_review_pages_concurrently_error() -> None:
+    """A failure to fetch one repository is raised, and stops the other fetches."""
+
+    def graphql(_query: str, variables: dict[str, str]) -> Mock:
+        if "bad/repo" in variables["query"]:
+            raise GitHubApiError(Mock(status_code=502))
+        return make_page([make_pr(1, "2024-03-01T00:00:00Z", "alice")], "next")
+
+    session = Mock()
+    session.graphql.side_effect = graphql
+
+    with pytest.raises(GitHubApiError):
+        for _ in iter_review_pages_concurrently(
+            session, {"good/repo": None, "bad/repo": None}
+        ):
+            pass
+
+
+def test_show_reviews_ndjson() -> None:
+    """Reviews are streamed as JSON lines in the order they are received."""
+    session = Mock()
+    session.graphql.side_effect = [
+        make_page([make_pr(1, "2024-01-01T00:00:00Z", "alice")], end_cursor="page2"),
+        make_page([make_pr(2, "2024-02-01T00:00:00Z", "bob")], end_cursor=None),
+    ]
+
+    with patch(
+        "darkgray_dev_tools.github_session.GitHubSession", return_value=session
+    ):
+        result = CliRunner().invoke(
+            show_reviews,
+            ["--token=t", "--repo=me/repo", "--include-owner", "--format=ndjson"],
+        )
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [
+        (
+            '{"repository": "me/repo", "pr_number": 1, "pr_title": "PR 1",'
+            ' "approved_by": "alice", "timestamp": "2024-01-01T00:00:00+00:00"}'
+        ),
+        (
+            '{"repository": "me/repo", "pr_number": 2, "pr_title": "PR 2",'
+            ' "approved_by": "bob", "timestamp": "2024-02-01T00:00:00+00:00"}'
+        ),
+    ]
+
+
+def test_show_reviews_org_without_repositories() -> None:
+    """An organisation without any repositories to report on is a usage error."""
+    with patch("darkgray_dev_tools.github_session.GitHubSession"), patch(
+        "darkgray_dev_tools.darkgray_show_reviews.get_repositories", return_value=[]
+    ), patch(
+        "darkgray_dev_tools.darkgray_show_reviews.get_github_repository"
+    ) as get_github_repository:
+        result = CliRunner().invoke(show_reviews, ["--token=t", "--org=me"])
+
+    assert result.exit_code == click.UsageError.exit_code
+    assert "No repositories to report on found for --org=me" in result.output
+    get_github_repository.assert_not_called()
+
+
+def test_get_repositories() -> None:
+    """Forks and archived repositories are skipped, and all pages are fetched."""
+    first_page = Mock()
+    first_page.json.return_value = [
+        {"full_name": "me/one", "fork": False, "archived": False},
+        {"full_name": "me/fork", "fork": True, "archived": False},
+    ]
+    second_page = Mock()
+    second_page.json.return_value = [
+        {"full_name": "me/old", "fork": False, "archived": True},
+        {"full_name": "me/two", "fork": False, "archived": False},
+    ]
+    session = Mock()
+    session.iter_pages.side_effect = [
+        GitHubApiNotFoundError(),
+        iter([first_page, second_page]),
+    ]
+
+    result = get_repositories(session, "me")
+
+    assert result == ["me/one", "me/two"]
+    assert session.iter_pages.call_args_list[1].args == ("/users/me/repos",)
@@ -0,0 +1,127 @@
+"""Tests for the `darkgray_dev_tools.darkgray_update_contributors` module."""
+
+from __future__ import annotations
+
+import re
+from unittest.mock import Mock
+
+import pytest
+
+from darkgray_dev_tools.darkgray_update_contributors import (
+    CONTRIBUTION_SEARCHES,
+    Configuration,
+    Contribution,
+    ContributionVerifier,
+    verify_contributions,
+)
+from darkgray_dev_tools.exceptions import GitHubApiError
+
+AUTHORS = {"alice": 3, "bob": 1, "carol": 0, "dave": 2}
+REVIEWERS = {"alice": 1, "bob": 0, "carol": 4}
+
+
+def make_session(*, unknown_users: tuple[str, ...] = ()) -> Mock:
+    """Create a fake GitHub session which answers search requests from fake data."""
+
+    def get(endpoint: str, params: dict[str, str]) -> Mock:
+        qualifier, counts = (
+            ("reviewed-by", REVIEWERS)
+            if "reviewed-by:" in params["q"]
+            else ("author", AUTHORS)
+        )
+        logins = re.findall(rf"{qualifier}:(\w+)", params["q"])
+        if any(login in unknown_users for login in logins):
+            raise GitHubApiError(Mock(status_code=422, text="", url=endpoint))
+        items = [
+            {"user": {"login": login.upper()}}
+            for login in logins
+            for _ in range(counts.get(login, 0))
+        ]
+        response = Mock()
+        response.json.return_value = {"total_count": len(items), "items": items}
+        return response
+
+    return Mock(get=Mock(side_effect=get))
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        search="pulls-author",
+        logins=["alice", "bob", "carol", "dave"],
+        expect={"alice", "bob", "dave"},
+        expect_requests=2,
+    ),
+    dict(
+        search="pulls-author",
+        logins=["carol"],
+        expect=set(),
+        expect_requests=1,
+    ),
+    dict(
+        search="pulls-reviewed",
+        logins=["alice", "bob", "carol"],
+        expect={"alice", "carol"},
+        expect_requests=3,
+    ),
+    dict(
+        search="pulls-reviewed",
+        logins=["bob"],
+        expect=set(),
+        expect_requests=1,
+    ),
+)
+def test_find_contributors(
+    search: str, logins: list[str], expect: set[str], expect_requests: int
+) -> None:
+    """Users are found with batched queries, or one by one if results can't tell."""
+    session = make_session()
+
+    result = ContributionVerifier(session, ["owner/repo"]).find_contributors(
+        CONTRIBUTION_SEARCHES[search], logins
+    )
+
+    assert result == expect
+    assert session.get.call_count == expect_requests
+
+
+def test_find_contributors_unknown_user() -> None:
+    """A batch rejected because of a non-existent user is split to find the user."""
+    session = make_session(unknown_users=("ghost",))
+
+    result = ContributionVerifier(session, ["owner/repo"]).find_contributors(
+        CONTRIBUTION_SEARCHES["issues"], ["alice", "ghost", "bob"]
+    )
+
+    assert result == {"alice", "bob"}
+
+
+def test_verify_contributions() -> None:
+    """Unverifiable and mismatched contribution claims are reported."""
+    users_and_contributions = {
+        "alice": [Contribution("Code", "pulls-author")],
+        "carol": [
+            Contribution("Code", "pulls-author"),
+            Contribution("Reviewed Pull Requests", "pulls-reviewed"),
+        ],
+        "dave": [
+            Contribution("Maintenance", "pulls-author"),
+            Contribution("Bug reports", "search-discussions"),
+        ],
+    }
+
+    result = verify_contributions(
+        users_and_contributions, Configuration(["owner/repo"]), make_session()
+    )
+
+    assert result == [
+        (
+            "carol",
+            Contribution("Code", "pulls-author"),
+            "no matching contributions found",
+        ),
+        (
+            "dave",
+            Contribution("Maintenance", "pulls-author"),
+            "type not supported by the link type",
+        ),
+    ]
@@ -0,0 +1,126 @@
+"""Tests for the `darkgray_dev_tools.file_patterns` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from darkgray_dev_tools.exceptions import NoMatchError
+from darkgray_dev_tools.file_patterns import (
+    expand_glob,
+    find_literal_prefixes,
+    literal_prefix,
+)
+from darkgray_dev_tools.version_replace import do_replacements
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = [
+    "README.rst",
+    "docs/index.rst",
+    "docs/api/module.rst",
+    "docs/api/deep/nested.rst",
+    "docs/conf.py",
+    "docs/.hidden/skipped.rst",
+]
+
+
+@pytest.fixture
+def tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create a directory tree with documentation files, and change into it."""
+    for path in FILES:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("compare/v1.0...HEAD\n")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        pattern="docs/**/*.rst",
+        expect=["docs/api/deep/nested.rst", "docs/api/module.rst", "docs/index.rst"],
+    ),
+    dict(pattern="docs/*.rst", expect=["docs/index.rst"]),
+    dict(pattern="docs/*/*.rst", expect=["docs/api/module.rst"]),
+    dict(pattern="*.rst", expect=["README.rst"]),
+    dict(pattern="**/conf.py", expect=["docs/conf.py"]),
+    dict(pattern="docs/[!i]*.*", expect=["docs/conf.py"]),
+)
+@pytest.mark.usefixtures("tree")
+def test_expand_glob(pattern: str, expect: list[str]) -> None:
+    """Glob patterns are expanded into matching files, skipping hidden directories."""
+    result = expand_glob(pattern)
+
+    assert result == expect
+
+
+@pytest.mark.kwparametrize(
+    dict(template=r"^__version__ *= *{old_version->new_version}", expect="__version__"),
+    dict(template=r"compare/v{old_version->new_version}\.\.\.HEAD", expect="compare/v"),
+    dict(template=r"\.\. version {any_version->new_version}", expect=".. version "),
+    dict(template=r"ab+c{any_version->new_version}", expect="ab"),
+    dict(template=r"ab{2}c{any_version->new_version}", expect="a"),
+    dict(template=r"(?i)abc{any_version->new_version}", expect=""),
+    dict(template=r"\dabc{any_version->new_version}", expect=""),
+    dict(template=r"a\|b|c{any_version->new_version}", expect=""),
+)
+def test_literal_prefix(template: str, expect: str) -> None:
+    """The literal prefix stops at the first non-literal or optional character."""
+    result = literal_prefix(template)
+
+    assert result == expect
+
+
+def test_find_literal_prefixes(tmp_path: Path) -> None:
+    """Templates are returned if their literal prefixes are found in the file."""
+    (tmp_path / "empty").write_bytes(b"")
+    (tmp_path / "file").write_bytes("ä compare/v1.0".encode())
+    prefixes = {"a": b"compare/v", "b": b"__version__", "c": b""}
+
+    assert find_literal_prefixes(tmp_path / "file", prefixes) == {"a", "c"}
+    assert find_literal_prefixes(tmp_path / "empty", prefixes) == {"c"}
+
+
+def test_do_replacements_glob(tree: Path) -> None:
+    """Files matching a glob are replaced only where the templates match."""
+    (tree / "docs/conf.py").write_text("nothing to see here\n")
+
+    do_replacements(
+        {"docs/**/*.*": [r"compare/v{any_version->new_version}\.\.\.HEAD"]},
+        {
+            "any_version": r"\d+(?:\.\d+)*",
+            "old_version": r"1\.0",
+            "new_version": r"1\.1",
+            "any_milestone": r"\d+",
+        },
+        {"new_version": "1.1", "next_version": "1.2", "next_milestone": "15"},
+        dry_run=False,
+    )
+
+    assert {path: (tree / path).read_text() for path in FILES} == {
+        "README.rst": "compare/v1.0...HEAD\n",
+        "docs/index.rst": "compare/v1.1...HEAD\n",
+        "docs/api/module.rst": "compare/v1.1...HEAD\n",
+        "docs/api/deep/nested.rst": "compare/v1.1...HEAD\n",
+        "docs/conf.py": "nothing to see here\n",
+        "docs/.hidden/skipped.rst": "compare/v1.0...HEAD\n",
+    }
+
+
+@pytest.mark.usefixtures("tree")
+def test_do_replacements_glob_no_match() -> None:
+    """An exception is raised if a glob template doesn't match in any of the files."""
+    with pytest.raises(NoMatchError, match=r"Can't find `v\{.*` in `docs/\*\.rst`"):
+        do_replacements(
+            {"docs/*.rst": ["v{old_version->new_version}-final"]},
+            {
+                "any_version": r"\d+(?:\.\d+)*",
+                "old_version": r"1\.0",
+                "new_version": r"1\.1",
+                "any_milestone": r"\d+",
+            },
+            {"new_version": "1.1", "next_version": "1.2", "next_milestone": "15"},
+            dry_run=False,
+        )
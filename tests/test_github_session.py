@@ -0,0 +1,189 @@
+"""Tests for the `darkgray_dev_tools.github_session` module."""
+
+from __future__ import annotations
+
+from unittest.mock import Mock, patch
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+from darkgray_dev_tools.exceptions import GitHubApiError
+from darkgray_dev_tools.github_session import (
+    GITHUB_GRAPHQL_URL,
+    POOL_MAXSIZE,
+    RATE_LIMIT_RETRIES,
+    REQUEST_TIMEOUT,
+    RETRY,
+    GitHubSession,
+)
+from darkgray_dev_tools.metrics import Metrics
+from darkgray_dev_tools.rate_limit import SECONDARY_LIMIT_WAIT
+
+
+def make_response(
+    json: object,
+    links: dict[str, dict[str, str]] | None = None,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Mock:
+    """Create a mock response with the given JSON content."""
+    response = Mock(
+        status_code=status_code,
+        links=links or {},
+        headers=headers or {},
+        content=b"[]",
+        from_cache=False,
+    )
+    response.json.return_value = json
+    return response
+
+
+def test_connection_pool() -> None:
+    """HTTPS connections are pooled with a per-host limit, and requests are retried."""
+    session = GitHubSession("t", backend="memory")
+
+    adapter = session.get_adapter("https://api.github.com/")
+
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == POOL_MAXSIZE
+    assert adapter._pool_block is True
+    assert adapter.max_retries is RETRY
+
+
+def test_request_defaults() -> None:
+    """API paths get the server name, an authorization header and a timeout."""
+    session = GitHubSession("t", backend="memory")
+
+    with patch(
+        "requests_cache.session.CachedSession.request",
+        return_value=make_response([]),
+    ) as request:
+        session.get("/user")
+
+    assert request.call_args.args == ("GET", "https://api.github.com/user")
+    assert request.call_args.kwargs["headers"] == {"Authorization": "token t"}
+    assert request.call_args.kwargs["timeout"] == REQUEST_TIMEOUT
+
+
+def test_iter_pages() -> None:
+    """Pages are fetched by following ``next`` links, only as far as consumed."""
+    session = GitHubSession(None, backend="memory")
+    pages = [
+        make_response([1], {"next": {"url": "https://api.github.com/p2"}}),
+        make_response([2], {"next": {"url": "https://api.github.com/p3"}}),
+        make_response([3]),
+    ]
+
+    with patch.object(session, "get", side_effect=pages) as get:
+        result = [response.json() for response in session.iter_pages("/items")]
+
+    assert result == [[1], [2], [3]]
+    assert [call.args for call in get.call_args_list] == [
+        ("/items",),
+        ("https://api.github.com/p2",),
+        ("https://api.github.com/p3",),
+    ]
+
+    with patch.object(session, "get", side_effect=pages) as get:
+        next(session.iter_pages("/items"))
+
+    assert get.call_count == 1
+
+
+@pytest.mark.kwparametrize(
+    dict(content={"data": {"viewer": {"login": "me"}}}, expect_error=False),
+    dict(content={"data": None, "errors": [{"message": "bad"}]}, expect_error=True),
+)
+def test_graphql(content: dict[str, object], *, expect_error: bool) -> None:
+    """GraphQL queries are posted with their variables, and errors are raised."""
+    session = GitHubSession(None, backend="memory")
+    response = make_response(content)
+
+    with patch.object(session, "post", return_value=response) as post:
+        if expect_error:
+            with pytest.raises(GitHubApiError):
+                session.graphql("query { viewer { login } }", {"a": 1})
+        else:
+            assert session.graphql("query { viewer { login } }", {"a": 1}) is response
+
+    post.assert_called_once_with(
+        GITHUB_GRAPHQL_URL,
+        json={"query": "query { viewer { login } }", "variables": {"a": 1}},
+    )
+
+
+def test_request_rate_limited() -> None:
+    """Rate limited requests are retried after the wait reported by GitHub."""
+    session = GitHubSession(None, backend="memory")
+    limited = make_response(
+        {"message": "You have exceeded a secondary rate limit."},
+        status_code=403,
+        headers={"Retry-After": "0"},
+    )
+
+    with patch(
+        "requests_cache.session.CachedSession.request",
+        side_effect=[limited, make_response([1])],
+    ) as request:
+        response = session.get("/user")
+
+    assert response.json() == [1]
+    assert [call.args for call in request.call_args_list] == [
+        ("GET", "https://api.github.com/user"),
+        ("GET", "https://api.github.com/user"),
+    ]
+    assert session.scheduler.concurrency < POOL_MAXSIZE
+
+
+def test_request_rate_limit_retries() -> None:
+    """Requests which stay rate limited fail after a limited number of retries."""
+    session = GitHubSession(None, backend="memory")
+    limited = make_response(
+        {"message": ""}, status_code=429, headers={"Retry-After": "0"}
+    )
+
+    with patch(
+        "requests_cache.session.CachedSession.request", return_value=limited
+    ) as request, pytest.raises(GitHubApiError):
+        session.get("/user")
+
+    assert request.call_count == RATE_LIMIT_RETRIES + 1
+
+
+def test_graphql_rate_limited() -> None:
+    """GraphQL queries are retried if the response reports a rate limit error."""
+    session = GitHubSession(None, backend="memory")
+    limited = make_response({"errors": [{"type": "RATE_LIMITED", "message": "x"}]})
+    success = make_response({"data": {"viewer": {"login": "me"}}})
+
+    with patch.object(session, "post", side_effect=[limited, success]), patch.object(
+        session.scheduler, "pause"
+    ) as pause:
+        result = session.graphql("query { viewer { login } }", {})
+
+    assert result is success
+    pause.assert_called_once_with(SECONDARY_LIMIT_WAIT)
+
+
+def test_request_metrics() -> None:
+    """Requests are recorded into the metrics of the run."""
+    session = GitHubSession(None, backend="memory")
+    metrics = Metrics()
+    response = make_response(
+        [],
+        headers={
+            "X-RateLimit-Resource": "core",
+            "X-RateLimit-Reset": "100",
+            "X-RateLimit-Used": "4",
+        },
+    )
+
+    with patch(
+        "darkgray_dev_tools.github_session.get_metrics", return_value=metrics
+    ), patch("requests_cache.session.CachedSession.request", return_value=response):
+        session.get("/users/octocat")
+
+    assert list(metrics.endpoints) == ["GET api.github.com/users/{name}"]
+    result = metrics.to_dict()
+    assert result["bytes"] == len(b"[]")
+    assert result["rate_limit_used"] == {"core": 1}
@@ -0,0 +1,175 @@
+"""Tests for the `darkgray_dev_tools.metrics` module."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from darkgray_dev_tools.metrics import (
+    Metrics,
+    endpoint_name,
+    get_metrics,
+    metrics_option,
+    phase,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        method="GET",
+        url="https://api.github.com/users/octocat",
+        expect="GET api.github.com/users/{name}",
+    ),
+    dict(
+        method="GET",
+        url="https://api.github.com/search/issues?q=repo:o/r",
+        expect="GET api.github.com/search/issues",
+    ),
+    dict(
+        method="POST",
+        url="https://api.github.com/graphql",
+        expect="POST api.github.com/graphql",
+    ),
+    dict(
+        method="GET",
+        url="https://api.github.com/repos/o/r/issues/12/comments",
+        expect="GET api.github.com/repos/{owner}/{repo}/issues/{number}/comments",
+    ),
+)
+def test_endpoint_name(method: str, url: str, expect: str) -> None:
+    """Names and numbers in request paths are replaced with placeholders."""
+    result = endpoint_name(method, url)
+
+    assert result == expect
+
+
+def test_record_request() -> None:
+    """Requests are counted per endpoint, with bytes only counted for cache misses."""
+    metrics = Metrics(clock=lambda: 0.0)
+
+    metrics.record_request(
+        "GET a", status_code=200, size=100, latency=0.02, from_cache=False
+    )
+    metrics.record_request(
+        "GET a", status_code=200, size=100, latency=0.001, from_cache=True
+    )
+    metrics.record_request(
+        "GET b", status_code=500, size=10, latency=60.0, from_cache=False
+    )
+
+    result = metrics.to_dict()
+
+    assert result["requests"] == len(["a", "a", "b"])
+    assert result["bytes"] == sum([100, 10])
+    assert result["cache_hit_ratio"] == pytest.approx(1 / 3)
+    assert result["endpoints"] == {
+        "GET a": {
+            "requests": 2,
+            "errors": 0,
+            "cache_hits": 1,
+            "cache_misses": 1,
+            "bytes": 100,
+            "latency_seconds": 0.021,
+            "latency_histogram": {
+                "0.01": 1,
+                "0.025": 1,
+                **dict.fromkeys(["0.05", "0.1", "0.25", "0.5", "1.0"], 0),
+                **dict.fromkeys(["2.5", "5.0", "10.0", "inf"], 0),
+            },
+        },
+        "GET b": {
+            "requests": 1,
+            "errors": 1,
+            "cache_hits": 0,
+            "cache_misses": 1,
+            "bytes": 10,
+            "latency_seconds": 60.0,
+            "latency_histogram": {
+                **dict.fromkeys(["0.01", "0.025", "0.05", "0.1", "0.25"], 0),
+                **dict.fromkeys(["0.5", "1.0", "2.5", "5.0", "10.0"], 0),
+                "inf": 1,
+            },
+        },
+    }
+
+
+def test_record_rate_limit() -> None:
+    """Rate limit points are counted per resource, over several reset windows."""
+    metrics = Metrics()
+    for resource, reset, used in [
+        ("core", "100", "7"),
+        ("core", "100", "9"),
+        ("core", "200", "1"),
+        ("search", "100", "3"),
+    ]:
+        metrics.record_rate_limit(
+            {
+                "X-RateLimit-Resource": resource,
+                "X-RateLimit-Reset": reset,
+                "X-RateLimit-Used": used,
+            }
+        )
+    metrics.record_rate_limit({})
+
+    result = metrics.to_dict()
+
+    assert result["rate_limit_used"] == {"core": 3 + 1, "search": 1}
+
+
+def test_phase() -> None:
+    """The wall time and number of entries of each phase are summed up."""
+    times = iter([0.0, 1.0, 3.0, 4.0, 5.0, 5.0, 5.5, 10.0])
+    metrics = Metrics(clock=lambda: next(times))
+
+    for name in ["fetch", "write", "fetch"]:
+        with metrics.phase(name):
+            pass
+    result = metrics.to_dict()
+
+    assert result == {
+        **result,
+        "wall_time_seconds": 10.0,
+        "phases": {
+            "fetch": {"seconds": 2.5, "count": 2},
+            "write": {"seconds": 1.0, "count": 1},
+        },
+    }
+
+
+@click.command()
+@metrics_option
+def fetch_something() -> None:
+    """Record one phase and one request into the metrics of the current run."""
+    with phase("fetch"):
+        get_metrics().record_request(
+            "GET x", status_code=200, size=5, latency=0.1, from_cache=False
+        )
+
+
+def test_metrics_option(tmp_path: Path) -> None:
+    """The ``--metrics`` option writes metrics of the run into a JSON file."""
+    path = tmp_path / "metrics.json"
+
+    result = CliRunner().invoke(fetch_something, ["--metrics", str(path)])
+
+    assert result.exit_code == 0
+    metrics = json.loads(path.read_text())
+    assert metrics["requests"] == 1
+    assert list(metrics["phases"]) == ["fetch"]
+
+
+def test_metrics_option_not_given() -> None:
+    """Without ``--metrics``, no file is written."""
+    with patch.object(Metrics, "write") as write:
+        result = CliRunner().invoke(fetch_something, [])
+
+    assert result.exit_code == 0
+    write.assert_not_called()
@@ -0,0 +1,90 @@
+"""Tests for the `darkgray_dev_tools.milestones` module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+from packaging.version import Version
+
+from darkgray_dev_tools.darkgray_bump_version import bump_version
+from darkgray_dev_tools.milestones import (
+    MILESTONE_SNAPSHOT_PATH,
+    get_milestone_numbers,
+    load_milestone_snapshot,
+)
+from darkgray_dev_tools.version_replace import get_replacements
+
+
+def test_get_milestone_numbers_pagination() -> None:
+    """All pages of milestones are fetched, with an explicit state and page size."""
+    first_page = Mock()
+    first_page.json.return_value = [{"title": "Darker 1.1.0", "number": 11}]
+    second_page = Mock()
+    second_page.json.return_value = [
+        {"title": "Darker 1.2.0 - big changes", "number": 12}
+    ]
+    session = Mock()
+    session.iter_pages.return_value = iter([first_page, second_page])
+
+    with patch(
+        "darkgray_dev_tools.milestones.get_repo_url",
+        return_value="https://github.com/me/repo",
+    ):
+        result = get_milestone_numbers(None, state="all", session=session)
+
+    assert result == {Version("1.1.0"): "11", Version("1.2.0"): "12"}
+    session.iter_pages.assert_called_once_with(
+        "/repos/me/repo/milestones", params={"state": "all", "per_page": 100}
+    )
+
+
+def test_get_milestone_numbers_unexpected_response() -> None:
+    """A non-list JSON response is reported."""
+    response = Mock()
+    response.json.return_value = {"message": "Moved Permanently"}
+    session = Mock()
+    session.iter_pages.return_value = iter([response])
+
+    with patch(
+        "darkgray_dev_tools.milestones.get_repo_url",
+        return_value="https://github.com/me/repo",
+    ), pytest.raises(TypeError, match="Expected a JSON list"):
+        get_milestone_numbers(None, session=session)
+
+
+def test_refresh_milestones_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A refreshed snapshot is used by dry runs instead of the GitHub API."""
+    monkeypatch.chdir(tmp_path)
+    Path("release_tools").mkdir()
+    Path("__init__.py").write_text('__version__ = "1.0.0"\n')
+    with patch(
+        "darkgray_dev_tools.darkgray_bump_version.get_milestone_titles",
+        return_value={"Darker 1.1.0": "11", "Darker 1.2.0 - next": "12"},
+    ):
+        result = CliRunner().invoke(bump_version, ["refresh-milestones"])
+
+    assert result.exit_code == 0, result.output
+    assert load_milestone_snapshot(MILESTONE_SNAPSHOT_PATH) == {
+        Version("1.1.0"): "11",
+        Version("1.2.0"): "12",
+    }
+
+    with patch(
+        "darkgray_dev_tools.version_replace.get_milestone_numbers"
+    ) as get_milestone_numbers_mock:
+        _, replacements, new_version = get_replacements(
+            {"__init__.py": {'^__version__ = "{old_version->new_version}"'}},
+            increment_major=False,
+            increment_minor=True,
+            dry_run=True,
+            milestones_file=MILESTONE_SNAPSHOT_PATH,
+        )
+
+    get_milestone_numbers_mock.assert_not_called()
+    assert new_version == Version("1.1.0")
+    assert replacements["next_milestone"] == "12"
@@ -0,0 +1,189 @@
+"""Tests for the `darkgray_dev_tools.package_index` module."""
+
+from __future__ import annotations
+
+from email.message import Message
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
+
+import pytest
+from click.testing import CliRunner
+from packaging.version import Version
+
+from darkgray_dev_tools.darkgray_suggest_constraint import suggest_constraint
+from darkgray_dev_tools.package_index import (
+    CachedVersion,
+    find_latest_release,
+    get_latest_version,
+    get_latest_versions,
+    get_wheelhouse_versions,
+    load_version_cache,
+    save_version_cache,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SIMPLE_HTML = """\
+<!DOCTYPE html>
+<html><body>
+<a href="../../packages/pkg-1.0.tar.gz#sha256=00">pkg-1.0.tar.gz</a>
+<a href="../../packages/pkg-1.1-py3-none-any.whl" data-yanked="">
+pkg-1.1-py3-none-any.whl</a>
+<a href="../../packages/pkg-1.2b1.tar.gz">pkg-1.2b1.tar.gz</a>
+</body></html>
+"""
+
+
+@pytest.mark.kwparametrize(
+    dict(project={"versions": ["1.0", "1.10", "1.9"]}, expect="1.10"),
+    dict(project={"versions": ["1.0", "2.0rc1", "2.0.dev1"]}, expect="1.0"),
+    dict(
+        project={
+            "versions": ["1.0", "1.1"],
+            "files": [
+                {"filename": "pkg-1.0.tar.gz"},
+                {"filename": "pkg-1.1.tar.gz", "yanked": True},
+                {"filename": "pkg-1.1-py3-none-any.whl", "yanked": "broken"},
+            ],
+        },
+        expect="1.0",
+    ),
+    dict(
+        project={
+            "versions": ["1.0", "1.1"],
+            "files": [
+                {"filename": "pkg-1.1.tar.gz", "yanked": True},
+                {"filename": "pkg-1.1-py3-none-any.whl"},
+            ],
+        },
+        expect="1.1",
+    ),
+    dict(
+        project={
+            "files": [
+                {"filename": "pkg-1.0.tar.gz"},
+                {"filename": "pkg-1.2-py3-none-any.whl"},
+                {"filename": "pkg-1.3.exe"},
+            ]
+        },
+        expect="1.2",
+    ),
+)
+def test_find_latest_release(project: dict[str, object], expect: str) -> None:
+    """Pre-releases and releases with only yanked files are skipped."""
+    result = find_latest_release(project)  # type: ignore[arg-type]
+
+    assert result == Version(expect)
+
+
+def test_get_latest_version_not_modified() -> None:
+    """If the ETag still matches, the cached version is returned."""
+    cached = CachedVersion('"etag"', "1.0")
+    not_modified = HTTPError("https://pypi.org/simple/pkg/", 304, "", Message(), None)
+
+    with patch("urllib.request.urlopen", side_effect=not_modified) as urlopen:
+        result = get_latest_version("Pkg", cached)
+
+    assert result is cached
+    request = urlopen.call_args.args[0]
+    assert request.full_url == "https://pypi.org/simple/pkg/"
+    assert request.get_header("If-none-match") == '"etag"'
+    assert request.get_header("Accept").startswith(
+        "application/vnd.pypi.simple.v1+json,"
+    )
+
+
+def test_version_cache(tmp_path: Path) -> None:
+    """The version cache is saved and loaded, and an invalid cache file is ignored."""
+    path = tmp_path / "cache" / "versions.json"
+    save_version_cache(path, {"pkg": CachedVersion('"etag"', "1.0")})
+
+    assert load_version_cache(path) == {"pkg": CachedVersion('"etag"', "1.0")}
+
+    path.write_text("[]")
+
+    assert load_version_cache(path) == {}
+
+
+def test_save_version_cache_error(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A cache file which can't be written is reported, and doesn't stop the run."""
+    (tmp_path / "cache").write_text("not a directory")
+    path = tmp_path / "cache" / "versions.json"
+
+    save_version_cache(path, {"pkg": CachedVersion('"etag"', "1.0")})
+
+    error = capsys.readouterr().err
+    assert error.startswith(f"Warning: couldn't write the version cache {path}: ")
+    assert load_version_cache(path) == {}
+
+
+def test_get_latest_version_html() -> None:
+    """An index responding with PEP 503 HTML is supported."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.read.return_value = SIMPLE_HTML.encode()
+    response.headers = {"Content-Type": "text/html", "ETag": '"html"'}
+
+    with patch("urllib.request.urlopen", return_value=response) as urlopen:
+        result = get_latest_version("pkg", index_url="https://mirror.example/simple/")
+
+    assert result == CachedVersion('"html"', "1.0")
+    assert urlopen.call_args.args[0].full_url == "https://mirror.example/simple/pkg/"
+
+
+def test_get_latest_versions_local_index(tmp_path: Path) -> None:
+    """A local simple index directory is read without network access or caching."""
+    (tmp_path / "simple" / "pkg").mkdir(parents=True)
+    (tmp_path / "simple" / "pkg" / "index.html").write_text(SIMPLE_HTML)
+    cache: dict[str, CachedVersion] = {}
+
+    with patch("urllib.request.urlopen") as urlopen:
+        result = get_latest_versions(["Pkg"], cache, (tmp_path / "simple").as_uri())
+
+    assert result == [Version("1.0")]
+    assert cache == {}
+    urlopen.assert_not_called()
+    with pytest.raises(LookupError, match="No files for isort"):
+        get_latest_versions(["isort"], cache, (tmp_path / "simple").as_uri())
+
+
+def test_get_wheelhouse_versions(tmp_path: Path) -> None:
+    """Latest versions are found from file names in a wheelhouse directory."""
+    for filename in [
+        "black-24.1.0-py3-none-any.whl",
+        "black-24.2.0.tar.gz",
+        "black-25.1b1-py3-none-any.whl",
+        "click-8.1.7-py3-none-any.whl",
+        "README.txt",
+    ]:
+        (tmp_path / filename).touch()
+
+    result = get_wheelhouse_versions(tmp_path, ["Black", "click"])
+
+    assert result == [Version("24.2.0"), Version("8.1.7")]
+    with pytest.raises(LookupError, match="No files for isort"):
+        get_wheelhouse_versions(tmp_path, ["isort"])
+
+
+def test_suggest_constraint_find_links(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The ``--find-links`` option uses a wheelhouse instead of a package index."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "x"\ndependencies = ["click>=8"]\n'
+    )
+    (tmp_path / "wheels").mkdir()
+    (tmp_path / "wheels" / "click-8.1.7-py3-none-any.whl").touch()
+    monkeypatch.delenv("GITHUB_STEP_SUMMARY", raising=False)
+
+    with patch("urllib.request.urlopen") as urlopen:
+        result = CliRunner().invoke(suggest_constraint, ["--find-links=wheels"])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.endswith("e.g. click<=8.1.7\n")
+    urlopen.assert_not_called()
@@ -0,0 +1,128 @@
+"""Tests for the `darkgray_dev_tools.profiling` module."""
+
+from __future__ import annotations
+
+import json
+import pstats
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from darkgray_dev_tools.metrics import PHASE_HOOKS, phase
+from darkgray_dev_tools.profiling import profile_option, to_speedscope
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+A = ("a.py", 1, "a")
+B = ("b.py", 2, "b")
+C = ("c.py", 3, "c")
+
+
+def test_to_speedscope() -> None:
+    """Call stacks are reconstructed, dividing time between callers."""
+    stats = {
+        A: (1, 1, 1.0, 4.0, {}),
+        B: (2, 2, 1.0, 3.0, {A: (2, 2, 1.0, 3.0)}),
+        C: (2, 2, 2.0, 2.0, {B: (1, 1, 1.0, 1.0), A: (1, 1, 1.0, 1.0)}),
+    }
+
+    result = to_speedscope({"fetch": stats}, "cmd")
+
+    assert result["shared"] == {
+        "frames": [
+            {"name": "a", "file": "a.py", "line": 1},
+            {"name": "b", "file": "b.py", "line": 2},
+            {"name": "c", "file": "c.py", "line": 3},
+        ]
+    }
+    assert result["profiles"] == [
+        {
+            "type": "sampled",
+            "name": "fetch",
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": 4.0,
+            "samples": [[0], [0, 1], [0, 1, 2], [0, 2]],
+            "weights": [1.0, 1.0, 1.0, 1.0],
+        }
+    ]
+
+
+def render_thread() -> int:
+    """Do some work in a worker thread."""
+    return sum(range(1000))
+
+
+def render_main() -> int:
+    """Do some work in the main thread."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(render_thread).result()
+
+
+@click.command()
+@profile_option
+def render() -> None:
+    """Run a phase which uses a worker thread."""
+    with phase("render"):
+        render_main()
+
+
+def profiled_functions(stats: pstats.Stats) -> set[str]:
+    """Return the names of the functions in profile statistics."""
+    return {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+
+
+def test_profile_pstats(tmp_path: Path) -> None:
+    """The ``--profile`` option writes statistics of the whole run for `pstats`."""
+    path = tmp_path / "profile.prof"
+
+    result = CliRunner().invoke(render, ["--profile", str(path)])
+
+    assert result.exit_code == 0
+    functions = profiled_functions(pstats.Stats(str(path)))
+    assert "render_main" in functions
+    if sys.version_info < (3, 12):
+        assert "render_thread" in functions
+    assert not PHASE_HOOKS
+    assert not (tmp_path / "profile.prof.memory.txt").exists()
+
+
+def test_profile_speedscope(tmp_path: Path) -> None:
+    """Each phase is a separate profile in the speedscope format."""
+    path = tmp_path / "profile.json"
+
+    result = CliRunner().invoke(
+        render, ["--profile", str(path), "--profile-format", "speedscope"]
+    )
+
+    assert result.exit_code == 0
+    speedscope = json.loads(path.read_text())
+    assert speedscope["name"] == "render"
+    assert [profile["name"] for profile in speedscope["profiles"]] == [
+        "run",
+        "render",
+    ]
+
+
+@pytest.mark.kwparametrize(
+    dict(args=["--profile-memory"], expect_report=True),
+    dict(args=[], expect_report=False),
+)
+def test_profile_memory(
+    tmp_path: Path, args: list[str], *, expect_report: bool
+) -> None:
+    """With ``--profile-memory``, the largest allocations of each phase are written."""
+    path = tmp_path / "profile.prof"
+
+    result = CliRunner().invoke(render, ["--profile", str(path), *args])
+
+    assert result.exit_code == 0
+    memory_path = tmp_path / "profile.prof.memory.txt"
+    assert memory_path.exists() == expect_report
+    if expect_report:
+        assert memory_path.read_text().startswith("# render\n")
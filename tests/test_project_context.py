@@ -0,0 +1,74 @@
+"""Tests for the `darkgray_dev_tools.project_context` module."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from darkgray_dev_tools.package_metadata import get_repo_url
+from darkgray_dev_tools.project_context import get_project_context
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PYPROJECT = """\
+[project]
+name = "pkg"
+dependencies = ["click>=8"]
+
+[project.urls]
+Home = "{url}"
+"""
+
+
+def test_get_project_context_shared(tmp_path: Path) -> None:
+    """The same context is returned for the same directory."""
+    context = get_project_context(tmp_path)
+
+    assert get_project_context(tmp_path / "." / ".." / tmp_path.name) is context
+
+
+def test_project_context_cache(tmp_path: Path) -> None:
+    """Files are parsed once, and again after they have been modified."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text(PYPROJECT.format(url="https://github.com/owner/one"))
+    context = get_project_context(tmp_path)
+
+    first = context.pyproject()
+
+    assert context.pyproject() is first
+    assert [span.name for span in context.requirements().requirements] == ["click"]
+
+    path.write_text(PYPROJECT.format(url="https://github.com/owner/two"))
+    mtime_ns = path.stat().st_mtime_ns + 1
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    assert get_repo_url(tmp_path) == "https://github.com/owner/two"
+
+
+def test_get_repo_url_skips_setup_cfg(tmp_path: Path) -> None:
+    """``setup.cfg`` isn't parsed if ``pyproject.toml`` has a GitHub URL."""
+    (tmp_path / "pyproject.toml").write_text(
+        PYPROJECT.format(url="https://github.com/owner/repo")
+    )
+
+    with patch("darkgray_dev_tools.project_context._load_setup_cfg") as load_setup_cfg:
+        result = get_repo_url(tmp_path)
+
+    assert result == "https://github.com/owner/repo"
+    load_setup_cfg.assert_not_called()
+
+
+def test_get_repo_url_setup_cfg(tmp_path: Path) -> None:
+    """The URL is read from ``setup.cfg`` if ``pyproject.toml`` has none."""
+    (tmp_path / "pyproject.toml").write_text(
+        PYPROJECT.format(url="https://example.com/")
+    )
+    (tmp_path / "setup.cfg").write_text(
+        "[metadata]\nname = pkg\nurl = https://github.com/owner/legacy\n"
+    )
+
+    result = get_repo_url(tmp_path)
+
+    assert result == "https://github.com/owner/legacy"
@@ -0,0 +1,115 @@
+"""Tests for the `darkgray_dev_tools.pyproject_index` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from darkgray_dev_tools.pyproject_index import index_pyproject
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PYPROJECT = """\
+[build-system]
+requires = ["setuptools>=61"]
+
+[project]
+name = "example"
+dependencies = ["click>=8", 'Ruamel.YAML>=0.15',  # comment with "quotes"
+    "requests[socks] ; python_version >= '3.9'",
+    # "commented-out>=1",
+    "not a valid requirement!",
+]
+optional-dependencies.docs = ["sphinx"]
+
+[project.optional-dependencies]
+dev = [
+    "pytest>=6",
+    "click<9",
+]
+"test" = ["pytest-kwparametrize"]
+
+[tool.example]
+dependencies = ["ignored"]
+"""
+
+
+def test_index_pyproject(tmp_path: Path) -> None:
+    """Requirements in dependency arrays are found with their exact positions."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text(PYPROJECT)
+
+    result = index_pyproject(path)
+
+    assert result.has_project
+    assert [
+        (span.name, span.group, span.line_num, span.start, span.end)
+        for span in result.requirements
+    ] == [
+        ("click", None, 5, 16, 26),
+        ("ruamel-yaml", None, 5, 28, 47),
+        ("requests", None, 6, 4, 47),
+        ("sphinx", "docs", 10, 30, 38),
+        ("pytest", "dev", 14, 4, 15),
+        ("click", "dev", 15, 4, 13),
+        ("pytest-kwparametrize", "test", 17, 10, 32),
+    ]
+    lines = PYPROJECT.splitlines()
+    assert lines[6][4:47] == "\"requests[socks] ; python_version >= '3.9'\""
+    assert result.find("ruamel.yaml") == result.requirements[1]
+    assert result.find("missing") is None
+
+
+def test_index_pyproject_no_project(tmp_path: Path) -> None:
+    """A file without a ``[project]`` table is indexed as such."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text("[tool.example]\ndependencies = ['click']\n")
+
+    result = index_pyproject(path)
+
+    assert not result.has_project
+    assert result.requirements == []
+
+
+def test_index_pyproject_inline_table(tmp_path: Path) -> None:
+    """Requirements in arrays inside an inline table are found."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        "[project]\n"
+        'name = "example"\n'
+        'optional-dependencies = { dev = ["pytest>=6",\n'
+        '    "click"], "docs" = ["sphinx"], x = 1 }\n'
+        'dependencies = ["requests"]\n'
+    )
+
+    result = index_pyproject(path)
+
+    assert result.has_project
+    assert [
+        (span.name, span.group, span.line_num, span.start, span.end)
+        for span in result.requirements
+    ] == [
+        ("pytest", "dev", 2, 33, 44),
+        ("click", "dev", 3, 4, 11),
+        ("sphinx", "docs", 3, 24, 32),
+        ("requests", None, 4, 16, 26),
+    ]
+
+
+def test_index_pyproject_dotted_keys(tmp_path: Path) -> None:
+    """Requirements under top-level dotted ``project`` keys are found."""
+    path = tmp_path / "pyproject.toml"
+    path.write_text(
+        'project.name = "example"\n'
+        'project.dependencies = ["click"]\n'
+        'project."optional-dependencies".dev = ["pytest"]\n'
+        'tool.example.dependencies = ["ignored"]\n'
+    )
+
+    result = index_pyproject(path)
+
+    assert result.has_project
+    assert [
+        (span.name, span.group, span.line_num, span.start, span.end)
+        for span in result.requirements
+    ] == [("click", None, 1, 24, 31), ("pytest", "dev", 2, 39, 47)]
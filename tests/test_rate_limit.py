@@ -0,0 +1,151 @@
+"""Tests for the `darkgray_dev_tools.rate_limit` module."""
+
+from __future__ import annotations
+
+import pytest
+
+from darkgray_dev_tools.rate_limit import (
+    DECREASE_FACTOR,
+    RESET_MARGIN,
+    SECONDARY_LIMIT_WAIT,
+    RateLimitBudget,
+    RateLimitScheduler,
+)
+
+NOW = 1_700_000_000.0
+
+
+def make_scheduler(max_concurrency: int = 8) -> RateLimitScheduler:
+    """Create a scheduler whose clock is stopped at `NOW`."""
+    return RateLimitScheduler(max_concurrency, clock=lambda: NOW)
+
+
+@pytest.mark.kwparametrize(
+    dict(budget=None, last_start=None, expect=0.0),
+    dict(budget=RateLimitBudget(500, NOW + 60), last_start=NOW, expect=0.0),
+    dict(budget=RateLimitBudget(0, NOW - 1), last_start=None, expect=0.0),
+    dict(budget=RateLimitBudget(0, NOW + 60), last_start=None, expect=61.0),
+    dict(budget=RateLimitBudget(10, NOW + 60), last_start=None, expect=0.0),
+    dict(budget=RateLimitBudget(10, NOW + 60), last_start=NOW - 2, expect=4.0),
+    dict(budget=RateLimitBudget(10, NOW + 60), last_start=NOW - 7, expect=0.0),
+)
+def test_delay(
+    budget: RateLimitBudget | None, last_start: float | None, expect: float
+) -> None:
+    """Requests wait for the reset, and are paced evenly once the budget runs low."""
+    scheduler = make_scheduler()
+    if budget:
+        scheduler.budgets["core"] = budget
+    if last_start is not None:
+        scheduler.last_start["core"] = last_start
+
+    result = scheduler.delay("core")
+
+    assert result == pytest.approx(expect)
+
+
+def test_delay_paused() -> None:
+    """A pause holds back requests to all resources."""
+    scheduler = make_scheduler()
+
+    scheduler.pause(30)
+
+    assert [scheduler.delay("core"), scheduler.delay("search")] == [30, 30]
+
+
+def test_acquire_reserves_budget() -> None:
+    """Acquiring takes a slot and reserves budget, cache hits give the budget back."""
+    scheduler = make_scheduler()
+    scheduler.budgets["core"] = RateLimitBudget(500, NOW + 60)
+
+    scheduler.acquire("core")
+
+    assert scheduler.active == 1
+    assert scheduler.budgets["core"] == RateLimitBudget(499, NOW + 60)
+
+    scheduler.release()
+    scheduler.update("core", 200, {"X-RateLimit-Remaining": "1"}, from_cache=True)
+
+    assert scheduler.active == 0
+    assert scheduler.budgets["core"] == RateLimitBudget(500, NOW + 60)
+
+
+def test_update_budget() -> None:
+    """Successful responses update the budget and raise concurrency additively."""
+    scheduler = make_scheduler()
+    scheduler.concurrency = 2.0
+
+    result = scheduler.update(
+        "search", 200, {"X-RateLimit-Remaining": "29", "X-RateLimit-Reset": str(NOW)}
+    )
+
+    assert result is None
+    assert scheduler.budgets["search"] == RateLimitBudget(29, NOW)
+    assert scheduler.concurrency == pytest.approx(2 + 1 / 2)
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        status_code=403,
+        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(NOW + 100)},
+        message="API rate limit exceeded for user ID 1.",
+        expect=100 + RESET_MARGIN,
+        expect_paused_until=0.0,
+    ),
+    dict(
+        status_code=403,
+        headers={"X-RateLimit-Remaining": "4000", "Retry-After": "30"},
+        message="You have exceeded a secondary rate limit.",
+        expect=30,
+        expect_paused_until=NOW + 30,
+    ),
+    dict(
+        status_code=403,
+        headers={},
+        message="You have exceeded a secondary rate limit.",
+        expect=SECONDARY_LIMIT_WAIT,
+        expect_paused_until=NOW + SECONDARY_LIMIT_WAIT,
+    ),
+    dict(
+        status_code=429,
+        headers={},
+        message="",
+        expect=SECONDARY_LIMIT_WAIT,
+        expect_paused_until=NOW + SECONDARY_LIMIT_WAIT,
+    ),
+)
+def test_update_rate_limited(
+    status_code: int,
+    headers: dict[str, str],
+    message: str,
+    expect: float,
+    expect_paused_until: float,
+) -> None:
+    """Rate limited responses halve concurrency and tell how long to wait."""
+    scheduler = make_scheduler()
+
+    result = scheduler.update("core", status_code, headers, message)
+
+    assert result == expect
+    assert scheduler.paused_until == expect_paused_until
+    assert scheduler.concurrency == scheduler.max_concurrency * DECREASE_FACTOR
+
+
+def test_update_forbidden() -> None:
+    """Other ``403 Forbidden`` responses aren't retried."""
+    scheduler = make_scheduler()
+
+    result = scheduler.update("core", 403, {}, "Resource not accessible by integration")
+
+    assert result is None
+    assert scheduler.concurrency == scheduler.max_concurrency
+
+
+def test_concurrency_floor() -> None:
+    """Concurrency is never reduced below one request at a time."""
+    scheduler = make_scheduler(max_concurrency=2)
+
+    for _ in range(3):
+        scheduler.update("core", 429, {"Retry-After": "1"})
+
+    assert scheduler.concurrency == 1.0
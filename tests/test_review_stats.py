@@ -0,0 +1,86 @@
+"""Tests for the `darkgray_dev_tools.review_stats` module."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from darkgray_dev_tools.darkgray_show_reviews import generate_monthly_stats
+from darkgray_dev_tools.review_stats import ReviewColumns
+from darkgray_dev_tools.reviews import Review
+
+REVIEWS = [
+    Review(5, "", "bob", datetime(2024, 4, 2, 12, tzinfo=timezone.utc)),
+    Review(4, "", "alice", datetime(2024, 3, 31, 23, tzinfo=timezone.utc)),
+    Review(3, "", "alice", datetime(2024, 3, 25, tzinfo=timezone.utc)),
+    Review(2, "", "bob", datetime(2024, 1, 7, tzinfo=timezone.utc)),
+    Review(1, "", "alice", datetime(2024, 1, 1, tzinfo=timezone.utc)),
+]
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        period="week",
+        expect={
+            "2024-W14": {"bob": 1},
+            "2024-W13": {"alice": 2},
+            "2024-W01": {"bob": 1, "alice": 1},
+        },
+    ),
+    dict(
+        period="month",
+        expect={
+            "2024-04": {"bob": 1},
+            "2024-03": {"alice": 2},
+            "2024-01": {"bob": 1, "alice": 1},
+        },
+    ),
+    dict(
+        period="quarter",
+        expect={"2024-Q2": {"bob": 1}, "2024-Q1": {"alice": 3, "bob": 1}},
+    ),
+)
+def test_counts(period: str, expect: dict[str, dict[str, int]]) -> None:
+    """Approvals are counted by reviewer in each period."""
+    result = ReviewColumns.from_reviews(REVIEWS).counts(period)
+
+    assert result == expect
+    assert list(result) == list(expect)
+
+
+def test_counts_rolling() -> None:
+    """Rolling counts include preceding periods, and periods without approvals."""
+    result = ReviewColumns.from_reviews(REVIEWS).counts("month", rolling=2)
+
+    assert result == {
+        "2024-04": {"alice": 2, "bob": 1},
+        "2024-03": {"alice": 2},
+        "2024-02": {"bob": 1, "alice": 1},
+        "2024-01": {"bob": 1, "alice": 1},
+    }
+
+
+def test_counts_empty() -> None:
+    """No reviews give empty statistics."""
+    assert ReviewColumns().counts("week", rolling=4) == {}
+
+
+def test_top_reviewers() -> None:
+    """The most active reviewers are listed first."""
+    assert ReviewColumns.from_reviews(REVIEWS).top_reviewers(2) == {
+        "alice": 3,
+        "bob": 2,
+    }
+
+
+def test_generate_monthly_stats() -> None:
+    """Monthly statistics list months and reviewers in order of first appearance."""
+    result = generate_monthly_stats(REVIEWS)
+
+    assert list(result.items()) == [
+        ("2024-04", {"bob": 1}),
+        ("2024-03", {"alice": 2}),
+        ("2024-01", {"bob": 1, "alice": 1}),
+    ]
+    assert list(result["2024-01"]) == ["bob", "alice"]
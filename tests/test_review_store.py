@@ -0,0 +1,173 @@
+"""Tests for the `darkgray_dev_tools.review_store` module."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from darkgray_dev_tools.darkgray_show_reviews import (
+    fetch_and_store_reviews,
+    iter_reviews,
+    show_reviews,
+)
+from darkgray_dev_tools.review_store import ReviewStore
+from darkgray_dev_tools.reviews import Review
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+JAN = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FEB = datetime(2024, 2, 1, tzinfo=timezone.utc)
+REVIEWS = [
+    Review(1, "One", "alice", JAN, repository="me/one"),
+    Review(2, "Two", "me", FEB, repository="me/one"),
+    Review(1, "Other", "bob", FEB, repository="me/two"),
+    Review(1, "Third", "carol", FEB, repository="you/three"),
+]
+
+
+def test_reviews(tmp_path: Path) -> None:
+    """Reviews are returned most recent first, optionally skipping owner reviews."""
+    store = ReviewStore(tmp_path / "reviews.sqlite")
+    store.upsert(REVIEWS)
+
+    assert store.reviews(["me/one", "me/two"]) == [REVIEWS[2], REVIEWS[1], REVIEWS[0]]
+    assert store.reviews(["me/one"], include_owner=False) == [REVIEWS[0]]
+
+
+def test_fetched_at(tmp_path: Path) -> None:
+    """Fetch times are recorded per repository and survive reopening the database."""
+    store = ReviewStore(tmp_path / "reviews.sqlite")
+    store.set_fetched_at(["me/one", "me/two", "you/three"], FEB)
+    store.close()
+
+    store = ReviewStore(tmp_path / "reviews.sqlite")
+
+    assert store.last_fetched_at("me/one") == FEB
+    assert store.last_fetched_at("me/four") is None
+    assert store.repositories("me") == ["me/one", "me/two"]
+
+
+def test_show_reviews_offline(tmp_path: Path) -> None:
+    """Reports are generated from the database without any GitHub API requests."""
+    db = tmp_path / "reviews.sqlite"
+    store = ReviewStore(db)
+    store.upsert(REVIEWS)
+    store.set_fetched_at(["me/one", "me/two"], FEB)
+    store.close()
+
+    with patch(
+        "darkgray_dev_tools.github_session.GitHubSession"
+    ) as session_class:
+        result = CliRunner().invoke(
+            show_reviews, ["--db", str(db), "--offline", "--org", "me", "--stats"]
+        )
+
+    assert result.exit_code == 0, result.output
+    session_class.assert_not_called()
+    assert result.output == (
+        "repositories:\n"
+        "- me/one\n"
+        "- me/two\n"
+        "monthly_stats:\n"
+        "  2024-02:\n"
+        "    bob: 1\n"
+        "  2024-01:\n"
+        "    alice: 1\n"
+    )
+
+
+def make_session(reviewers: list[str]) -> Mock:
+    """Create a GitHub session returning one page of pull requests, one per reviewer."""
+    session = Mock()
+    session.graphql.return_value.json.return_value = {
+        "data": {
+            "search": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [
+                    {
+                        "number": number,
+                        "title": f"PR {number}",
+                        "updatedAt": "2024-02-01T00:00:00Z",
+                        "reviews": {
+                            "nodes": [
+                                {
+                                    "author": {"login": reviewer},
+                                    "submittedAt": "2024-02-01T00:00:00Z",
+                                }
+                            ]
+                        },
+                    }
+                    for number, reviewer in enumerate(reviewers, 1)
+                ],
+            }
+        }
+    }
+    return session
+
+
+def test_show_reviews_stores_owner_reviews(tmp_path: Path) -> None:
+    """Owner reviews are stored but not reported unless ``--include-owner`` is given."""
+    db = tmp_path / "reviews.sqlite"
+
+    with patch(
+        "darkgray_dev_tools.github_session.GitHubSession",
+        return_value=make_session(["alice", "me"]),
+    ):
+        result = CliRunner().invoke(
+            show_reviews, ["--token=t", "--repo=me/one", "--db", str(db)]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "approved_by: me" not in result.output
+    store = ReviewStore(db)
+    assert [review.reviewer for review in store.reviews(["me/one"])] == ["me", "alice"]
+    assert store.last_fetched_at("me/one") is not None
+
+
+@pytest.mark.kwparametrize(
+    dict(since=None, previous=None, expect_advanced=True),
+    dict(since=None, previous=JAN, expect_advanced=True),
+    dict(since=JAN, previous=FEB, expect_advanced=True),
+    dict(since=FEB, previous=FEB, expect_advanced=True),
+    dict(since=FEB, previous=JAN, expect_advanced=False),
+    dict(since=FEB, previous=None, expect_advanced=False),
+)
+def test_fetch_and_store_reviews_fetched_at(
+    since: datetime | None, previous: datetime | None, *, expect_advanced: bool
+) -> None:
+    """The fetch time is only recorded if nothing was skipped since the previous one."""
+    store = ReviewStore(":memory:")
+    if previous:
+        store.set_fetched_at(["me/one"], previous)
+
+    reviews = list(
+        fetch_and_store_reviews(make_session(["alice"]), ["me/one"], since, store)
+    )
+
+    assert [review.reviewer for review in reviews] == ["alice"]
+    result = store.last_fetched_at("me/one")
+    assert (result not in (None, previous)) == expect_advanced
+
+
+def test_iter_reviews_unsorted_streams_pages() -> None:
+    """Without sorting, each page is returned as soon as it has been stored."""
+    store = ReviewStore(":memory:")
+    session = make_session(["alice"])
+    first_page = session.graphql.return_value.json.return_value
+    second_page = make_session(["alice", "bob"]).graphql.return_value.json.return_value
+    first_page["data"]["search"]["pageInfo"] = {"hasNextPage": True, "endCursor": "2"}
+    session.graphql.return_value.json.side_effect = [first_page, second_page]
+
+    reviews = iter_reviews(
+        session, ["me/one"], None, store, include_owner=True, sort=False
+    )
+    first = next(reviews)
+
+    assert first.reviewer == "alice"
+    assert store.reviews(["me/one"]) == [first]
+    assert [review.reviewer for review in reviews] == ["bob"]
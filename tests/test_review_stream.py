@@ -0,0 +1,27 @@
+"""Tests for the `darkgray_dev_tools.review_stream` module."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from darkgray_dev_tools.review_stream import external_sort
+
+
+@pytest.mark.kwparametrize(
+    dict(run_size=1),
+    dict(run_size=7),
+    dict(run_size=100),
+    dict(run_size=1000),
+)
+@pytest.mark.parametrize("reverse", [False, True])
+def test_external_sort(run_size: int, reverse: bool) -> None:  # noqa: FBT001
+    """Items are sorted the same way whether or not they are spilled into runs."""
+    items = [(random.randrange(50), n) for n in range(100)]  # noqa: S311
+
+    result = external_sort(
+        items, key=lambda item: item[0], reverse=reverse, run_size=run_size
+    )
+
+    assert list(result) == sorted(items, key=lambda item: item[0], reverse=reverse)
@@ -0,0 +1,66 @@
+"""Tests for the `darkgray_dev_tools.span_diff` module."""
+
+from __future__ import annotations
+
+import pytest
+
+from darkgray_dev_tools.span_diff import Edit, unified_span_diff
+
+CONTENT = "one\nv1.0\nthree\nfour\nfive\nsix\nv1.0\n"
+
+
+@pytest.mark.kwparametrize(
+    dict(
+        content=CONTENT,
+        edits=[(5, 8, "1.1"), (30, 33, "1.1")],
+        expect=[
+            "@@ -1,3 +1,3 @@",
+            " one",
+            "-v1.0",
+            "+v1.1",
+            " three",
+            "@@ -6,2 +6,2 @@",
+            " six",
+            "-v1.0",
+            "+v1.1",
+        ],
+    ),
+    dict(
+        content=CONTENT,
+        edits=[(5, 8, "1.1"), (30, 33, "1.1")],
+        context=2,
+        expect=[
+            "@@ -1,7 +1,7 @@",
+            " one",
+            "-v1.0",
+            "+v1.1",
+            " three",
+            " four",
+            " five",
+            " six",
+            "-v1.0",
+            "+v1.1",
+        ],
+    ),
+    dict(
+        content="v1.0 and v1.0",
+        edits=[(1, 4, "1.1"), (10, 13, "1.1")],
+        expect=["@@ -1,1 +1,1 @@", "-v1.0 and v1.0", "+v1.1 and v1.1"],
+    ),
+    dict(
+        content="a\nb\n",
+        edits=[(2, 2, "new\n")],
+        expect=["@@ -1,2 +1,3 @@", " a", "+new", " b"],
+    ),
+    dict(content="a\n", edits=[], expect=[]),
+    context=1,
+)
+def test_unified_span_diff(
+    content: str, edits: list[Edit], context: int, expect: list[str]
+) -> None:
+    """Hunks are built around edits, and merged if their context lines overlap."""
+    result = unified_span_diff("file.txt", content, edits, context)
+
+    assert result.splitlines() == (
+        ["--- a/file.txt", "+++ b/file.txt", *expect] if expect else []
+    )
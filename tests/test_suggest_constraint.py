@@ -4,31 +4,18 @@ from __future__ import annotations
 
 import json
 import os
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 from click.testing import CliRunner
 from packaging.requirements import Requirement
 
-from darkgray_dev_tools.darkgray_suggest_constraint import (
-    parse_quoted_package,
-    suggest_constraint,
-)
-
+from darkgray_dev_tools.darkgray_suggest_constraint import suggest_constraint
+from darkgray_dev_tools.package_index import CachedVersion
 
-@pytest.mark.parametrize(
-    ("input_str", "expected"),
-    [
-        ('"package>=1.0.0"', "package"),
-        ('    "package>=1.0.0"', "package"),
-        ('"package"', "package"),
-        ("package>=1.0.0", None),
-        ('""', None),
-    ],
-)
-def test_parse_quoted_package(input_str: str, expected: str | None) -> None:
-    """Test the parse_quoted_package function with different input formats."""
-    assert parse_quoted_package(input_str) == expected
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 # Sample pyproject.toml content with different constraint patterns
@@ -75,8 +62,12 @@ def test_suggest_constraint(
     # Mock the PyPI response to return a specific version
     mock_response = MagicMock()
     mock_response.read.return_value = json.dumps(
-        {"releases": {"1.0.0": {}, "2.0.0": {}}}
+        {"versions": ["1.0.0", "2.0.0"], "files": []}
     ).encode()
+    mock_response.headers = {
+        "ETag": '"etag"',
+        "Content-Type": "application/vnd.pypi.simple.v1+json",
+    }
     mock_response.__enter__ = MagicMock(return_value=mock_response)
     mock_response.__exit__ = MagicMock(return_value=None)
 
@@ -97,11 +88,15 @@ def test_suggest_constraint(
     }
 
     # Set up patches
-    with patch("pathlib.Path.open", mock_open(read_data=MOCK_PYPROJECT_CONTENT)), patch(
+    mocked_open = mock_open(read_data=MOCK_PYPROJECT_CONTENT)
+    with patch("pathlib.Path.open", mocked_open), patch(
         "pyproject_parser.PyProject.load", return_value=mock_pyproject
     ), patch("urllib.request.urlopen", return_value=mock_response), patch.dict(
         os.environ, {"GITHUB_STEP_SUMMARY": "mock_summary.md"}
-    ), patch("pathlib.Path.write_text") as mock_write:
+    ), patch(
+        "darkgray_dev_tools.darkgray_suggest_constraint.load_version_cache",
+        return_value={},
+    ), patch("darkgray_dev_tools.darkgray_suggest_constraint.save_version_cache"):
         # Run test with the provided parameters
         result = runner.invoke(suggest_constraint, packages)
         assert result.exit_code == expected_exit_code
@@ -109,7 +104,48 @@ def test_suggest_constraint(
         if expected_output:
             assert expected_output in result.output
             assert "::notice" in result.output
-            mock_write.assert_called_once()
+            mocked_open.assert_called_with("a", encoding="utf-8")
+            mocked_open.return_value.write.assert_called_once()
         else:
             assert result.output == ""
-            mock_write.assert_not_called()
+            mocked_open.return_value.write.assert_not_called()
+
+
+def test_suggest_constraint_all(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """All unbounded dependencies are annotated, and appended to the job summary."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "x"\nversion = "1"\n'
+        'dependencies = [\n    "airium>=0.2.6",\n    "click<9",\n    "keyring",\n]\n'
+    )
+    summary_path = tmp_path / "summary.md"
+    summary_path.write_text("Earlier step\n")
+    latest_versions = {"airium": "0.2.7", "keyring": "25.0"}
+
+    with patch(
+        "darkgray_dev_tools.package_index.get_latest_version",
+        side_effect=lambda name, *_: CachedVersion("", latest_versions[name]),
+    ), patch.dict(os.environ, {"GITHUB_STEP_SUMMARY": str(summary_path)}):
+        result = CliRunner().invoke(
+            suggest_constraint, ["--all", f"--cache-file={tmp_path / 'cache.json'}"]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [
+        (
+            "::notice file=pyproject.toml,line=5,col=5,endColumn=20,title=Future"
+            " dependency incompatibility?::You could add a maximum version constraint"
+            " for a dependency here, e.g. airium<=0.2.7"
+        ),
+        (
+            "::notice file=pyproject.toml,line=7,col=5,endColumn=14,title=Future"
+            " dependency incompatibility?::You could add a maximum version constraint"
+            " for a dependency here, e.g. keyring<=25.0"
+        ),
+    ]
+    summary = summary_path.read_text()
+    assert summary.startswith("Earlier step\n")
+    assert "`airium,<=0.2.7`" in summary
+    assert "`keyring,<=25.0`" in summary
@@ -0,0 +1,155 @@
+"""Tests for the `darkgray_dev_tools.version_replace` module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from darkgray_dev_tools.exceptions import NoMatchError
+from darkgray_dev_tools.version_replace import (
+    PatternDict,
+    ReplacementDict,
+    TemplateReplacer,
+    commit_staged_files,
+    do_replacements,
+    replace_group_1,
+    stage_replacements,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PATTERNS: PatternDict = {
+    "any_version": r"\d+(?:\.\d+)*",
+    "old_version": r"1\.0",
+    "new_version": r"1\.1",
+    "any_milestone": r"\d+",
+}
+REPLACEMENTS: ReplacementDict = {
+    "new_version": "1.1",
+    "next_version": "1.2",
+    "next_milestone": "15",
+}
+
+
+def test_replace_group_1_no_match() -> None:
+    """An exception is raised if the pattern doesn't match."""
+    with pytest.raises(NoMatchError, match=r"Can't find `v\(1\)` in `file.txt`"):
+        replace_group_1("v(1)", "2", "v2", "file.txt")
+
+
+def test_do_replacements(tmp_path: Path) -> None:
+    """All templates for a file are replaced, and each file is written."""
+    (tmp_path / "a.py").write_text('__version__ = "1.0"\n')
+    (tmp_path / "b.rst").write_text(
+        "compare/v1.0...HEAD\nmilestone/14 and compare/v1.0...HEAD\n"
+    )
+
+    do_replacements(
+        {
+            str(tmp_path / "a.py"): ['^__version__ = "{old_version->new_version}"'],
+            str(tmp_path / "b.rst"): [
+                r"compare/v{old_version->new_version}\.\.\.HEAD",
+                "milestone/{any_milestone->next_milestone}",
+            ],
+        },
+        PATTERNS,
+        REPLACEMENTS,
+        dry_run=False,
+    )
+
+    assert (tmp_path / "a.py").read_text() == '__version__ = "1.1"\n'
+    assert (tmp_path / "b.rst").read_text() == (
+        "compare/v1.1...HEAD\nmilestone/15 and compare/v1.1...HEAD\n"
+    )
+
+
+def test_do_replacements_missing_template(tmp_path: Path) -> None:
+    """A template without matches is reported, and no files are modified."""
+    (tmp_path / "a.rst").write_text("v1.0\n")
+    (tmp_path / "b.rst").write_text("v1.0 milestone/14\n")
+
+    with pytest.raises(NoMatchError, match="milestone/"):
+        do_replacements(
+            {
+                str(tmp_path / "b.rst"): [
+                    "v{old_version->new_version}",
+                    "milestone/{any_milestone->next_milestone}",
+                ],
+                str(tmp_path / "a.rst"): [
+                    "v{old_version->new_version}",
+                    "milestone/{any_milestone->next_milestone}",
+                ],
+            },
+            PATTERNS,
+            REPLACEMENTS,
+            dry_run=False,
+        )
+
+    assert (tmp_path / "a.rst").read_text() == "v1.0\n"
+    assert (tmp_path / "b.rst").read_text() == "v1.0 milestone/14\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.rst", "b.rst"]
+
+
+def test_commit_staged_files_rollback(tmp_path: Path) -> None:
+    """Files already replaced are restored if committing a later file fails."""
+    paths = [tmp_path / "a.txt", tmp_path / "b.txt"]
+    for path in paths:
+        path.write_text("v1.0\n")
+    replacer = TemplateReplacer.compile(
+        ["v{old_version->new_version}"], PATTERNS, REPLACEMENTS
+    )
+    staged_files = [
+        stage_replacements(str(path), replacer, dry_run=False) for path in paths
+    ]
+    staged_path = staged_files[1].staged_path
+    assert staged_path
+    staged_path.unlink()
+
+    with pytest.raises(FileNotFoundError):
+        commit_staged_files(staged_files)
+
+    assert [path.read_text() for path in paths] == ["v1.0\n", "v1.0\n"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.txt", "b.txt"]
+
+
+def test_do_replacements_dry_run_diff(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """In dry-run diff mode, only a diff and match counts are printed."""
+    path = tmp_path / "a.rst"
+    path.write_text("intro\nv1.0\n\nmilestone/14\nv1.0\n")
+
+    do_replacements(
+        {
+            str(path): [
+                "v{old_version->new_version}",
+                "milestone/{any_milestone->next_milestone}",
+            ]
+        },
+        PATTERNS,
+        REPLACEMENTS,
+        dry_run=True,
+        diff=True,
+    )
+
+    assert capsys.readouterr().out.splitlines() == [
+        f"--- a/{path}",
+        f"+++ b/{path}",
+        "@@ -1,5 +1,5 @@",
+        " intro",
+        "-v1.0",
+        "+v1.1",
+        " ",
+        "-milestone/14",
+        "-v1.0",
+        "+milestone/15",
+        "+v1.1",
+        "",
+        "######## Matches ########",
+        f"{path}: 3 matches",
+        "  2  v{old_version->new_version}",
+        "  1  milestone/{any_milestone->next_milestone}",
+    ]
+    assert path.read_text() == "intro\nv1.0\n\nmilestone/14\nv1.0\n"